@@ -0,0 +1,230 @@
+# app/core/cache.py
+"""
+Caching primitives: an in-process TTL/LRU cache and optional shared backends.
+
+A `TieredCache` reads the local cache first and falls back to the shared
+backend (if configured via CACHE_URL), so one worker's fill or invalidation
+is seen by the others. Local entries are only dropped by TTL on other
+workers, so keep local TTLs short for data that must not go stale.
+"""
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import Counter
+
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache name and result (hit/miss)",
+    labelnames=("cache", "result"),
+)
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total",
+    "Entries evicted to stay under maxsize",
+    labelnames=("cache",),
+)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, name: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _record(self, result: str) -> None:
+        if self.name:
+            CACHE_REQUESTS.inc(cache=self.name, result=result)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._data.move_to_end(key)
+                    self._record("hit")
+                    return value
+                del self._data[key]
+        self._record("miss")
+        return default
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                if self.name:
+                    CACHE_EVICTIONS.inc(cache=self.name)
+
+    def delete(self, key: Any) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend(ABC):
+    """Shared key/value store for JSON-serializable values."""
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """Add `amount` to an integer counter; `ttl` sets the expiry when the counter is created."""
+
+
+class MemoryBackend(CacheBackend):
+    """
+    Process-local stand-in for a shared backend (CACHE_URL=memory://).
+    Values round-trip through JSON so behaviour matches a real remote store.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if not entry:
+                return None
+            expires_at, raw = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        raw = json.dumps(value, default=str)
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, raw)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        now = time.monotonic()
+        with self._lock:
+            expires_at, raw = self._data.get(key, (None, "0"))
+            if expires_at is None or expires_at <= now:
+                expires_at, raw = now + ttl if ttl is not None else float("inf"), "0"
+            value = int(json.loads(raw)) + amount
+            self._data[key] = (expires_at, json.dumps(value))
+        return value
+
+
+class RedisBackend(CacheBackend):
+    """Shared backend on Redis (CACHE_URL=redis://...). Needs the `redis` package."""
+
+    def __init__(self, url: str, prefix: str = "kv:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_URL points at Redis but the `redis` package is not installed") from e
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def get(self, key: str) -> Any:
+        raw = self._client.get(self._prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._client.set(self._prefix + key, json.dumps(value, default=str), px=int(ttl * 1000))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self._prefix + key)
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        key = self._prefix + key
+        value = int(self._client.incrby(key, amount))
+        if ttl is not None and value == amount:
+            # First increment created the counter
+            self._client.pexpire(key, int(ttl * 1000))
+        return value
+
+
+_shared_backend: Optional[CacheBackend] = None
+_shared_backend_lock = threading.Lock()
+
+
+def get_shared_backend() -> Optional[CacheBackend]:
+    """Return the backend configured by CACHE_URL (one per process), or None."""
+    global _shared_backend
+    if not settings.cache_url:
+        return None
+    with _shared_backend_lock:
+        if _shared_backend is None:
+            if settings.cache_url.startswith("memory://"):
+                _shared_backend = MemoryBackend()
+            elif settings.cache_url.startswith(("redis://", "rediss://")):
+                _shared_backend = RedisBackend(settings.cache_url)
+            else:
+                raise RuntimeError(f"Unsupported CACHE_URL scheme: {settings.cache_url}")
+    return _shared_backend
+
+
+class TieredCache:
+    """Local TTLCache in front of an optional shared backend."""
+
+    def __init__(self, name: str, maxsize: int, ttl: float, shared: Optional[CacheBackend] = None,
+                 shared_ttl: Optional[float] = None):
+        self.name = name
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl, name=name)
+        self.shared = shared
+        self.shared_ttl = shared_ttl if shared_ttl is not None else ttl
+
+    def _shared_key(self, key: Any) -> str:
+        return f"{self.name}:{key}"
+
+    def get(self, key: Any) -> Any:
+        value = self.local.get(key)
+        if value is not None or self.shared is None:
+            return value
+        value = self.shared.get(self._shared_key(key))
+        CACHE_REQUESTS.inc(cache=f"{self.name}.shared", result="hit" if value is not None else "miss")
+        if value is not None:
+            self.local.set(key, value)
+        return value
+
+    def set(self, key: Any, value: Any) -> None:
+        self.local.set(key, value)
+        if self.shared is not None:
+            self.shared.set(self._shared_key(key), value, self.shared_ttl)
+
+    def delete(self, key: Any) -> None:
+        self.local.delete(key)
+        if self.shared is not None:
+            self.shared.delete(self._shared_key(key))
+
+    def clear_local(self) -> None:
+        self.local.clear()
@@ -0,0 +1,90 @@
+from typing import Dict
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+
+def accepted_encodings(header: str) -> Dict[str, float]:
+    """Accept-Encoding as {coding: q}; a malformed q counts as 0 (not acceptable)."""
+    accepted = {}
+    for part in header.lower().split(","):
+        coding, *params = [piece.strip() for piece in part.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def quality(accepted: Dict[str, float], coding: str) -> float:
+    """The client's q for `coding`, falling back to `*`; 0 if neither is listed."""
+    return accepted.get(coding, accepted.get("*", 0.0))
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int, thread_minimum_size: int,
+                 **kwargs) -> None:
+        super().__init__(app, minimum_size, **kwargs)
+        self.quality = quality
+        self.thread_minimum_size = thread_minimum_size
+        self._compressor = None
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if len(body) >= self.thread_minimum_size:
+            # Large bodies take long enough to stall every other request on the loop
+            return await run_in_threadpool(self._compress, body, more_body)
+        return self._compress(body, more_body)
+
+    def _compress(self, body: bytes, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(quality=self.quality)
+        data = self._compressor.process(body)
+        return data + (self._compressor.flush() if more_body else self._compressor.finish())
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that prefers brotli when the client accepts it at least as
+    much as gzip and the `brotli` package is installed. Codings the client
+    rules out with q=0 are never used. Bodies under `minimum_size` go out
+    as-is; brotli runs in the threadpool from `thread_minimum_size` bytes.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, compresslevel: int = 6,
+                 brotli_quality: int = 4, thread_minimum_size: int = 128 * 1024) -> None:
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.brotli_quality = brotli_quality
+        self.thread_minimum_size = thread_minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accepted = accepted_encodings(Headers(scope=scope).get("Accept-Encoding", ""))
+        br, gzip = quality(accepted, "br"), quality(accepted, "gzip")
+        if brotli is not None and br > 0 and br >= gzip:
+            responder = BrotliResponder(self.app, self.minimum_size, self.brotli_quality, self.thread_minimum_size,
+                                        exclude_content_types=self.exclude_content_types)
+            await responder(scope, receive, send)
+        elif gzip > 0:
+            await super().__call__(scope, receive, send)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size,
+                                          exclude_content_types=self.exclude_content_types)
+            await responder(scope, receive, send)
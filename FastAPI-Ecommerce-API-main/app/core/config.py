@@ -19,10 +19,121 @@ class Settings(BaseSettings):
     db_name: Optional[str] = None
     db_sslmode: str = "require"
 
+    # Connection pool (size these for the Supabase pooler's connection limit)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0        # seconds to wait for a free connection
+    db_pool_recycle: int = 1800          # seconds; -1 keeps connections forever
+    # Pre-ping costs a round-trip per checkout; with a recycle shorter than the
+    # pooler's idle timeout it can usually be switched off.
+    db_pool_pre_ping: bool = True
+
+    # Async DB layer: serve product/cart/order routes from an AsyncSession
+    # instead of tying up a threadpool worker per request.
+    # ASYNC_DATABASE_URL is derived from DATABASE_URL when not set.
+    db_async: bool = False
+    async_database_url: Optional[str] = None
+
     # JWT Config
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    refresh_token_expire_days: int = 30
+    # Key rotation: JWT_KEYS="kid1:secret1,kid2:secret2". New tokens are signed
+    # with JWT_ACTIVE_KID (default: the first key), all listed keys verify.
+    # Tokens without a kid verify with SECRET_KEY while JWT_ACCEPT_UNKEYED is set.
+    jwt_keys: Optional[str] = None
+    jwt_active_kid: Optional[str] = None
+    jwt_accept_unkeyed: bool = True
+    # Refresh tokens issued before tokens carried type/jti/exp claims never
+    # expire and can't be revoked. Set JWT_ACCEPT_LEGACY_TOKENS for a grace
+    # period in which /auth/refresh still swaps them for new ones.
+    jwt_accept_legacy_tokens: bool = False
+    # Verified tokens are cached (never past their exp); revoked token ids are
+    # pulled from the revoked_tokens table every TOKEN_REVOCATION_SYNC_SECONDS
+    token_cache_size: int = 10000
+    token_cache_ttl: float = 300.0
+    token_revocation_sync_seconds: float = 5.0
+    # Read user_type from the access token instead of the DB. A role change or
+    # deleted account then takes effect when the user's current access token
+    # expires (ACCESS_TOKEN_EXPIRE_MINUTES). Refresh tokens carry no role and
+    # can't be used as bearer tokens, so each refresh re-reads the user.
+    trust_token_role_claims: bool = True
+
+    # Password hashing runs on a bounded pool instead of the event loop.
+    # PASSWORD_HASH_WORKERS caps concurrent hashes (0 runs them inline);
+    # "process" suits hash backends that hold the GIL.
+    password_hash_workers: int = 2
+    password_hash_executor: str = "thread"
+    # New hashes: "bcrypt_sha256", "bcrypt" or "argon2" (needs argon2-cffi), at
+    # PASSWORD_HASH_ROUNDS (bcrypt log2 cost / argon2 time cost; unset: passlib's default)
+    password_hash_scheme: str = "bcrypt_sha256"
+    password_hash_rounds: Optional[int] = None
+    # On a successful login, re-hash passwords stored with another scheme or cost
+    password_rehash_on_login: bool = False
+
+    # Auth rate limits, "<count>/<seconds>" (empty or 0 disables a rule), per
+    # route and per client IP or account (username/phone). Checked before any
+    # DB or hashing work; shared across workers when CACHE_URL is set.
+    rate_limit_enabled: bool = True
+    rate_limit_login_ip: str = "30/60"
+    rate_limit_login_account: str = "5/60"
+    rate_limit_signup_ip: str = "10/600"
+
+    # Caching: CACHE_URL enables a shared backend (redis://... or memory://)
+    cache_url: Optional[str] = None
+    principal_cache_size: int = 10000
+    principal_cache_ttl: float = 60.0
+    # Public catalogue reads (product pages, listings, searches). Product writes
+    # invalidate at once; stock changes from checkout show up within the TTL.
+    catalogue_cache_enabled: bool = True
+    catalogue_cache_size: int = 2000
+    catalogue_cache_ttl: float = 30.0
+    # Admin dashboard aggregates (GET /admin/stats)
+    admin_stats_cache_ttl: float = 60.0
+
+    # Cart totals: each line change adjusts carts.total_amount by its delta.
+    # CART_TOTALS_TRIGGER leaves that to the DB trigger in
+    # scripts/cart_totals_trigger.sql (set it once the trigger is installed).
+    # CART_RECONCILE_INTERVAL > 0 re-checks every cart against its lines that
+    # often and repairs drift; enable it on one worker, or run
+    # scripts/reconcile_cart_totals.py from cron instead.
+    cart_totals_trigger: bool = False
+    cart_reconcile_interval: float = 0
+    cart_reconcile_batch_size: int = 1000
+
+    # Response pipeline: gzip (brotli if the package is installed) for bodies
+    # of at least compression_min_size bytes. Brotli compresses bodies of
+    # compression_thread_min_size bytes or more in the threadpool, off the
+    # event loop.
+    compression_enabled: bool = True
+    compression_min_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_thread_min_size: int = 128 * 1024
+    # Build response models from ORM rows without validating them. Validation
+    # only re-checks what the DB schema already guarantees and is most of the
+    # serialization cost on large nested payloads (orders with items).
+    trust_orm_responses: bool = False
+
+    # Observability
+    metrics_enabled: bool = True
+    # Per-request wall/DB time and statement counts: Server-Timing header and
+    # per-route histograms on /metrics. Adds two cursor events per statement.
+    instrumentation_enabled: bool = False
+    # With instrumentation on, `X-Profile: 1` requests are stack-sampled into
+    # PROFILE_DIR as collapsed stacks. Never enable on a public deployment.
+    profiling_enabled: bool = False
+    profile_dir: str = "profiles"
+    profile_interval: float = 0.001     # seconds between samples
+    # Development/staging checks, also under INSTRUMENTATION_ENABLED. Log
+    # statements slower than SLOW_QUERY_MS (0: off), with their EXPLAIN plan
+    # if SLOW_QUERY_EXPLAIN (or per request via `X-Explain: 1` with profiling
+    # on). Warn when one statement shape runs more than NPLUSONE_THRESHOLD
+    # times in a request (0: off).
+    slow_query_ms: float = 0
+    slow_query_explain: bool = False
+    nplusone_threshold: int = 0
 
     class Config:
         env_file = ".env"
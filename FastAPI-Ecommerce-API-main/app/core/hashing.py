@@ -0,0 +1,128 @@
+# app/core/hashing.py
+"""
+Password hashing off the event loop.
+
+A bcrypt hash or verify is a few hundred ms of CPU. Called from an `async def`
+route it stalls every other request on the worker, so hashes and verifies run
+on a bounded pool: PASSWORD_HASH_WORKERS at a time, the rest wait their turn
+(password_hash_queue_seconds on /metrics).
+"""
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.metrics import Gauge, Histogram
+
+HASH_QUEUE_TIME = Histogram(
+    "password_hash_queue_seconds",
+    "Time a password hash or verify waited for a free hashing slot",
+    labelnames=("op",),
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HASH_DURATION = Histogram(
+    "password_hash_seconds",
+    "Time to compute a password hash or verify",
+    labelnames=("op",),
+    buckets=(0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.5, 5.0),
+)
+HASH_IN_FLIGHT = Gauge("password_hash_in_flight", "Password hashes or verifies running")
+HASH_WAITING = Gauge("password_hash_waiting", "Password hashes or verifies waiting for a slot")
+
+KNOWN_SCHEMES = ("argon2", "bcrypt_sha256", "bcrypt")
+
+
+def build_context(scheme: str, rounds: Optional[int] = None) -> CryptContext:
+    """
+    New hashes use `scheme`; hashes in the other known schemes still verify
+    and count as outdated, as do `scheme` hashes with a different cost.
+    """
+    options = {}
+    if rounds:
+        options = {f"{scheme}__rounds": rounds, f"{scheme}__min_rounds": rounds, f"{scheme}__max_rounds": rounds}
+    schemes = [scheme] + [s for s in KNOWN_SCHEMES if s != scheme]
+    return CryptContext(schemes=schemes, deprecated="auto", **options)
+
+
+pwd_context = build_context(settings.password_hash_scheme, settings.password_hash_rounds)
+
+
+# Run on the pool; module-level so a process pool can pickle them
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(password: str, hashed: str) -> bool:
+    return pwd_context.verify(password, hashed)
+
+
+def _verify_and_update(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(password, hashed)
+
+
+class PasswordHasher:
+    """Bounded executor for password hashing, awaited from async code."""
+
+    def __init__(self, workers: int, executor: str = "thread"):
+        self._executor: Optional[Executor] = None
+        self.configure(workers, executor)
+
+    def configure(self, workers: int, executor: str = "thread") -> None:
+        """(Re)build the pool. With 0 workers calls run inline, on the event loop."""
+        old = self._executor
+        self.workers = workers
+        if workers <= 0:
+            self._executor = None
+        elif executor == "process":
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        # Slots are per event loop; created on first use
+        self._slots: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+        if old is not None:
+            old.shutdown(wait=False)
+
+    async def _run(self, op: str, fn, *args):
+        if self._executor is None:
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                HASH_DURATION.observe(time.perf_counter() - started, op=op)
+
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots[0] is not loop:
+            self._slots = (loop, asyncio.Semaphore(self.workers))
+        slots = self._slots[1]
+
+        queued = time.perf_counter()
+        HASH_WAITING.inc()
+        try:
+            await slots.acquire()
+        finally:
+            HASH_WAITING.dec()
+        started = time.perf_counter()
+        HASH_QUEUE_TIME.observe(started - queued, op=op)
+        HASH_IN_FLIGHT.inc()
+        try:
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            HASH_IN_FLIGHT.dec()
+            HASH_DURATION.observe(time.perf_counter() - started, op=op)
+            slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", _hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run("verify", _verify, password, hashed)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """(valid, new hash or None); a new hash is returned when `hashed` is outdated."""
+        return await self._run("verify", _verify_and_update, password, hashed)
+
+
+passwords = PasswordHasher(settings.password_hash_workers, settings.password_hash_executor)
@@ -0,0 +1,279 @@
+# app/core/instrumentation.py
+"""
+Opt-in request instrumentation (INSTRUMENTATION_ENABLED).
+
+Cursor events on the engines add statement time and counts to the current
+request's stats through a context variable, which follows the request into
+threadpool workers and AsyncSession.run_sync. The middleware publishes them
+as a Server-Timing header and per-route histograms on /metrics.
+
+With PROFILING_ENABLED, a request sent with `X-Profile: 1` is sampled by a
+stack profiler and written as collapsed stacks (flamegraph.pl / speedscope).
+
+Development/staging checks: SLOW_QUERY_MS logs statements slower than the
+threshold, with their EXPLAIN plan if SLOW_QUERY_EXPLAIN is set (or, with
+profiling on, for requests sent with `X-Explain: 1`). NPLUSONE_THRESHOLD
+fingerprints each request's statements and warns when one shape runs more
+than that many times.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter as StackCounter
+from contextvars import ContextVar
+from typing import Optional
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import Counter, Histogram
+from app.utils.query_counter import fingerprint
+
+logger = logging.getLogger(__name__)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Request handling time per route template",
+    labelnames=("method", "route", "status"),
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL statements per request",
+    labelnames=("method", "route"),
+)
+REQUEST_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "SQL statements executed per request",
+    labelnames=("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000),
+)
+SLOW_STATEMENTS = Counter(
+    "db_slow_statements_total",
+    "Statements slower than SLOW_QUERY_MS",
+)
+REPEATED_STATEMENTS = Counter(
+    "db_repeated_statements_total",
+    "Requests where one statement shape ran more than NPLUSONE_THRESHOLD times",
+    labelnames=("method", "route"),
+)
+
+
+class RequestStats:
+    """DB work seen while serving one request."""
+
+    __slots__ = ("db_time", "statements", "slowest", "slowest_statement", "shapes", "explain")
+
+    def __init__(self, track_shapes: bool = False, explain: bool = False):
+        self.db_time = 0.0
+        self.statements = 0
+        self.slowest = 0.0
+        self.slowest_statement: Optional[str] = None
+        # Fingerprint -> executions, for N+1 detection
+        self.shapes: Optional[StackCounter] = StackCounter() if track_shapes else None
+        self.explain = explain
+
+    def record(self, statement: str, duration: float) -> None:
+        self.db_time += duration
+        self.statements += 1
+        if duration > self.slowest:
+            self.slowest = duration
+            self.slowest_statement = statement
+        if self.shapes is not None:
+            self.shapes[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int):
+        """(fingerprint, count) for shapes run more than `threshold` times."""
+        return [(shape, n) for shape, n in (self.shapes or {}).items() if n > threshold]
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+class StatementTimer:
+    """Cursor event handlers for one engine: request stats and the slow-query log."""
+
+    def __init__(self, slow_query_ms: float = 0, explain: bool = False):
+        self.slow_query = slow_query_ms / 1000
+        self.explain = explain
+
+    def before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def after(self, conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start"].pop()
+        stats = _current.get()
+        if stats is not None:
+            stats.record(statement, duration)
+        if self.slow_query and duration >= self.slow_query:
+            SLOW_STATEMENTS.inc()
+            plan = None
+            if not executemany and (self.explain or (stats is not None and stats.explain)):
+                plan = self._explain(conn, statement, parameters)
+            logger.warning("Slow statement (%.1f ms): %s%s", duration * 1000, statement,
+                           f"\nPlan:\n{plan}" if plan else "")
+
+    @staticmethod
+    def _explain(conn, statement: str, parameters) -> Optional[str]:
+        """Plan for a read statement, run on a separate cursor of the same connection."""
+        head = statement.lstrip().split(None, 1)[0].upper()
+        if head not in ("SELECT", "WITH"):
+            return None
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        try:
+            cursor = conn.connection.cursor()
+            try:
+                cursor.execute(prefix + statement, parameters)
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception as exc:  # a missing plan must never fail the request
+            logger.debug("EXPLAIN failed: %s", exc)
+            return None
+        return "\n".join("  " + " | ".join(str(col) for col in row) for row in rows)
+
+
+_timers: "WeakKeyDictionary[Engine, StatementTimer]" = WeakKeyDictionary()
+
+
+def instrument_engine(engine: Engine, slow_query_ms: float = 0, explain: bool = False) -> StatementTimer:
+    """
+    Time every statement on `engine`, logging those over `slow_query_ms` (0: off).
+    For the async engine pass `async_engine.sync_engine`.
+    """
+    timer = _timers.get(engine)
+    if timer is None:
+        timer = _timers[engine] = StatementTimer(slow_query_ms, explain)
+        event.listen(engine, "before_cursor_execute", timer.before)
+        event.listen(engine, "after_cursor_execute", timer.after)
+    return timer
+
+
+class StackSampler:
+    """
+    Samples every thread's Python stack on an interval and counts collapsed
+    stacks ("thread;outer;...;inner"). Thread names lead each stack, so the
+    event loop and threadpool workers stay apart. Only one profile runs at a
+    time; other requests on the worker show up in it, so profile a quiet one.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks = StackCounter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> bool:
+        """Start sampling; False if another profile is already running."""
+        if not StackSampler._lock.acquire(blocking=False):
+            return False
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        StackSampler._lock.release()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                frames.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def write(self, path: str) -> None:
+        with open(path, "w") as fh:
+            for stack, count in self.stacks.most_common():
+                fh.write(f"{stack} {count}\n")
+
+
+class InstrumentationMiddleware:
+    """Per-request wall time, DB time and statement count; optional stack profile."""
+
+    PROFILE_HEADER = "x-profile"
+    EXPLAIN_HEADER = "x-explain"
+
+    def __init__(self, app: ASGIApp, profiling: bool = False, profile_dir: str = "profiles",
+                 profile_interval: float = 0.001, nplusone_threshold: int = 0):
+        self.app = app
+        self.profiling = profiling
+        self.profile_dir = profile_dir
+        self.profile_interval = profile_interval
+        self.nplusone_threshold = nplusone_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        stats = RequestStats(track_shapes=self.nplusone_threshold > 0,
+                             explain=self.profiling and headers.get(self.EXPLAIN_HEADER) == "1")
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+        sampler = profile_path = None
+        if self.profiling and headers.get(self.PROFILE_HEADER) == "1":
+            sampler = StackSampler(self.profile_interval)
+            if sampler.start():
+                slug = scope["path"].strip("/").replace("/", "_") or "root"
+                profile_path = os.path.join(
+                    self.profile_dir, f"{int(time.time() * 1000)}-{scope['method']}-{slug}.folded")
+            else:
+                sampler = None
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed = time.perf_counter() - start
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", (
+                    f'app;dur={elapsed * 1000:.1f}, '
+                    f'db;dur={stats.db_time * 1000:.1f};desc="{stats.statements} statements", '
+                    f'db-slowest;dur={stats.slowest * 1000:.1f}'
+                ))
+                if profile_path:
+                    headers.append("X-Profile-File", os.path.basename(profile_path))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if sampler is not None:
+                sampler.stop()
+                os.makedirs(self.profile_dir, exist_ok=True)
+                sampler.write(profile_path)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            REQUEST_DURATION.observe(time.perf_counter() - start, method=method, route=route, status=status_code)
+            REQUEST_DB_TIME.observe(stats.db_time, method=method, route=route)
+            REQUEST_STATEMENTS.observe(stats.statements, method=method, route=route)
+            repeated = stats.repeated(self.nplusone_threshold) if self.nplusone_threshold else None
+            if repeated:
+                REPEATED_STATEMENTS.inc(method=method, route=route)
+                logger.warning("Possible N+1 in %s %s (%d statements):\n%s", method, route, stats.statements,
+                               "\n".join(f"  {n}x {shape}" for shape, n in repeated))
+            if stats.slowest_statement:
+                logger.debug("%s %s: %d statements, %.1f ms in DB; slowest %.1f ms: %s", method, route,
+                             stats.statements, stats.db_time * 1000, stats.slowest * 1000, stats.slowest_statement)
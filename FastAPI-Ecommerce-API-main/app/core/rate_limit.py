@@ -0,0 +1,189 @@
+# app/core/rate_limit.py
+"""
+Rate limits for the auth routes, applied as route dependencies so a rejected
+request never reaches a DB lookup or a password hash.
+
+Each rule is "<count>/<seconds>" and is checked per route and per key: the
+client IP and, where configured, the account named in the request (username
+or phone). Every worker enforces the limit with local token buckets; with a
+shared backend (CACHE_URL) a sliding window counter also enforces it across
+workers. Behind a reverse proxy, run uvicorn with --proxy-headers so the
+client IP is the caller's and not the proxy's.
+"""
+import hashlib
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from app.core.cache import CacheBackend, get_shared_backend
+from app.core.config import settings
+from app.core.metrics import Counter
+
+RATE_LIMIT_HITS = Counter(
+    "rate_limit_requests_total",
+    "Requests checked against a rate limit",
+    labelnames=("route", "key"),
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total",
+    "Requests rejected by a rate limit",
+    labelnames=("route", "key"),
+)
+
+LOCAL_BUCKETS = 50_000
+
+
+def parse_limit(spec: Optional[str]) -> Optional[Tuple[int, float]]:
+    """Parse "20/60" into (20, 60.0); empty or a zero count disables the rule."""
+    if not spec:
+        return None
+    count, sep, seconds = spec.partition("/")
+    if not sep:
+        raise RuntimeError(f"Rate limits look like <count>/<seconds>, got {spec!r}")
+    if int(count) <= 0:
+        return None
+    return int(count), float(seconds)
+
+
+class Limiter(ABC):
+    """Allows `limit` requests per `window` seconds per key."""
+
+    def __init__(self, name: str, limit: int, window: float):
+        self.name = name
+        self.limit = limit
+        self.window = window
+
+    @abstractmethod
+    def hit(self, key: str) -> float:
+        """Count a request for `key`: 0 if allowed, else seconds until one would be."""
+
+
+class TokenBucket(Limiter):
+    """
+    Per-worker buckets of `limit` tokens refilled at limit/window per second.
+    The least recently used buckets are dropped beyond LOCAL_BUCKETS keys.
+    """
+
+    def __init__(self, name: str, limit: int, window: float, maxsize: int = LOCAL_BUCKETS):
+        super().__init__(name, limit, window)
+        self.rate = limit / window
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.limit, now))
+            tokens = min(self.limit, tokens + (now - updated) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class SlidingWindow(Limiter):
+    """
+    Sliding window counter on a shared backend: counts in the current and
+    previous fixed windows, the previous one weighted by how much of it still
+    overlaps the sliding window. Rejected requests count too, so a client
+    hammering the route stays blocked.
+    """
+
+    def __init__(self, name: str, limit: int, window: float, backend: CacheBackend):
+        super().__init__(name, limit, window)
+        self.backend = backend
+
+    def hit(self, key: str) -> float:
+        now = time.time()
+        index = int(now // self.window)
+        prefix = f"ratelimit:{self.name}:{key}:"
+        current = self.backend.incr(f"{prefix}{index}", ttl=2 * self.window)
+        previous = int(self.backend.get(f"{prefix}{index - 1}") or 0)
+        elapsed = now - index * self.window
+        if previous * (1 - elapsed / self.window) + current <= self.limit:
+            return 0.0
+        return self.window - elapsed
+
+
+def limiters(name: str, spec: Optional[str]) -> List[Limiter]:
+    """Local bucket, plus the shared window when CACHE_URL is set; none if the rule is off."""
+    limit = parse_limit(spec)
+    if not settings.rate_limit_enabled or limit is None:
+        return []
+    chain: List[Limiter] = [TokenBucket(name, *limit)]
+    shared = get_shared_backend()
+    if shared is not None:
+        chain.append(SlidingWindow(name, *limit, shared))
+    return chain
+
+
+def _digest(value: str) -> str:
+    # Keeps phone numbers and usernames out of the shared backend's keys
+    return hashlib.blake2b(value.strip().lower().encode(), digest_size=12).hexdigest()
+
+
+class RateLimit:
+    """
+    Dependency limiting one route by client IP and, with `account_fields`, by
+    the first of those request fields that is present (form or JSON body).
+    Raises 429 with Retry-After when any limit is exceeded.
+    """
+
+    def __init__(self, route: str, ip: Optional[str], account: Optional[str] = None,
+                 account_fields: Sequence[str] = ()):
+        self.route = route
+        self.by_ip = limiters(f"{route}:ip", ip)
+        self.by_account = limiters(f"{route}:account", account) if account_fields else []
+        self.account_fields = tuple(account_fields)
+
+    async def _account(self, request: Request) -> Optional[str]:
+        # FastAPI has already parsed the body for the route; these calls reuse it
+        if request.headers.get("content-type", "").startswith("application/json"):
+            try:
+                body = await request.json()
+            except ValueError:
+                return None
+        else:
+            body = await request.form()
+        if not hasattr(body, "get"):
+            return None
+        for field in self.account_fields:
+            value = body.get(field)
+            if isinstance(value, str) and value.strip():
+                return value
+        return None
+
+    def _check(self, chain: List[Limiter], kind: str, key: str) -> float:
+        RATE_LIMIT_HITS.inc(route=self.route, key=kind)
+        wait = 0.0
+        for limiter in chain:
+            wait = limiter.hit(key)
+            if wait:
+                RATE_LIMIT_REJECTIONS.inc(route=self.route, key=kind)
+                break
+        return wait
+
+    async def __call__(self, request: Request) -> None:
+        wait = 0.0
+        if self.by_ip:
+            wait = self._check(self.by_ip, "ip", request.client.host if request.client else "unknown")
+        if not wait and self.by_account:
+            account = await self._account(request)
+            if account:
+                wait = self._check(self.by_account, "account", _digest(account))
+        if wait:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, try again later",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))})
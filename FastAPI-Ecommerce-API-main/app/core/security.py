@@ -1,23 +1,33 @@
 # app/core/security.py
 from typing import Optional, Dict, Any
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from app.core.config import settings
-from jose import JWTError, jwt
-from app.schemas.auth import TokenResponse
+from jose import JWTError
+from app.schemas.auth import TokenResponse, Principal
 from fastapi import HTTPException, Depends, status
 from fastapi.security.http import HTTPAuthorizationCredentials
 from fastapi.security import HTTPBearer
 from app.models.models import User
 from sqlalchemy.orm import Session
-from app.db.database import get_db
+from app.db.database import get_session, run_db
 from app.utils.responses import ResponseHandler
+from app.core.cache import TieredCache, get_shared_backend
+from app.core.hashing import pwd_context
+from app.core import tokens
 
-# Password hashing: prefer bcrypt_sha256 (avoids 72-byte limit),
-# but keep bcrypt in schemes so old bcrypt hashes still verify.
-pwd_context = CryptContext(schemes=["bcrypt_sha256", "bcrypt"], deprecated="auto")
+# Password hashing: bcrypt_sha256 by default (avoids bcrypt's 72-byte limit),
+# older bcrypt hashes still verify (see app/core/hashing.py). These sync
+# helpers are for threadpool code; async callers use hashing.passwords.
 auth_scheme = HTTPBearer()
 
+# user id -> Principal fields; invalidated by the user/account services
+principal_cache = TieredCache(
+    "principals",
+    maxsize=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl,
+    shared=get_shared_backend(),
+)
+
 
 def get_password_hash(password: str) -> str:
     """
@@ -33,17 +43,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-async def get_user_token(id: int, refresh_token: Optional[str] = None) -> TokenResponse:
+async def get_user_token(id: int, user_type: Optional[str] = None) -> TokenResponse:
     """
     Returns new access & refresh tokens for a given user id.
+    `user_type` is embedded in the access token only, as a role claim so auth
+    checks can skip the DB; refresh tokens carry no role, so every refresh
+    re-reads it.
     """
     payload = {"id": id}
+    if user_type:
+        payload["user_type"] = user_type
 
     access_token_expiry = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = await create_access_token(payload, access_token_expiry)
-
-    if not refresh_token:
-        refresh_token = await create_refresh_token(payload)
+    refresh_token = await create_refresh_token({"id": id})
 
     return TokenResponse(
         access_token=access_token,
@@ -61,30 +74,32 @@ async def create_access_token(data: Dict[str, Any], access_token_expiry: Optiona
         expire = datetime.utcnow() + access_token_expiry
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
-    payload.update({"exp": expire})
-    return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
+    payload.update({"exp": expire, "type": tokens.ACCESS})
+    return tokens.encode(payload)
 
 
 async def create_refresh_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
-    Create a refresh token. By default this has no expiry or you can pass expires_delta.
+    Create a refresh token, valid for REFRESH_TOKEN_EXPIRE_DAYS unless expires_delta is given.
+    Role claims are dropped: a refresh token outlives any role change.
     """
-    payload = data.copy()
-    if expires_delta:
-        payload.update({"exp": datetime.utcnow() + expires_delta})
-    return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
+    payload = {key: value for key, value in data.items() if key != "user_type"}
+    expires_delta = expires_delta or timedelta(days=settings.refresh_token_expire_days)
+    payload.update({"exp": datetime.utcnow() + expires_delta, "type": tokens.REFRESH})
+    return tokens.encode(payload)
 
 
-def get_token_payload(token: str) -> Dict[str, Any]:
+def get_token_payload(token: str, token_type: str = tokens.ACCESS) -> Dict[str, Any]:
     """
-    Decode a JWT and return its payload or raise invalid token response.
+    Decode a JWT of the given type ("access" or "refresh") and return its
+    payload or raise invalid token response. Verified tokens are cached and
+    revoked ones rejected (see app/core/tokens.py).
     """
     try:
-        # `algorithms` must be a list
-        return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        return tokens.decode(token, token_type)
     except JWTError:
         # use your ResponseHandler helper to build consistent error responses
-        raise ResponseHandler.invalid_token('access')
+        raise ResponseHandler.invalid_token(token_type)
 
 
 def get_current_user(token: HTTPAuthorizationCredentials = Depends(auth_scheme)) -> int:
@@ -96,48 +111,65 @@ def get_current_user(token: HTTPAuthorizationCredentials = Depends(auth_scheme))
     return payload.get('id')
 
 
-def check_admin_role(
-        token: HTTPAuthorizationCredentials = Depends(auth_scheme),
-        db: Session = Depends(get_db)
-):
+def _get_user_by_id(db: Session, user_id: int) -> Optional[User]:
+    return db.query(User).filter(User.id == user_id).first()
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Drop a cached principal after the user row changes or is deleted."""
+    principal_cache.delete(user_id)
+
+
+async def get_principal(payload: Dict[str, Any], db: Session) -> Principal:
     """
-    Dependency to require admin role. Raises 403 if not admin.
+    Resolve a decoded token to a Principal: from an access token's role claim
+    when trusted, else from the principal cache, else from the DB (filling the cache).
     """
-    payload = get_token_payload(token.credentials)
     user_id = payload.get('id')
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    role_user = db.query(User).filter(User.id == user_id).first()
-    if not role_user:
+    if settings.trust_token_role_claims and payload.get('type') == tokens.ACCESS and payload.get('user_type'):
+        return Principal(id=user_id, user_type=payload['user_type'])
+
+    cached = principal_cache.get(user_id)
+    if cached is not None:
+        return Principal(**cached)
+
+    user = await run_db(db, lambda session: _get_user_by_id(session, user_id))
+    if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
-    # IMPORTANT: use the actual column name in models (user_type or role)
-    # update this line if your model uses "role" instead of "user_type"
-    if getattr(role_user, "user_type", None) != "admin":
+    principal = Principal.model_validate(user)
+    principal_cache.set(user_id, principal.model_dump())
+    return principal
+
+
+async def check_admin_role(
+        token: HTTPAuthorizationCredentials = Depends(auth_scheme),
+        db: Session = Depends(get_session)
+) -> Principal:
+    """
+    Dependency to require admin role. Raises 403 if not admin.
+    """
+    principal = await get_principal(get_token_payload(token.credentials), db)
+    if principal.user_type != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin role required")
 
-    return role_user
+    return principal
 
 
-def get_current_user_with_type(
+async def get_current_user_with_type(
         token: HTTPAuthorizationCredentials = Depends(auth_scheme),
-        db: Session = Depends(get_db)
+        db: Session = Depends(get_session)
 ) -> Dict[str, Any]:
     """
     Dependency to get current user ID and type.
     Returns dict with 'user_id' and 'user_type'.
     """
-    payload = get_token_payload(token.credentials)
-    user_id = payload.get('id')
-    if not user_id:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    principal = await get_principal(get_token_payload(token.credentials), db)
 
     return {
-        "user_id": user.id,
-        "user_type": user.user_type
+        "user_id": principal.id,
+        "user_type": principal.user_type
     }
@@ -0,0 +1,241 @@
+# app/core/tokens.py
+"""
+JWT signing and verification.
+
+- Keys: JWT_KEYS holds `kid:secret` pairs. New tokens are signed with
+  JWT_ACTIVE_KID and carry it in their header; every listed key still
+  verifies, so a key can be rotated out once its tokens have expired.
+  Tokens without a kid (issued before JWT_KEYS) verify with SECRET_KEY.
+- Cache: verified claims are kept in a bounded LRU keyed by a digest of the
+  token and never outlive the token's exp, so repeat requests with the same
+  token skip the signature check and JSON decoding.
+- Types: tokens carry `type` ("access" or "refresh") and decode() only
+  accepts the type asked for, so a long-lived refresh token can't be sent
+  as a bearer token. Tokens also need a jti and an exp; refresh tokens
+  issued before those claims existed never expire and can't be revoked, so
+  they are only accepted (for refresh) while JWT_ACCEPT_LEGACY_TOKENS is set.
+- Revocation: tokens carry a jti. Revoked ids are stored in revoked_tokens;
+  each worker mirrors the unexpired ones in memory (an O(1) lookup on every
+  decode, cache hits included) and pulls new rows every
+  TOKEN_REVOCATION_SYNC_SECONDS, so a logout reaches the other workers
+  within that interval.
+"""
+import hashlib
+import heapq
+import logging
+import secrets
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from jose import JWTError, jwt
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.models import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+# Token types, in the `type` claim
+ACCESS, REFRESH = "access", "refresh"
+
+# Re-read this many ids behind the last one seen, in case a lower id
+# committed after a higher one was synced
+SYNC_LOOKBACK = 100
+PURGE_INTERVAL = 600.0
+
+
+def parse_keys(spec: Optional[str]) -> Dict[str, str]:
+    """`kid1:secret1,kid2:secret2` -> {kid: secret}, in order."""
+    keys = {}
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        kid, sep, secret = part.partition(":")
+        if not sep or not kid or not secret:
+            raise RuntimeError("JWT_KEYS entries must look like kid:secret")
+        keys[kid] = secret
+    return keys
+
+
+class KeyRing:
+    """Signing key for new tokens and verification keys by kid."""
+
+    def __init__(self, keys: Dict[str, str], active_kid: Optional[str], legacy_secret: str,
+                 accept_unkeyed: bool = True):
+        if keys:
+            active_kid = active_kid or next(iter(keys))
+            if active_kid not in keys:
+                raise RuntimeError("JWT_ACTIVE_KID must be one of the JWT_KEYS")
+        elif not accept_unkeyed:
+            raise RuntimeError("JWT_ACCEPT_UNKEYED=false needs JWT_KEYS")
+        self.keys = keys
+        self.active_kid = active_kid if keys else None
+        self.legacy_secret = legacy_secret
+        self.accept_unkeyed = accept_unkeyed
+
+    def signing_key(self) -> Tuple[Optional[str], str]:
+        """(kid, secret) for new tokens; no kid until JWT_KEYS is set."""
+        if self.active_kid:
+            return self.active_kid, self.keys[self.active_kid]
+        return None, self.legacy_secret
+
+    def verification_key(self, kid: Optional[str]) -> str:
+        if kid is None:
+            if self.accept_unkeyed:
+                return self.legacy_secret
+            raise JWTError("Token has no key id")
+        try:
+            return self.keys[kid]
+        except KeyError:
+            raise JWTError(f"Unknown key id {kid!r}") from None
+
+
+def _timestamp(value: datetime) -> float:
+    # SQLite hands back naive datetimes; they were stored as UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class RevocationList:
+    """
+    Revoked jtis until their expiry: a dict for O(1) membership and a heap
+    ordered by expiry so expired ids are dropped without scanning.
+    """
+
+    def __init__(self):
+        self._expiry: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._purged_at = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._warned = False
+
+    def __contains__(self, jti: Optional[str]) -> bool:
+        exp = self._expiry.get(jti)
+        return exp is not None and exp > time.time()
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def add(self, jti: str, exp: float) -> None:
+        with self._lock:
+            if jti not in self._expiry:
+                self._expiry[jti] = exp
+                heapq.heappush(self._heap, (exp, jti))
+
+    def prune(self, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, jti = heapq.heappop(self._heap)
+                self._expiry.pop(jti, None)
+
+    def sync(self, db: Session) -> None:
+        """Pull ids revoked since the last sync (by any worker); purge expired rows now and then."""
+        rows = db.execute(
+            select(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at)
+            .where(RevokedToken.id > self._last_id - SYNC_LOOKBACK)
+            .order_by(RevokedToken.id)
+        ).all()
+        for row in rows:
+            self.add(row.jti, _timestamp(row.expires_at))
+        if rows:
+            self._last_id = max(self._last_id, rows[-1].id)
+        now = time.time()
+        self.prune(now)
+        if now - self._purged_at >= PURGE_INTERVAL:
+            db.execute(delete(RevokedToken).where(RevokedToken.expires_at < datetime.now(timezone.utc)))
+            db.commit()
+            self._purged_at = now
+
+    def start_sync(self, interval: float) -> None:
+        """Sync in a daemon thread every `interval` seconds (once per process)."""
+        if self._thread is not None or interval <= 0:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, args=(interval,),
+                                                 name="token-revocations", daemon=True)
+                self._thread.start()
+
+    def _run(self, interval: float) -> None:
+        while True:
+            try:
+                with SessionLocal() as db:
+                    self.sync(db)
+                self._warned = False
+            except SQLAlchemyError as exc:
+                # Keep serving: revocations made on this worker still apply
+                if not self._warned:
+                    logger.warning("Revoked token sync failed, using local revocations only: %s", exc)
+                    self._warned = True
+            time.sleep(interval)
+
+
+keyring = KeyRing(parse_keys(settings.jwt_keys), settings.jwt_active_kid, settings.secret_key,
+                  settings.jwt_accept_unkeyed)
+revoked = RevocationList()
+# token digest -> verified claims; shared between requests, so treat as read-only
+_verified = TTLCache(maxsize=settings.token_cache_size, ttl=settings.token_cache_ttl, name="tokens")
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def encode(claims: Dict[str, Any]) -> str:
+    """Sign `claims` with the active key, adding a jti."""
+    payload = {"jti": secrets.token_urlsafe(12), **claims}
+    kid, secret = keyring.signing_key()
+    return jwt.encode(payload, secret, algorithm=settings.algorithm, headers={"kid": kid} if kid else None)
+
+
+def _check_claims(payload: Dict[str, Any], token_type: str) -> None:
+    if payload.get("type") == token_type and "jti" in payload and "exp" in payload:
+        return
+    # Untyped refresh tokens predate these claims; /auth/refresh swaps them for new ones
+    if token_type == REFRESH and "type" not in payload and settings.jwt_accept_legacy_tokens:
+        return
+    raise JWTError(f"Not a valid {token_type} token")
+
+
+def decode(token: str, token_type: str = ACCESS) -> Dict[str, Any]:
+    """Verified claims of a `token_type` token; raises JWTError if it is invalid, expired, revoked or of another type."""
+    revoked.start_sync(settings.token_revocation_sync_seconds)
+    key = _digest(token)
+    payload = _verified.get(key)
+    if payload is None:
+        kid = jwt.get_unverified_header(token).get("kid")
+        payload = jwt.decode(token, keyring.verification_key(kid), algorithms=[settings.algorithm])
+        ttl = settings.token_cache_ttl
+        if "exp" in payload:
+            ttl = min(ttl, payload["exp"] - time.time())
+        if ttl > 0:
+            _verified.set(key, payload, ttl=ttl)
+    _check_claims(payload, token_type)
+    if payload.get("jti") in revoked:
+        raise JWTError("Token has been revoked")
+    return payload
+
+
+def revoke(db: Session, payload: Dict[str, Any]) -> None:
+    """Revoke a decoded token until it expires; ValueError if it has no jti to revoke."""
+    jti = payload.get("jti")
+    if not jti:
+        raise ValueError("Token has no jti")
+    exp = payload.get("exp") or time.time() + settings.refresh_token_expire_days * 86400
+    db.add(RevokedToken(jti=jti, expires_at=datetime.fromtimestamp(exp, timezone.utc)))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()  # already revoked
+    revoked.add(jti, exp)
@@ -1,9 +1,15 @@
 from sqlalchemy import create_engine
-from sqlalchemy.engine import URL
-from sqlalchemy.orm import sessionmaker
-from typing import Generator
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+from typing import Any, AsyncGenerator, Callable, Generator, Optional, Type, Union
+from pydantic import BaseModel
 from app.core.config import settings
+from app.core.instrumentation import instrument_engine
 from app.db.base import Base
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from app.utils.serialization import construct_trusted
 
 # Import models so SQLAlchemy metadata is populated for Alembic
 from app.models import models  # noqa: F401
@@ -41,14 +47,27 @@ def _build_database_url() -> str:
 
 DATABASE_URL = _build_database_url()
 
+def _pool_kwargs() -> dict:
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
 engine_kwargs = {
-    "pool_pre_ping": True,
+    "poolclass": InstrumentedQueuePool,
+    **_pool_kwargs(),
 }
 
 if settings.db_sslmode:
     engine_kwargs["connect_args"] = {"sslmode": settings.db_sslmode}
 
 engine = create_engine(DATABASE_URL, **engine_kwargs)
+if settings.instrumentation_enabled:
+    instrument_engine(engine, settings.slow_query_ms, settings.slow_query_explain)
 
 # Tables are created via supabase_schema.sql in Supabase
 # Commenting out auto-creation to avoid conflicts with existing tables
@@ -63,3 +82,83 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+# Async drivers for the sync drivers we ship with
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def _build_async_database_url() -> str:
+    """Use ASYNC_DATABASE_URL if set, else swap DATABASE_URL's driver for its async one."""
+    if settings.async_database_url:
+        return settings.async_database_url
+
+    url = make_url(DATABASE_URL)
+    driver = ASYNC_DRIVERS.get(url.drivername)
+    if not driver:
+        raise RuntimeError(
+            f"No async driver known for '{url.drivername}'. Set ASYNC_DATABASE_URL."
+        )
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.db_async:
+    ASYNC_DATABASE_URL = _build_async_database_url()
+
+    async_engine_kwargs = {
+        "poolclass": InstrumentedAsyncQueuePool,
+        **_pool_kwargs(),
+    }
+    # asyncpg takes `ssl` rather than libpq's `sslmode`
+    if settings.db_sslmode and make_url(ASYNC_DATABASE_URL).get_backend_name() == "postgresql":
+        async_engine_kwargs["connect_args"] = {"ssl": settings.db_sslmode}
+
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **async_engine_kwargs)
+    if settings.instrumentation_enabled:
+        instrument_engine(async_engine.sync_engine, settings.slow_query_ms, settings.slow_query_explain)
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+async def get_async_db() -> AsyncGenerator:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Session dependency for routes that support both layers (see DB_ASYNC)
+get_session = get_async_db if settings.db_async else get_db
+
+
+async def run_db(
+        db: Union[Session, AsyncSession],
+        fn: Callable[[Session], Any],
+        response_model: Optional[Type[BaseModel]] = None,
+) -> Any:
+    """
+    Run a sync service call without blocking the event loop.
+    With an AsyncSession the call runs through `run_sync` on the async driver,
+    otherwise it goes to the threadpool as a plain `def` route would.
+    Pass `response_model` to serialize while the session is still usable, so
+    lazy loads during validation don't escape the greenlet in async mode.
+    With TRUST_ORM_RESPONSES the model is built from the rows without validation.
+    """
+    def call(session: Session) -> Any:
+        result = fn(session)
+        if response_model is None:
+            return result
+        if settings.trust_orm_responses:
+            return construct_trusted(response_model, result)
+        return response_model.model_validate(result, from_attributes=True)
+
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(call)
+    return await run_in_threadpool(call, db)
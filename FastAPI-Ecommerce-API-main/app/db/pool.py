@@ -0,0 +1,78 @@
+# app/db/pool.py
+"""
+Connection pools that publish checkout wait, in-use and overflow metrics,
+so "DB slow" can be told apart from "pool exhausted".
+"""
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.metrics import Counter, Gauge, Histogram
+
+
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    labelnames=("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0),
+)
+POOL_OVERFLOW_EVENTS = Counter(
+    "db_pool_overflow_total",
+    "Connections opened beyond pool_size (max_overflow in use)",
+    labelnames=("pool",),
+)
+POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout because the pool was exhausted",
+    labelnames=("pool",),
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently in use",
+    labelnames=("pool",),
+)
+POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured pool_size",
+    labelnames=("pool",),
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Overflow connections currently open",
+    labelnames=("pool",),
+)
+
+
+class _InstrumentedPoolMixin:
+    metrics_label = "sync"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Latest pool wins; recreate()/dispose() hand over to the new instance
+        POOL_CHECKED_OUT.set_function(self.checkedout, pool=self.metrics_label)
+        POOL_SIZE.set_function(self.size, pool=self.metrics_label)
+        POOL_OVERFLOW.set_function(lambda: max(self.overflow(), 0), pool=self.metrics_label)
+
+    def _do_get(self):
+        overflow_before = self.overflow()
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.inc(pool=self.metrics_label)
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start, pool=self.metrics_label)
+
+        if self.overflow() > max(overflow_before, 0):
+            POOL_OVERFLOW_EVENTS.inc(pool=self.metrics_label)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    metrics_label = "sync"
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    metrics_label = "async"
@@ -1,10 +1,18 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
+from fastapi.datastructures import Default
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routers import products, categories, carts, users, auth, accounts, orders, market_prices
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.instrumentation import InstrumentationMiddleware
+from app.services.cart_totals import CartTotals
+from app.routers import products, categories, carts, users, auth, accounts, orders, market_prices, metrics, admin
+from app.utils.serialization import FastJSONResponse
 
 description = """
 Welcome to the E-commerce API! 🚀
@@ -32,7 +40,22 @@ For any inquiries, please contact:
 * Github: https://github.com/aliseyedi01
 """
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background work runs per worker process, from startup to shutdown
+    reconciler = None
+    if settings.cart_reconcile_interval > 0:
+        reconciler = CartTotals.start(settings.cart_reconcile_interval, settings.cart_reconcile_batch_size)
+    try:
+        yield
+    finally:
+        if reconciler is not None:
+            reconciler.stop()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     description=description,
     title="E-commerce API",
     version="1.0.0",
@@ -47,6 +70,9 @@ app = FastAPI(
         "tryItOutEnabled": True,
         "onComplete": "Ok"
     },
+    # Wrapped in Default so routes with a response_model keep FastAPI's
+    # direct pydantic-core JSON path; orjson covers the plain dict returns.
+    default_response_class=Default(FastJSONResponse),
 )
 
 # Add CORS Middleware
@@ -67,6 +93,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        compresslevel=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+        thread_minimum_size=settings.compression_thread_min_size,
+    )
+
+# Outermost, so its timings cover every other middleware
+if settings.instrumentation_enabled:
+    app.add_middleware(
+        InstrumentationMiddleware,
+        profiling=settings.profiling_enabled,
+        profile_dir=settings.profile_dir,
+        profile_interval=settings.profile_interval,
+        nplusone_threshold=settings.nplusone_threshold,
+    )
+
 # Mount static files (images etc.). Place your logo at: app/static/logo.png
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -232,4 +277,8 @@ app.include_router(users.router)
 app.include_router(accounts.router)
 app.include_router(auth.router)
 app.include_router(orders.router)
-app.include_router(market_prices.router)
\ No newline at end of file
+app.include_router(market_prices.router)
+app.include_router(admin.router)
+
+if settings.metrics_enabled:
+    app.include_router(metrics.router)
\ No newline at end of file
@@ -1,12 +1,27 @@
 # app/models/models.py
 
-from sqlalchemy import Boolean, Column, Integer, String, ForeignKey, Float, ARRAY, Enum
-from sqlalchemy.sql.expression import text
+from sqlalchemy import Boolean, Column, Integer, String, ForeignKey, Float, ARRAY, Enum, JSON, Index, UniqueConstraint
+from sqlalchemy.dialects import postgresql  # noqa: F401  registers to_tsvector() & co.
+from sqlalchemy.sql import func
+from sqlalchemy.sql.expression import false, true, literal_column
 from sqlalchemy.sql.sqltypes import TIMESTAMP
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 
+def search_document(*columns):
+    """
+    Full-text document used by product search. The GIN index on products and
+    the search query must build this exact expression for the index to apply.
+    """
+    # Constants are inlined (not bound) so the planner can match the index
+    empty, space = literal_column("''"), literal_column("' '")
+    text_expr = func.coalesce(columns[0], empty)
+    for column in columns[1:]:
+        text_expr = text_expr.op("||")(space).op("||")(func.coalesce(column, empty))
+    return func.to_tsvector(literal_column("'simple'"), text_expr)
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -20,8 +35,8 @@ class User(Base):
     address = Column(String, nullable=True)                 # Buyer delivery address
     location = Column(String, nullable=True)                # Farmer village/city
 
-    is_active = Column(Boolean, server_default="True", nullable=False)
-    created_at = Column(TIMESTAMP(timezone=True), server_default=text("NOW()"), nullable=False)
+    is_active = Column(Boolean, server_default=true(), nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
 
     # BUYER / FARMER / ADMIN
     user_type = Column(Enum("buyer", "farmer", "admin", name="user_types"),
@@ -38,12 +53,17 @@ class Cart(Base):
 
     id = Column(Integer, primary_key=True, nullable=False, unique=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    created_at = Column(TIMESTAMP(timezone=True), server_default=text("NOW()"), nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     total_amount = Column(Float, nullable=False)
 
     user = relationship("User", back_populates="carts")
     cart_items = relationship("CartItem", back_populates="cart")
 
+    # Keyset pagination of a user's carts
+    __table_args__ = (
+        Index("idx_carts_user_id_id", user_id, id),
+    )
+
 
 class CartItem(Base):
     __tablename__ = "cart_items"
@@ -57,6 +77,11 @@ class CartItem(Base):
     cart = relationship("Cart", back_populates="cart_items")
     product = relationship("Product", back_populates="cart_items")
 
+    # One line per product; cart item adds upsert on this
+    __table_args__ = (
+        UniqueConstraint(cart_id, product_id, name="uq_cart_items_cart_product"),
+    )
+
 
 class Category(Base):
     __tablename__ = "categories"
@@ -79,9 +104,9 @@ class Product(Base):
     stock = Column(Integer, nullable=False)
     brand = Column(String, nullable=False)
     thumbnail = Column(String, nullable=False)
-    images = Column(ARRAY(String), nullable=False)
-    is_published = Column(Boolean, server_default="True", nullable=False)
-    created_at = Column(TIMESTAMP(timezone=True), server_default=text("NOW()"), nullable=False)
+    images = Column(ARRAY(String).with_variant(JSON(), "sqlite"), nullable=False)  # JSON on the SQLite stand-in
+    is_published = Column(Boolean, server_default=true(), nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
 
     category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
     category = relationship("Category", back_populates="products")
@@ -100,6 +125,25 @@ class Product(Base):
     approver = relationship("User", foreign_keys=[approved_by])
     approval_date = Column(TIMESTAMP(timezone=True), nullable=True)
 
+    # Search indexes (Postgres only, needs pg_trgm; see scripts/search_indexes.sql)
+    # the keyset pagination index for approved listings, and exact title
+    # lookups for duplicate checks during bulk import
+    __table_args__ = (
+        Index("idx_products_approval_status_id", approval_status, id),
+        Index("idx_products_title", title),
+        Index(
+            "idx_products_search_tsv",
+            search_document(title, description, brand),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "idx_products_title_trgm",
+            title,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
 
 class Order(Base):
     __tablename__ = "orders"
@@ -110,11 +154,20 @@ class Order(Base):
     payment_method = Column(String, nullable=False)  # COD or UPI
     delivery_address = Column(String, nullable=False)
     status = Column(String, nullable=False, server_default="Pending")  # Pending, Confirmed, Delivered, Cancelled
-    created_at = Column(TIMESTAMP(timezone=True), server_default=text("NOW()"), nullable=False)
+    # Set while the order's quantities are held off product stock; orders
+    # placed before checkout reserved stock never had any taken
+    stock_reserved = Column(Boolean, server_default=false(), nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     user = relationship("User", back_populates="orders")
     order_items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
 
+    # Keyset pagination, newest first (scanned backwards)
+    __table_args__ = (
+        Index("idx_orders_created_at_id", created_at, id),
+    )
+
 
 class OrderItem(Base):
     __tablename__ = "order_items"
@@ -128,3 +181,17 @@ class OrderItem(Base):
 
     order = relationship("Order", back_populates="order_items")
     product = relationship("Product", back_populates="order_items")
+
+
+class RevokedToken(Base):
+    """Token ids (jti) revoked before they expire; rows past expires_at can go."""
+    __tablename__ = "revoked_tokens"
+
+    id = Column(Integer, primary_key=True, nullable=False, unique=True, autoincrement=True)
+    jti = Column(String, unique=True, nullable=False)
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=False)
+    revoked_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("idx_revoked_tokens_expires_at", expires_at),
+    )
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query, status
+from app.db.database import get_session, run_db
+from app.services.stats import StatsService
+from sqlalchemy.orm import Session
+from app.schemas.stats import AdminStatsOut
+from app.core.security import check_admin_role
+
+
+router = APIRouter(tags=["Admin"], prefix="/admin", dependencies=[Depends(check_admin_role)])
+
+
+# Dashboard figures in one request
+@router.get("/stats", status_code=status.HTTP_200_OK, response_model=AdminStatsOut)
+async def get_admin_stats(
+    db: Session = Depends(get_session),
+    days: int = Query(30, ge=1, le=366, description="Window for revenue by day/category and the top lists"),
+    top: int = Query(5, ge=1, le=50, description="Entries in the top products / farmers lists"),
+):
+    """
+    Admin: Order counts and revenue by status, revenue by day and category,
+    pending approvals, top products and top farmers.
+    """
+    return await run_db(db, lambda session: StatsService.get_admin_stats(session, days, top),
+                        response_model=AdminStatsOut)
@@ -1,20 +1,30 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, status, Header ,Form
 from sqlalchemy.orm import Session
 from app.services.auth import AuthService
 from app.db.database import get_db
 from fastapi.security.oauth2 import OAuth2PasswordRequestForm
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from app.schemas.auth import UserOut, Signup
+from app.core.config import settings
+from app.core.rate_limit import RateLimit
 
 
 router = APIRouter(tags=["Auth"], prefix="/auth")
 
+# Rejected before the DB lookup and password hash (see app/core/rate_limit.py)
+signup_limit = RateLimit("signup", settings.rate_limit_signup_ip)
+login_limit = RateLimit("login", settings.rate_limit_login_ip, settings.rate_limit_login_account, ("username",))
+phone_login_limit = RateLimit("login_phone", settings.rate_limit_login_ip, settings.rate_limit_login_account,
+                              ("phone",))
 
-@router.post("/signup", status_code=status.HTTP_200_OK)
+
+@router.post("/signup", status_code=status.HTTP_200_OK, dependencies=[Depends(signup_limit)])
 async def signup_json(user: Signup, db: Session = Depends(get_db)):
     return await AuthService.signup(db, user)
 
 # Accept form-encoded from HTML form (Buyer)
-@router.post("/signup/buyer", status_code=status.HTTP_200_OK)
+@router.post("/signup/buyer", status_code=status.HTTP_200_OK, dependencies=[Depends(signup_limit)])
 async def signup_buyer_form(
     full_name: str = Form(...),
     username: str = Form(...),
@@ -36,7 +46,7 @@ async def signup_buyer_form(
     return await AuthService.signup(db, signup_obj)
 
 # Accept form-encoded from HTML form (Farmer)
-@router.post("/signup/farmer", status_code=status.HTTP_200_OK)
+@router.post("/signup/farmer", status_code=status.HTTP_200_OK, dependencies=[Depends(signup_limit)])
 async def signup_farmer_form(
     full_name: str = Form(...),
     username: str = Form(...),
@@ -56,7 +66,7 @@ async def signup_farmer_form(
     return await AuthService.signup(db, signup_obj)
 
 
-@router.post("/login")
+@router.post("/login", dependencies=[Depends(login_limit)])
 async def login(
     creds: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
@@ -65,7 +75,7 @@ async def login(
 
 
 # Farmer login via phone
-@router.post("/login/phone")
+@router.post("/login/phone", dependencies=[Depends(phone_login_limit)])
 async def farmer_phone_login(
     phone: str = Form(...),
     password: str = Form(...),
@@ -77,4 +87,14 @@ async def farmer_phone_login(
 # Refresh token
 @router.post("/refresh")
 async def refresh(refresh_token: str = Form(...), db: Session = Depends(get_db)):
-    return await AuthService.get_refresh_token(refresh_token, db)
\ No newline at end of file
+    return await AuthService.get_refresh_token(refresh_token, db)
+
+
+# Logout: revokes the refresh token and the bearer access token, if sent
+@router.post("/logout")
+async def logout(
+    refresh_token: str = Form(None),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+    db: Session = Depends(get_db)
+):
+    return await AuthService.logout(db, refresh_token, credentials.credentials if credentials else None)
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, status
 from app.db.database import get_db
 from app.services.categories import CategoryService
 from sqlalchemy.orm import Session
 from app.schemas.categories import CategoryCreate, CategoryOut, CategoriesOut, CategoryOutDelete, CategoryUpdate
 from app.core.security import check_admin_role
+from app.utils.conditional import CATEGORIES_CACHE_CONTROL, conditional_response
 
 
 router = APIRouter(tags=["Categories"], prefix="/categories")
@@ -15,12 +16,15 @@ router = APIRouter(tags=["Categories"], prefix="/categories")
     status_code=status.HTTP_200_OK,
     response_model=CategoriesOut)
 def get_all_categories(
+    request: Request,
     db: Session = Depends(get_db),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
     search: str | None = Query("", description="Search based name of categories"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces page)"),
 ):
-    return CategoryService.get_all_categories(db, page, limit, search)
+    return conditional_response(
+        request, CategoryService.get_all_categories(db, page, limit, search, cursor), CATEGORIES_CACHE_CONTROL)
 
 
 # Get Category By ID
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import REGISTRY
+
+
+router = APIRouter(tags=["Metrics"], prefix="/metrics")
+
+
+# Prometheus scrape endpoint (pool saturation, caches, request timings...)
+@router.get("", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends, Query, status
-from app.db.database import get_db
+from fastapi import APIRouter, Depends, Query, Request, status
+from app.db.database import get_session, run_db
 from app.services.orders import OrderService
+from app.services.exports import ExportService
+from app.utils.responses import ResponseHandler
+from datetime import datetime
+from app.utils.conditional import PRIVATE_CACHE_CONTROL, cached_body, conditional_response, etag_matches, \
+    not_modified
 from sqlalchemy.orm import Session
-from app.schemas.orders import OrderCreate, OrderOut, OrdersOutList, OrderUpdate
+from app.schemas.orders import OrderCreate, OrderOut, OrdersOutList, OrderSummaryList, OrderSummaryWithUserList, \
+    OrdersWithUserList, OrderUpdate
 from app.core.security import get_current_user, check_admin_role
 from fastapi.security import HTTPBearer
 from fastapi.security.http import HTTPAuthorizationCredentials
@@ -11,87 +17,133 @@ from fastapi.security.http import HTTPAuthorizationCredentials
 router = APIRouter(tags=["Orders"], prefix="/orders")
 auth_scheme = HTTPBearer()
 
+# ?view= for order listings: full product details per item, or title/thumbnail only;
+# keyed by (view, include_user)
+LIST_MODELS = {
+    ("full", False): OrdersOutList,
+    ("full", True): OrdersWithUserList,
+    ("summary", False): OrderSummaryList,
+    ("summary", True): OrderSummaryWithUserList,
+}
+view_query = Query("full", pattern="^(full|summary)$",
+                   description="full, or summary (item lines with product title and thumbnail only)")
+
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=OrderOut)
-def create_order(
+async def create_order(
     order_data: OrderCreate,
     user_id: int = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_session)
 ):
     """
     Create an order from the current user's cart.
     Requires: payment_method (COD/UPI) and delivery_address
+    Reserves stock; 409 with a per-line report if any item is short.
     """
-    return OrderService.create_order_from_cart(db, user_id, order_data)
+    return await run_db(
+        db, lambda session: OrderService.create_order_from_cart(session, user_id, order_data), response_model=OrderOut)
 
 
-@router.get("/me", status_code=status.HTTP_200_OK, response_model=OrdersOutList)
-def get_my_orders(
+@router.get("/me", status_code=status.HTTP_200_OK, response_model=OrdersOutList | OrderSummaryList)
+async def get_my_orders(
+    request: Request,
     user_id: int = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_session),
+    view: str = view_query,
 ):
     """
     Get all orders for the logged-in user.
+    Supports If-None-Match; a match is answered from a version query without loading the orders.
     """
-    return OrderService.get_my_orders(db, user_id)
+    etag = await run_db(db, lambda session: OrderService.get_my_orders_etag(session, user_id, view))
+    if etag_matches(request, etag):
+        return not_modified(etag, PRIVATE_CACHE_CONTROL)
+    orders = await run_db(
+        db, lambda session: OrderService.get_my_orders(session, user_id, view), response_model=LIST_MODELS[view, False])
+    return conditional_response(request, cached_body(orders.model_dump(mode="json"), etag), PRIVATE_CACHE_CONTROL)
 
 
 @router.get("/me/{order_id}", status_code=status.HTTP_200_OK, response_model=OrderOut)
-def get_my_order(
+async def get_my_order(
     order_id: int,
     user_id: int = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_session)
 ):
     """
     Get a specific order by ID (user can only see their own orders).
     """
-    return OrderService.get_order_by_id(db, user_id, order_id)
+    return await run_db(
+        db, lambda session: OrderService.get_order_by_id(session, user_id, order_id), response_model=OrderOut)
 
 
 @router.post("/me/{order_id}/cancel", status_code=status.HTTP_200_OK, response_model=OrderOut)
-def cancel_my_order(
+async def cancel_my_order(
     order_id: int,
     user_id: int = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_session)
 ):
     """
     Cancel an order (only if status is Pending).
     """
-    return OrderService.cancel_order(db, user_id, order_id)
+    return await run_db(
+        db, lambda session: OrderService.cancel_order(session, user_id, order_id), response_model=OrderOut)
 
 
 # Admin endpoints
-@router.get("/", status_code=status.HTTP_200_OK, response_model=OrdersOutList)
-def get_all_orders(
-    db: Session = Depends(get_db),
+@router.get("/", status_code=status.HTTP_200_OK, dependencies=[Depends(check_admin_role)],
+            response_model=OrdersWithUserList | OrdersOutList | OrderSummaryWithUserList | OrderSummaryList)
+async def get_all_orders(
+    db: Session = Depends(get_session),
     page: int = Query(1, ge=1, description="Page number"),
-    limit: int = Query(10, ge=1, le=100, description="Items per page")
+    limit: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces page)"),
+    view: str = view_query,
+    include_user: bool = Query(False, description="Embed each order's owner (name, phone)"),
 ):
     """
     Admin: Get all orders with pagination.
     """
-    return OrderService.get_all_orders(db, page, limit)
+    return await run_db(
+        db, lambda session: OrderService.get_all_orders(session, page, limit, cursor, view, include_user),
+        response_model=LIST_MODELS[view, include_user])
+
+
+@router.get("/export", status_code=status.HTTP_200_OK, dependencies=[Depends(check_admin_role)])
+async def export_orders(
+    file_format: str = Query("ndjson", alias="format", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    date_from: datetime | None = Query(None, description="Placed at or after"),
+    date_to: datetime | None = Query(None, description="Placed before"),
+    order_status: str | None = Query(None, alias="status", description="Pending, Confirmed, Delivered or Cancelled"),
+):
+    """
+    Admin: Stream all matching orders. CSV has one row per order item;
+    NDJSON has one order per line with its items nested.
+    """
+    return ResponseHandler.export(
+        ExportService.stream_orders(file_format, date_from, date_to, order_status), file_format, "orders")
 
 
-@router.put("/{order_id}", status_code=status.HTTP_200_OK, response_model=OrderOut)
-def update_order_status(
+@router.put("/{order_id}", status_code=status.HTTP_200_OK, response_model=OrderOut,
+            dependencies=[Depends(check_admin_role)])
+async def update_order_status(
     order_id: int,
     update_data: OrderUpdate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_session)
 ):
     """
     Admin: Update order status (Pending, Confirmed, Delivered, Cancelled).
     """
-    return OrderService.update_order_status(db, order_id, update_data)
+    return await run_db(
+        db, lambda session: OrderService.update_order_status(session, order_id, update_data), response_model=OrderOut)
 
 
 @router.delete("/{order_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(check_admin_role)])
-def delete_order(
+async def delete_order(
     order_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_session)
 ):
     """
     Admin: Delete an order completely.
     """
-    return OrderService.delete_order(db, order_id)
+    return await run_db(db, lambda session: OrderService.delete_order(session, order_id))
 
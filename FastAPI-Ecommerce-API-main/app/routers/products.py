@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, Query, status
-from app.db.database import get_db
+from fastapi import APIRouter, Depends, File, Query, Request, UploadFile, status
+from app.db.database import get_session, run_db
 from app.services.products import ProductService
+from app.services.product_import import ProductImportService
+from app.services.exports import ExportService
+from app.utils.responses import ResponseHandler
+from app.utils.conditional import CATALOGUE_CACHE_CONTROL, conditional_response
 from sqlalchemy.orm import Session
-from app.schemas.products import ProductCreate, ProductOut, ProductsOut, ProductOutDelete, ProductUpdate, ProductCreateSimple
+from app.schemas.products import ProductCreate, ProductOut, ProductsOut, ProductOutDelete, ProductUpdate, ProductCreateSimple, \
+    ProductImportOut
 from app.core.security import get_current_user, check_admin_role, get_current_user_with_type
+from app.schemas.auth import Principal
 from typing import List, Dict, Any
+from datetime import datetime
 
 
 router = APIRouter(tags=["Products"], prefix="/products")
@@ -12,43 +19,66 @@ router = APIRouter(tags=["Products"], prefix="/products")
 
 # Get All Products
 @router.get("/", status_code=status.HTTP_200_OK, response_model=ProductsOut)
-def get_all_products(
-    db: Session = Depends(get_db),
+async def get_all_products(
+    request: Request,
+    db: Session = Depends(get_session),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
-    search: str | None = Query("", description="Search based title of products"),
+    search: str | None = Query("", description="Search title, description, brand and category (typo and Hindi name tolerant)"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces page)"),
 ):
-    """Get all approved products (public endpoint)"""
-    return ProductService.get_all_products(db, page, limit, search, include_pending=False)
+    """Get all approved products (public endpoint). Supports If-None-Match."""
+    cached = await run_db(
+        db, lambda session: ProductService.get_all_products(session, page, limit, search, cursor=cursor))
+    return conditional_response(request, cached, CATALOGUE_CACHE_CONTROL)
 
 
 # Get All Products (Admin - includes pending)
 @router.get("/all", status_code=status.HTTP_200_OK, response_model=ProductsOut, dependencies=[Depends(check_admin_role)])
-def get_all_products_admin(
-    db: Session = Depends(get_db),
+async def get_all_products_admin(
+    db: Session = Depends(get_session),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
-    search: str | None = Query("", description="Search based title of products"),
+    search: str | None = Query("", description="Search title, description, brand and category (typo and Hindi name tolerant)"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces page)"),
 ):
     """Get all products including pending (admin only)"""
-    return ProductService.get_all_products(db, page, limit, search, include_pending=True)
+    return await run_db(
+        db,
+        lambda session: ProductService.list_products(
+            session, page, limit, search, include_pending=True, cursor=cursor),
+        response_model=ProductsOut)
 
 
 # Get Pending Products (Admin only)
 @router.get("/pending", status_code=status.HTTP_200_OK, dependencies=[Depends(check_admin_role)])
-def get_pending_products(
-    db: Session = Depends(get_db),
+async def get_pending_products(
+    db: Session = Depends(get_session),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(50, ge=1, le=100, description="Items per page"),
 ):
     """Get all pending products awaiting approval (admin only)"""
-    return ProductService.get_pending_products(db, page, limit)
+    return await run_db(db, lambda session: ProductService.get_pending_products(session, page, limit))
+
+
+# Export Products (Admin only)
+@router.get("/export", status_code=status.HTTP_200_OK, dependencies=[Depends(check_admin_role)])
+async def export_products(
+    file_format: str = Query("ndjson", alias="format", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    date_from: datetime | None = Query(None, description="Created at or after"),
+    date_to: datetime | None = Query(None, description="Created before"),
+    approval_status: str | None = Query(None, pattern="^(pending|approved|rejected)$"),
+):
+    """Stream every matching product as CSV or NDJSON (admin only)"""
+    return ResponseHandler.export(
+        ExportService.stream_products(file_format, date_from, date_to, approval_status), file_format, "products")
 
 
 # Get Product By ID
 @router.get("/{product_id}", status_code=status.HTTP_200_OK, response_model=ProductOut)
-def get_product(product_id: int, db: Session = Depends(get_db)):
-    return ProductService.get_product(db, product_id)
+async def get_product(product_id: int, request: Request, db: Session = Depends(get_session)):
+    cached = await run_db(db, lambda session: ProductService.get_product(session, product_id))
+    return conditional_response(request, cached, CATALOGUE_CACHE_CONTROL)
 
 
 # Create New Product
@@ -56,43 +86,44 @@ def get_product(product_id: int, db: Session = Depends(get_db)):
     "/",
     status_code=status.HTTP_201_CREATED,
     response_model=ProductOut)
-def create_product(
+async def create_product(
         product: ProductCreate,
         user_info: Dict[str, Any] = Depends(get_current_user_with_type),
-        db: Session = Depends(get_db)):
+        db: Session = Depends(get_session)):
     """Create product. Farmers create pending products, admins create approved products."""
-    return ProductService.create_product(
-        db, 
-        product, 
-        user_id=user_info["user_id"], 
-        user_type=user_info["user_type"]
-    )
+    return await run_db(
+        db,
+        lambda session: ProductService.create_product(
+            session,
+            product,
+            user_id=user_info["user_id"],
+            user_type=user_info["user_type"]
+        ),
+        response_model=ProductOut)
 
 
 # Approve Product (Admin only)
 @router.put(
     "/{product_id}/approve",
-    status_code=status.HTTP_200_OK,
-    dependencies=[Depends(check_admin_role)])
-def approve_product(
+    status_code=status.HTTP_200_OK)
+async def approve_product(
         product_id: int,
-        admin_user = Depends(check_admin_role),
-        db: Session = Depends(get_db)):
+        admin_user: Principal = Depends(check_admin_role),
+        db: Session = Depends(get_session)):
     """Approve a pending product (admin only)"""
-    return ProductService.approve_product(db, product_id, admin_user.id)
+    return await run_db(db, lambda session: ProductService.approve_product(session, product_id, admin_user.id))
 
 
 # Reject Product (Admin only)
 @router.put(
     "/{product_id}/reject",
-    status_code=status.HTTP_200_OK,
-    dependencies=[Depends(check_admin_role)])
-def reject_product(
+    status_code=status.HTTP_200_OK)
+async def reject_product(
         product_id: int,
-        admin_user = Depends(check_admin_role),
-        db: Session = Depends(get_db)):
+        admin_user: Principal = Depends(check_admin_role),
+        db: Session = Depends(get_session)):
     """Reject a pending product (admin only)"""
-    return ProductService.reject_product(db, product_id, admin_user.id)
+    return await run_db(db, lambda session: ProductService.reject_product(session, product_id, admin_user.id))
 
 
 # Update Exist Product
@@ -100,11 +131,14 @@ def reject_product(
     "/{product_id}",
     status_code=status.HTTP_200_OK,
     response_model=ProductOut)
-def update_product(
+async def update_product(
         product_id: int,
         updated_product: ProductUpdate,
-        db: Session = Depends(get_db)):
-    return ProductService.update_product(db, product_id, updated_product)
+        db: Session = Depends(get_session)):
+    return await run_db(
+        db,
+        lambda session: ProductService.update_product(session, product_id, updated_product),
+        response_model=ProductOut)
 
 
 # Delete Product By ID
@@ -112,10 +146,13 @@ def update_product(
     "/{product_id}",
     status_code=status.HTTP_200_OK,
     response_model=ProductOutDelete)
-def delete_product(
+async def delete_product(
         product_id: int,
-        db: Session = Depends(get_db)):
-    return ProductService.delete_product(db, product_id)
+        db: Session = Depends(get_session)):
+    return await run_db(
+        db,
+        lambda session: ProductService.delete_product(session, product_id),
+        response_model=ProductOutDelete)
 
 
 # Bulk Create Products
@@ -123,14 +160,47 @@ def delete_product(
     "/bulk",
     status_code=status.HTTP_201_CREATED,
     response_model=ProductsOut)
-def bulk_create_products(
+async def bulk_create_products(
         products: List[ProductCreateSimple],
         skip_duplicates: bool = Query(False, description="Skip products with duplicate titles"),
         user_id: int = Depends(get_current_user),
-        db: Session = Depends(get_db)):
+        db: Session = Depends(get_session)):
     """
     Bulk create products. Requires authentication (farmer or admin).
     Automatically creates categories if they don't exist.
     Set skip_duplicates=true to avoid duplicate product titles.
     """
-    return ProductService.bulk_create_products(db, products, farmer_id=user_id, skip_duplicates=skip_duplicates)
+    return await run_db(
+        db,
+        lambda session: ProductService.bulk_create_products(
+            session, products, farmer_id=user_id, skip_duplicates=skip_duplicates),
+        response_model=ProductsOut)
+
+
+# Import Products from a CSV / NDJSON file
+@router.post(
+    "/import",
+    status_code=status.HTTP_200_OK,
+    response_model=ProductImportOut)
+async def import_products(
+        file: UploadFile = File(..., description="CSV with a header row, or NDJSON (one product object per line)"),
+        file_format: str | None = Query(None, alias="format", pattern="^(csv|ndjson)$",
+                                        description="csv or ndjson (default: from the file extension)"),
+        skip_duplicates: bool = Query(False, description="Skip products with duplicate titles"),
+        chunk_size: int = Query(ProductImportService.CHUNK_SIZE, ge=1, le=10000, description="Rows per insert batch"),
+        user_id: int = Depends(get_current_user),
+        db: Session = Depends(get_session)):
+    """
+    Import products from a file, in the same shape as /products/bulk rows.
+    Requires authentication (farmer or admin). The file is read and inserted in chunks;
+    invalid rows are reported in `errors` and don't stop the rest of the import.
+    """
+    if not file_format:
+        is_ndjson = (file.filename or "").lower().endswith((".ndjson", ".jsonl"))
+        file_format = "ndjson" if is_ndjson else "csv"
+    return await run_db(
+        db,
+        lambda session: ProductImportService.import_file(
+            session, file.file, file_format, farmer_id=user_id,
+            skip_duplicates=skip_duplicates, chunk_size=chunk_size),
+        response_model=ProductImportOut)
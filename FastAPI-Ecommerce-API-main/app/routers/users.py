@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, Query, status
 from app.db.database import get_db
 from app.services.users import UserService
 from sqlalchemy.orm import Session
-from app.schemas.users import UserCreate, UserOut, UsersOut, UserOutDelete, UserUpdate
+from app.schemas.users import UserCreate, UserOut, UsersOut, UsersBatchOut, UserOutDelete, UserUpdate
 from app.core.security import check_admin_role, get_current_user
 
 
@@ -41,9 +41,24 @@ def get_all_users(
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
     search: str | None = Query("", description="Search based username"),
-    role: str = Query("user", enum=["user", "admin"])
+    role: str = Query("user", enum=["user", "admin"]),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces page)"),
 ):
-    return UserService.get_all_users(db, page, limit, search, role)
+    return UserService.get_all_users(db, page, limit, search, role, cursor)
+
+
+# Get Users By IDs (declared before /{user_id} so "batch" isn't parsed as an id)
+@router.get(
+    "/batch",
+    status_code=status.HTTP_200_OK,
+    response_model=UsersBatchOut,
+    dependencies=[Depends(check_admin_role)])
+def get_users_batch(
+    db: Session = Depends(get_db),
+    ids: str = Query(..., pattern=r"^\d+(,\d+)*$", description="Comma-separated user ids, e.g. 1,2,3"),
+):
+    """Admin: resolve up to 500 users in one query (name, phone, role)."""
+    return UserService.get_users_by_ids(db, [int(user_id) for user_id in ids.split(",")])
 
 
 # Get User By ID
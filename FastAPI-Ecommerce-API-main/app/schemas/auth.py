@@ -42,6 +42,16 @@ class UserOut(BaseModel):
         pass
 
 
+# Authenticated principal (what the auth dependencies resolve a token to)
+class Principal(BaseModel):
+    id: int
+    user_type: str
+    is_active: bool = True
+
+    class Config(BaseConfig):
+        pass
+
+
 # Token
 class TokenResponse(BaseModel):
     access_token: str
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from app.schemas.products import ProductBase, CategoryBase
 
@@ -63,6 +63,7 @@ class CartOut(BaseModel):
 class CartsOutList(BaseModel):
     message: str
     data: List[CartBase]
+    next_cursor: Optional[str] = None
 
 
 class CartsUserOutList(BaseModel):
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -23,6 +23,7 @@ class CategoryOut(BaseModel):
 class CategoriesOut(BaseModel):
     message: str
     data: List[CategoryBase]
+    next_cursor: Optional[str] = None
 
 
 class CategoryDelete(BaseModel):
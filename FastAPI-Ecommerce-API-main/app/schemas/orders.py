@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from app.schemas.products import ProductBase, CategoryBase
 
@@ -68,11 +68,83 @@ class OrderOut(BaseModel):
 class OrdersOutList(BaseModel):
     message: str
     data: List[OrderBase]
+    next_cursor: Optional[str] = None
 
     class Config(BaseConfig):
         pass
 
 
+# Summary view (?view=summary): order columns plus item lines with the product's title and thumbnail
+class ProductSummary(BaseModel):
+    id: int
+    title: str
+    thumbnail: str
+
+    class Config(BaseConfig):
+        pass
+
+
+class OrderItemSummary(BaseModel):
+    id: int
+    product_id: int
+    quantity: int
+    price_at_purchase: float
+    subtotal: float
+    product: Optional[ProductSummary] = None
+
+    class Config(BaseConfig):
+        pass
+
+
+class OrderSummary(BaseModel):
+    id: int
+    user_id: int
+    total_amount: float
+    payment_method: str
+    delivery_address: str
+    status: str
+    created_at: datetime
+    order_items: List[OrderItemSummary]
+
+    class Config(BaseConfig):
+        pass
+
+
+class OrderSummaryList(BaseModel):
+    message: str
+    data: List[OrderSummary]
+    next_cursor: Optional[str] = None
+
+    class Config(BaseConfig):
+        pass
+
+
+# Order owner, embedded with ?include_user=true
+class OrderUser(BaseModel):
+    id: int
+    full_name: str
+    phone: Optional[str] = None
+
+    class Config(BaseConfig):
+        pass
+
+
+class OrderWithUser(OrderBase):
+    user: Optional[OrderUser] = None
+
+
+class OrdersWithUserList(OrdersOutList):
+    data: List[OrderWithUser]
+
+
+class OrderSummaryWithUser(OrderSummary):
+    user: Optional[OrderUser] = None
+
+
+class OrderSummaryWithUserList(OrderSummaryList):
+    data: List[OrderSummaryWithUser]
+
+
 class OrderUpdate(BaseModel):
     status: str  # Pending, Confirmed, Delivered, Cancelled
 
@@ -87,7 +87,9 @@ class ProductOut(BaseModel):
 
 class ProductsOut(BaseModel):
     message: str
+    total: Optional[int] = None   # set for search results
     data: List[ProductBase]
+    next_cursor: Optional[str] = None
 
     class Config(BaseConfig):
         pass
@@ -103,6 +105,20 @@ class ProductBulkCreateResponse(BaseModel):
         pass
 
 
+# Product Import (CSV / NDJSON upload)
+class ProductImportError(BaseModel):
+    row: int
+    title: Optional[str] = None
+    error: str
+
+
+class ProductImportOut(BaseModel):
+    message: str
+    created: int
+    skipped: int
+    errors: List[ProductImportError]
+
+
 # Delete Product
 class ProductDelete(ProductBase):
     category: ClassVar[CategoryBase]
@@ -0,0 +1,54 @@
+from datetime import date
+from typing import List
+from pydantic import BaseModel
+
+
+class StatusCount(BaseModel):
+    status: str
+    orders: int
+    revenue: float
+
+
+class DailyRevenue(BaseModel):
+    day: date
+    orders: int
+    revenue: float
+
+
+class CategoryRevenue(BaseModel):
+    category: str
+    revenue: float
+
+
+class TopProduct(BaseModel):
+    product_id: int
+    title: str
+    units: int
+    revenue: float
+
+
+class TopFarmer(BaseModel):
+    farmer_id: int
+    full_name: str
+    products: int
+    units: int
+    revenue: float
+
+
+class AdminStats(BaseModel):
+    days: int
+    total_orders: int
+    total_revenue: float
+    farmers: int
+    active_products: int
+    pending_approvals: int
+    orders_by_status: List[StatusCount]
+    revenue_by_day: List[DailyRevenue]
+    revenue_by_category: List[CategoryRevenue]
+    top_products: List[TopProduct]
+    top_farmers: List[TopFarmer]
+
+
+class AdminStatsOut(BaseModel):
+    message: str
+    data: AdminStats
@@ -1,5 +1,5 @@
 from pydantic import BaseModel , EmailStr
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from app.schemas.carts import CartBase
 
@@ -26,6 +26,18 @@ class UserBase(BaseModel):
         pass
 
 
+# Compact profile for batch lookups (no password, no carts)
+class UserSummary(BaseModel):
+    id: int
+    username: str
+    full_name: str
+    phone: str | None = None
+    user_type: str
+
+    class Config(BaseConfig):
+        pass
+
+
 class UserCreate(BaseModel):
     full_name: str
     username: str
@@ -51,6 +63,7 @@ class UserOut(BaseModel):
 class UsersOut(BaseModel):
     message: str
     data: List[UserBase]
+    next_cursor: Optional[str] = None
 
     class Config(BaseConfig):
         pass
@@ -62,3 +75,12 @@ class UserOutDelete(BaseModel):
 
     class Config(BaseConfig):
         pass
+
+
+class UsersBatchOut(BaseModel):
+    message: str
+    data: List[UserSummary]
+    missing: List[int] = []
+
+    class Config(BaseConfig):
+        pass
@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.models import User
 from app.utils.responses import ResponseHandler
-from app.core.security import get_password_hash, get_token_payload
+from app.core.security import get_password_hash, get_token_payload, invalidate_principal
 
 
 class AccountService:
@@ -24,6 +24,7 @@ class AccountService:
             setattr(db_user, key, value)
 
         db.commit()
+        invalidate_principal(user_id)
         db.refresh(db_user)
         return ResponseHandler.update_success(db_user.username, db_user.id, db_user)
 
@@ -35,4 +36,5 @@ class AccountService:
             ResponseHandler.not_found_error("User", user_id)
         db.delete(db_user)
         db.commit()
+        invalidate_principal(user_id)
         return ResponseHandler.delete_success(db_user.username, db_user.id, db_user)
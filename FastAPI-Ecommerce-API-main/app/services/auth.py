@@ -1,10 +1,17 @@
+from typing import Optional
+
 from fastapi import HTTPException, Depends, status
+from jose import JWTError
 from fastapi.security.oauth2 import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.models.models import User
-from app.db.database import get_db
-from app.core.security import verify_password, get_user_token, get_token_payload
-from app.core.security import get_password_hash
+from app.db.database import get_db, run_db
+from app.core.config import settings
+from app.core.hashing import passwords
+from app.core import tokens
+from app.core.security import get_user_token, get_token_payload
 from app.utils.responses import ResponseHandler
 from app.schemas.auth import Signup
 
@@ -13,44 +20,105 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
 class AuthService:
+    """
+    Login and signup. Queries go through run_db and password hashing through
+    the hashing pool, so neither blocks the event loop.
+    """
+
     @staticmethod
-    async def login(user_credentials: OAuth2PasswordRequestForm, db: Session):
-        user = db.query(User).filter(User.username == user_credentials.username).first()
+    def _find_user(db: Session, *criteria) -> Optional[User]:
+        return db.query(User).filter(*criteria).first()
+
+    @staticmethod
+    def _store_hash(db: Session, user_id: int, hashed_password: str) -> None:
+        db.query(User).filter(User.id == user_id).update({User.password: hashed_password}, synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    async def _authenticate(db: Session, user: Optional[User], password: str):
+        """Tokens for `user` if `password` matches; upgrades an outdated hash with PASSWORD_REHASH_ON_LOGIN."""
         if not user:
             raise HTTPException(status_code=403, detail="Invalid Credentials")
-
-        if not verify_password(user_credentials.password, user.password):
+        user_id, user_type = user.id, user.user_type
+
+        if settings.password_rehash_on_login:
+            valid, new_hash = await passwords.verify_and_update(password, user.password)
+            if valid and new_hash:
+                await run_db(db, lambda session: AuthService._store_hash(session, user_id, new_hash))
+        else:
+            valid = await passwords.verify(password, user.password)
+        if not valid:
             raise HTTPException(status_code=403, detail="Invalid Credentials")
 
-        return await get_user_token(id=user.id)
+        return await get_user_token(id=user_id, user_type=user_type)
+
+    @staticmethod
+    async def login(user_credentials: OAuth2PasswordRequestForm, db: Session):
+        user = await run_db(db, lambda session: AuthService._find_user(
+            session, User.username == user_credentials.username))
+        return await AuthService._authenticate(db, user, user_credentials.password)
 
     # Login via phone (Farmer)
     @staticmethod
     async def login_with_phone(phone: str, password: str, db: Session):
-        user = db.query(User).filter(User.phone == phone).first()
-        if not user or not verify_password(password, user.password):
-            raise HTTPException(status_code=403, detail="Invalid Credentials")
+        user = await run_db(db, lambda session: AuthService._find_user(session, User.phone == phone))
+        return await AuthService._authenticate(db, user, password)
 
-        return await get_user_token(id=user.id)
+    # Unique user fields, in the order conflicts are reported
+    UNIQUE_FIELDS = ("username", "email", "phone")
 
     @staticmethod
-    async def signup(db: Session, user: Signup):
-        # Basic uniqueness checks
-        if db.query(User).filter(User.username == user.username).first():
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already exists")
+    def _already_exists(field: str) -> HTTPException:
+        return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{field.capitalize()} already exists")
+
+    @staticmethod
+    def _check_available(db: Session, user: Signup) -> None:
+        """One query for any user sharing the username, email or phone; runs before hashing."""
+        wanted = {field: getattr(user, field) for field in AuthService.UNIQUE_FIELDS if getattr(user, field)}
+        taken = db.query(User.username, User.email, User.phone).filter(
+            or_(*(getattr(User, field) == value for field, value in wanted.items()))).limit(3).all()
+        for field, value in wanted.items():
+            if any(getattr(row, field) == value for row in taken):
+                raise AuthService._already_exists(field)
 
-        if user.email and db.query(User).filter(User.email == user.email).first():
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists")
+    @staticmethod
+    def _conflicting_field(error: IntegrityError) -> Optional[str]:
+        # Postgres names the constraint (users_<field>_key), SQLite the column (users.<field>)
+        message = str(error.orig)
+        for field in AuthService.UNIQUE_FIELDS:
+            if f"users_{field}_key" in message or f"users.{field}" in message:
+                return field
+        return None
+
+    @staticmethod
+    def _create_user(db: Session, user_data: dict):
+        """Insert the user; a signup racing past _check_available gets the same 400 from the unique constraint."""
+        db_user = User(**user_data)
+        try:
+            db.add(db_user)
+            db.flush()
+            # Read before commit expires them, saving a refresh query
+            created = {"id": db_user.id, "username": db_user.username, "user_type": db_user.user_type}
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            field = AuthService._conflicting_field(e)
+            if field:
+                raise AuthService._already_exists(field)
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid user details")
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
-        if user.phone and db.query(User).filter(User.phone == user.phone).first():
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Phone already exists")
+        return ResponseHandler.create_success("User created", created["id"], created)
 
-        # Hash password
-        hashed_password = get_password_hash(user.password)
+    @staticmethod
+    async def signup(db: Session, user: Signup):
+        await run_db(db, lambda session: AuthService._check_available(session, user))
 
         # build dict for model creation, avoid passing None for unique fields if you prefer
         user_data = user.model_dump()
-        user_data['password'] = hashed_password
+        user_data['password'] = await passwords.hash(user.password)
 
         # Ensure correct user_type
         user_type = user_data.get('user_type') or "buyer"
@@ -58,31 +126,42 @@ class AuthService:
             user_type = "buyer"
         user_data['user_type'] = user_type
 
-        # Create and commit
-        db_user = User(**user_data)
-        try:
-            db.add(db_user)
-            db.commit()
-            db.refresh(db_user)
-        except Exception as e:
-            db.rollback()
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
-
-        return ResponseHandler.create_success("User created", db_user.id, {
-            "id": db_user.id,
-            "username": db_user.username,
-            "user_type": db_user.user_type
-        })
+        return await run_db(db, lambda session: AuthService._create_user(session, user_data))
 
     @staticmethod
     async def get_refresh_token(token, db):
-        payload = get_token_payload(token)
+        payload = get_token_payload(token, tokens.REFRESH)
         user_id = payload.get('id', None)
         if not user_id:
             raise ResponseHandler.invalid_token('refresh')
 
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await run_db(db, lambda session: AuthService._find_user(session, User.id == user_id))
         if not user:
             raise ResponseHandler.invalid_token('refresh')
 
-        return await get_user_token(id=user.id, refresh_token=token)
+        # A new pair: the access token's role claim comes from the current user row
+        return await get_user_token(id=user.id, user_type=user.user_type)
+
+    @staticmethod
+    async def logout(db: Session, refresh_token: Optional[str] = None, access_token: Optional[str] = None):
+        """Revoke the given refresh and/or access token on every worker."""
+        if not refresh_token and not access_token:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No token to revoke")
+        payloads = []
+        for name, token in ((tokens.REFRESH, refresh_token), (tokens.ACCESS, access_token)):
+            if token:
+                try:
+                    payloads.append(tokens.decode(token, name))
+                except JWTError:
+                    raise ResponseHandler.invalid_token(name)
+        if not all(payload.get("jti") for payload in payloads):
+            # Only legacy refresh tokens (JWT_ACCEPT_LEGACY_TOKENS) lack one
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail="This token can't be revoked")
+
+        def revoke_all(session: Session) -> None:
+            for payload in payloads:
+                tokens.revoke(session, payload)
+
+        await run_db(db, revoke_all)
+        return ResponseHandler.success("Logged out")
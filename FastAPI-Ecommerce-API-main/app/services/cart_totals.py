@@ -0,0 +1,145 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Numeric, bindparam, cast, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.metrics import Counter, Histogram
+from app.db.database import SessionLocal
+from app.models.models import Cart, CartItem
+
+logger = logging.getLogger(__name__)
+
+CARTS_CHECKED = Counter(
+    "cart_reconcile_checked_total",
+    "Cart totals checked against the sum of their lines",
+)
+CARTS_CORRECTED = Counter(
+    "cart_reconcile_corrected_total",
+    "Cart totals that had drifted from their lines and were repaired",
+)
+CART_DRIFT = Histogram(
+    "cart_reconcile_drift_amount",
+    "Absolute difference between a repaired cart total and its lines",
+    buckets=(0.01, 0.1, 1, 10, 100, 1000, 10000),
+)
+
+# Totals are rounded to paise; anything closer is float noise
+TOLERANCE = 0.005
+BATCH_PAUSE = 0.01
+
+
+class CartTotals:
+    """
+    Background check of the denormalized carts.total_amount. Cart writes keep
+    it in step incrementally (CartService._add_to_total, or the trigger in
+    scripts/cart_totals_trigger.sql); this scans carts in id order and repairs
+    any whose total no longer matches the sum of its line subtotals.
+    """
+
+    @staticmethod
+    def _line_sums(db: Session, cart_ids: List[int]) -> Dict[int, float]:
+        rows = (
+            db.query(CartItem.cart_id, func.round(cast(func.sum(CartItem.subtotal), Numeric), 2))
+            .filter(CartItem.cart_id.in_(cart_ids))
+            .group_by(CartItem.cart_id)
+            .all()
+        )
+        return {cart_id: float(total) for cart_id, total in rows}
+
+    @staticmethod
+    def _scan(db: Session, after_id: int, batch_size: int) -> Tuple[List[int], int, int]:
+        """(drifted cart ids, carts checked, last id) for the next batch after `after_id`."""
+        rows = (
+            db.query(Cart.id, Cart.total_amount, func.coalesce(func.sum(CartItem.subtotal), 0))
+            .outerjoin(CartItem, CartItem.cart_id == Cart.id)
+            .filter(Cart.id > after_id)
+            .group_by(Cart.id, Cart.total_amount)
+            .order_by(Cart.id)
+            .limit(batch_size)
+            .all()
+        )
+        drifted = [cart_id for cart_id, total, lines in rows if abs(total - float(lines)) > TOLERANCE]
+        return drifted, len(rows), rows[-1][0] if rows else after_id
+
+    @staticmethod
+    def _repair(db: Session, cart_ids: List[int]) -> int:
+        """
+        Lock the carts, then re-read their lines: a cart write still in flight
+        finishes first, so its line is counted and its delta isn't overwritten.
+        """
+        db.query(Cart.id).filter(Cart.id.in_(cart_ids)).order_by(Cart.id).with_for_update().all()
+        totals = dict(db.query(Cart.id, Cart.total_amount).filter(Cart.id.in_(cart_ids)).all())
+        sums = CartTotals._line_sums(db, cart_ids)
+        fixes = []
+        for cart_id, total in totals.items():
+            actual = sums.get(cart_id, 0.0)
+            if abs(total - actual) > TOLERANCE:
+                fixes.append({"cart_id": cart_id, "total": actual})
+                CART_DRIFT.observe(abs(total - actual))
+        if fixes:
+            db.execute(
+                update(Cart.__table__).where(Cart.__table__.c.id == bindparam("cart_id"))
+                .values(total_amount=bindparam("total")),
+                fixes,
+            )
+        db.commit()
+        return len(fixes)
+
+    @staticmethod
+    def reconcile(db: Session, batch_size: int = 1000, pause: float = BATCH_PAUSE,
+                  stop: Optional[threading.Event] = None) -> Tuple[int, int]:
+        """One pass over every cart, cut short between batches once `stop` is set; returns (checked, corrected)."""
+        stop = stop or threading.Event()
+        checked = corrected = 0
+        after_id = 0
+        while not stop.is_set():
+            drifted, seen, after_id = CartTotals._scan(db, after_id, batch_size)
+            db.rollback()  # end the read transaction between batches
+            if not seen:
+                break
+            checked += seen
+            CARTS_CHECKED.inc(seen)
+            if drifted:
+                fixed = CartTotals._repair(db, drifted)
+                corrected += fixed
+                CARTS_CORRECTED.inc(fixed)
+            if pause:
+                stop.wait(pause)
+        if corrected:
+            logger.warning("Repaired %d of %d cart totals that drifted from their lines", corrected, checked)
+        return checked, corrected
+
+    @staticmethod
+    def start(interval: float, batch_size: int,
+              session_factory: Callable[[], Session] = SessionLocal) -> "Reconciler":
+        """Reconcile every `interval` seconds in a daemon thread; stop() it on shutdown."""
+        thread = Reconciler(interval, batch_size, session_factory)
+        thread.start()
+        return thread
+
+
+class Reconciler(threading.Thread):
+    """The CartTotals.start() thread: a pass every `interval` seconds until stop()."""
+
+    def __init__(self, interval: float, batch_size: int, session_factory: Callable[[], Session]):
+        super().__init__(name="cart-reconcile", daemon=True)
+        self.interval = interval
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                with self.session_factory() as db:
+                    CartTotals.reconcile(db, self.batch_size, stop=self.stopped)
+            except Exception:
+                logger.exception("Cart total reconciliation failed")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop after the batch in progress, waiting up to `timeout` seconds for it."""
+        self.stopped.set()
+        self.join(timeout)
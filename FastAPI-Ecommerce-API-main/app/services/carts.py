@@ -1,20 +1,29 @@
+from typing import List
+from fastapi import HTTPException, status
+from sqlalchemy import Numeric, cast, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from app.models.models import Cart, CartItem, Product
 from app.schemas.carts import CartUpdate, CartCreate
 from app.utils.responses import ResponseHandler
 from sqlalchemy.orm import joinedload
+from app.core.config import settings
 from app.core.security import get_current_user
+from app.utils.pagination import paginate
 
 
 class CartService:
     
     # Get All Carts
     @staticmethod
-    def get_all_carts(token, db: Session, page: int, limit: int):
+    def get_all_carts(token, db: Session, page: int, limit: int, cursor: str = None):
         user_id = get_current_user(token)
-        carts = db.query(Cart).filter(Cart.user_id == user_id).offset((page - 1) * limit).limit(limit).all()
+        query = db.query(Cart).filter(Cart.user_id == user_id)
+        carts, next_cursor = paginate(query, [Cart.id], page, limit, cursor)
         message = f"Page {page} with {limit} carts"
-        return ResponseHandler.success(message, carts)
+        response = ResponseHandler.success(message, carts)
+        response["next_cursor"] = next_cursor
+        return response
 
     # Get A Cart By ID
     @staticmethod
@@ -25,33 +34,93 @@ class CartService:
             ResponseHandler.not_found_error("Cart", cart_id)
         return ResponseHandler.get_single_success("cart", cart_id, cart)
 
-    # Create a new Cart
+    # Price cart lines against a single product lookup
     @staticmethod
-    def create_cart(token, db: Session, cart: CartCreate):
-        user_id = get_current_user(token)
-        cart_dict = cart.model_dump()
+    def _price_cart_items(db: Session, items_data: List[dict]):
+        # Repeated products are merged into one line (cart_items is unique per product)
+        quantities = {}
+        for item_data in items_data:
+            product_id = item_data["product_id"]
+            quantities[product_id] = quantities.get(product_id, 0) + item_data["quantity"]
+
+        products = {}
+        if quantities:
+            rows = (
+                db.query(Product.id, Product.price, Product.discount_percentage)
+                .filter(Product.id.in_(quantities))
+                .all()
+            )
+            products = {row.id: row for row in rows}
 
-        cart_items_data = cart_dict.pop("cart_items", [])
         cart_items = []
         total_amount = 0
-        for item_data in cart_items_data:
-            product_id = item_data['product_id']
-            quantity = item_data['quantity']
-
-            product = db.query(Product).filter(Product.id == product_id).first()
+        for product_id, quantity in quantities.items():
+            product = products.get(product_id)
             if not product:
-                return ResponseHandler.not_found_error("Product", product_id)
+                ResponseHandler.not_found_error("Product", product_id)
 
-            discount = getattr(product, "discount_percentage", 0) or 0
-            subtotal = quantity * product.price * (1 - (discount / 100))
-            cart_item = CartItem(product_id=product_id, quantity=quantity, subtotal=subtotal)
+            subtotal = CartService._line_subtotal(product, quantity)
+            cart_items.append({"product_id": product_id, "quantity": quantity, "subtotal": subtotal})
             total_amount += subtotal
+        return cart_items, round(total_amount, 2)
+
+    @staticmethod
+    def _line_subtotal(product, quantity: int) -> float:
+        discount = product.discount_percentage or 0
+        return round(quantity * float(product.price) * (1 - (discount / 100)), 2)
 
-            cart_items.append(cart_item)
-        cart_db = Cart(cart_items=cart_items, user_id=user_id, total_amount=total_amount, **cart_dict)
+    # Keep carts.total_amount in step with a line change without re-reading the lines
+    # (the DB trigger does it when CART_TOTALS_TRIGGER is set)
+    @staticmethod
+    def _add_to_total(db: Session, cart_id: int, delta: float):
+        if settings.cart_totals_trigger:
+            return
+        db.execute(
+            update(Cart)
+            .where(Cart.id == cart_id)
+            .values(total_amount=func.round(cast(Cart.total_amount + delta, Numeric), 2))
+        )
+
+    @staticmethod
+    def _insert(db: Session):
+        """Dialect INSERT construct, for on_conflict_do_update()."""
+        if db.get_bind().dialect.name == "postgresql":
+            return postgresql.insert
+        return sqlite.insert
+
+    # One executemany for all lines; ids aren't needed because the cart is reloaded
+    @staticmethod
+    def _insert_cart_items(db: Session, cart_id: int, cart_items: List[dict]):
+        if cart_items:
+            db.execute(insert(CartItem), [dict(item, cart_id=cart_id) for item in cart_items])
+
+    @staticmethod
+    def _load_cart(db: Session, cart_id: int):
+        return (
+            db.query(Cart)
+            .options(joinedload(Cart.cart_items).joinedload(CartItem.product))
+            .filter(Cart.id == cart_id)
+            .first()
+        )
+
+    # Create a new Cart
+    @staticmethod
+    def create_cart(token, db: Session, cart: CartCreate):
+        user_id = get_current_user(token)
+        cart_dict = cart.model_dump()
+
+        cart_items_data = cart_dict.pop("cart_items", [])
+        cart_items, total_amount = CartService._price_cart_items(db, cart_items_data)
+
+        # With the trigger, inserting the lines adds them to the total
+        if settings.cart_totals_trigger:
+            total_amount = 0.0
+        cart_db = Cart(user_id=user_id, total_amount=total_amount, **cart_dict)
         db.add(cart_db)
+        db.flush()
+        CartService._insert_cart_items(db, cart_db.id, cart_items)
         db.commit()
-        db.refresh(cart_db)
+        cart_db = CartService._load_cart(db, cart_db.id)
         return ResponseHandler.create_success("Cart", cart_db.id, cart_db)
 
     # Update Cart & CartItem
@@ -63,32 +132,17 @@ class CartService:
         if not cart:
             return ResponseHandler.not_found_error("Cart", cart_id)
 
-        # Delete existing cart_items
-        db.query(CartItem).filter(CartItem.cart_id == cart_id).delete()
-
-        for item in updated_cart.cart_items:
-            product_id = item.product_id
-            quantity = item.quantity
-
-            product = db.query(Product).filter(Product.id == product_id).first()
-            if not product:
-                return ResponseHandler.not_found_error("Product", product_id)
-            discount = product.discount_percentage or 0
-            subtotal = quantity * product.price * (1 - (discount / 100))
-
-
-            cart_item = CartItem(
-                cart_id=cart_id,
-                product_id=product_id,
-                quantity=quantity,
-                subtotal=subtotal
-            )
-            db.add(cart_item)
+        cart_items, total_amount = CartService._price_cart_items(
+            db, [item.model_dump() for item in updated_cart.cart_items]
+        )
 
-        cart.total_amount = sum(item.subtotal for item in cart.cart_items)
+        # Replace existing cart_items
+        db.query(CartItem).filter(CartItem.cart_id == cart_id).delete(synchronize_session=False)
+        CartService._insert_cart_items(db, cart_id, cart_items)
+        cart.total_amount = total_amount
 
         db.commit()
-        db.refresh(cart)
+        cart = CartService._load_cart(db, cart_id)
         return ResponseHandler.update_success("cart", cart.id, cart)
 
     # Delete Both Cart and CartItems
@@ -104,10 +158,10 @@ class CartService:
         if not cart:
             ResponseHandler.not_found_error("Cart", cart_id)
 
-        for cart_item in cart.cart_items:
-            db.delete(cart_item)
-
-        db.delete(cart)
+        db.query(CartItem).filter(CartItem.cart_id == cart_id).delete(synchronize_session=False)
+        db.query(Cart).filter(Cart.id == cart_id).delete(synchronize_session=False)
+        # Detach the loaded rows so the response can still be built from them after commit
+        db.expunge_all()
         db.commit()
         return ResponseHandler.delete_success("Cart", cart_id, cart)
     @staticmethod
@@ -130,53 +184,48 @@ class CartService:
         if not product_id or quantity < 1:
             raise ValueError("product_id and positive quantity required")
 
-        # Fetch the product
-        product = db.query(Product).filter(Product.id == product_id).first()
+        # Product price and the user's latest cart in one round-trip
+        latest_cart_id = (
+            select(Cart.id)
+            .where(Cart.user_id == user_id)
+            .order_by(Cart.created_at.desc(), Cart.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        product = (
+            db.query(Product.price, Product.discount_percentage, latest_cart_id.label("cart_id"))
+            .filter(Product.id == product_id)
+            .first()
+        )
         if not product:
-            # you can raise HTTPException instead if you want proper status code from service layer
-            from fastapi import HTTPException, status
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
 
-        # Find or create cart for user (latest active)
-        cart = db.query(Cart).filter(Cart.user_id == user_id).order_by(Cart.created_at.desc()).first()
-        if not cart:
+        cart_id = product.cart_id
+        if cart_id is None:
             cart = Cart(user_id=user_id, total_amount=0.0)
             db.add(cart)
-            db.commit()
-            db.refresh(cart)
-
-        # See if cart item for product exists, update quantity else create
-        cart_item = db.query(CartItem).filter(
-            CartItem.cart_id == cart.id,
-            CartItem.product_id == product_id
-        ).first()
-
-        if cart_item:
-            cart_item.quantity = cart_item.quantity + quantity
-        else:
-            cart_item = CartItem(cart_id=cart.id, product_id=product_id, quantity=quantity, subtotal=0.0)
-            db.add(cart_item)
-
-        # Compute correct subtotal for the item (apply discount safely)
-        discount = getattr(product, "discount_percentage", 0) or 0
-        item_price = float(product.price)
-        calc_subtotal = round(cart_item.quantity * item_price * (1 - (discount / 100)), 2)
-        cart_item.subtotal = calc_subtotal
-
-        # Recalculate cart total (sum of cart_items subtotals)
-        db.flush()  # push cart_item to DB session so query sees it
-        items = db.query(CartItem).filter(CartItem.cart_id == cart.id).all()
-        total = sum(float(it.subtotal or 0) for it in items)
-        cart.total_amount = round(total, 2)
+            db.flush()
+            cart_id = cart.id
 
+        # Insert the line, or add to it if the product is already in the cart
+        subtotal = CartService._line_subtotal(product, quantity)
+        stmt = CartService._insert(db)(CartItem).values(
+            cart_id=cart_id, product_id=product_id, quantity=quantity, subtotal=subtotal
+        )
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[CartItem.cart_id, CartItem.product_id],
+            set_={
+                "quantity": CartItem.quantity + stmt.excluded.quantity,
+                "subtotal": func.round(cast(CartItem.subtotal + stmt.excluded.subtotal, Numeric), 2),
+            },
+        ))
+        CartService._add_to_total(db, cart_id, subtotal)
         db.commit()
-        db.refresh(cart)
 
         # Load items + product details for response
-        cart = db.query(Cart).options(joinedload(Cart.cart_items).joinedload(CartItem.product)).filter(Cart.id == cart.id).first()
-
+        cart = CartService._load_cart(db, cart_id)
         return ResponseHandler.create_success("item added to cart", cart.id, cart)
-    
+
     @staticmethod
     def update_cart_item(db: Session, user_id: int, item_id: int, quantity: int):
         """
@@ -184,76 +233,46 @@ class CartService:
         """
         if quantity < 1:
             raise ValueError("Quantity must be at least 1")
-        
-        # Find the cart item
-        cart_item = db.query(CartItem).join(Cart).filter(
-            CartItem.id == item_id,
-            Cart.user_id == user_id
-        ).first()
-        
-        if not cart_item:
-            from fastapi import HTTPException, status
+
+        # The item (locked until commit), its current subtotal and its product's price
+        item = (
+            db.query(CartItem.cart_id, CartItem.subtotal, Product.price, Product.discount_percentage)
+            .join(Cart, Cart.id == CartItem.cart_id)
+            .join(Product, Product.id == CartItem.product_id)
+            .filter(CartItem.id == item_id, Cart.user_id == user_id)
+            .with_for_update(of=CartItem)
+            .first()
+        )
+        if not item:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cart item not found")
-        
-        # Update quantity
-        cart_item.quantity = quantity
-        
-        # Recalculate subtotal
-        product = db.query(Product).filter(Product.id == cart_item.product_id).first()
-        if product:
-            discount = getattr(product, "discount_percentage", 0) or 0
-            item_price = float(product.price)
-            cart_item.subtotal = round(quantity * item_price * (1 - (discount / 100)), 2)
-        
-        # Recalculate cart total
-        cart = db.query(Cart).filter(Cart.id == cart_item.cart_id).first()
-        items = db.query(CartItem).filter(CartItem.cart_id == cart.id).all()
-        total = sum(float(it.subtotal or 0) for it in items)
-        cart.total_amount = round(total, 2)
-        
+
+        subtotal = CartService._line_subtotal(item, quantity)
+        db.execute(update(CartItem).where(CartItem.id == item_id).values(quantity=quantity, subtotal=subtotal))
+        CartService._add_to_total(db, item.cart_id, subtotal - item.subtotal)
         db.commit()
-        db.refresh(cart)
-        
+
         # Load cart with items for response
-        cart = db.query(Cart).options(
-            joinedload(Cart.cart_items).joinedload(CartItem.product)
-        ).filter(Cart.id == cart.id).first()
-        
+        cart = CartService._load_cart(db, item.cart_id)
         return ResponseHandler.update_success("cart item", item_id, cart)
-    
+
     @staticmethod
     def remove_cart_item(db: Session, user_id: int, item_id: int):
         """
         Remove a cart item.
         """
-        # Find the cart item
-        cart_item = db.query(CartItem).join(Cart).filter(
-            CartItem.id == item_id,
-            Cart.user_id == user_id
+        removed = db.execute(
+            delete(CartItem)
+            .where(CartItem.id == item_id,
+                   CartItem.cart_id.in_(select(Cart.id).where(Cart.user_id == user_id)))
+            .returning(CartItem.cart_id, CartItem.subtotal)
+            .execution_options(synchronize_session=False)
         ).first()
-        
-        if not cart_item:
-            from fastapi import HTTPException, status
+        if not removed:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cart item not found")
-        
-        cart_id = cart_item.cart_id
-        
-        # Delete the item
-        db.delete(cart_item)
-        db.flush()
-        
-        # Recalculate cart total
-        cart = db.query(Cart).filter(Cart.id == cart_id).first()
-        items = db.query(CartItem).filter(CartItem.cart_id == cart.id).all()
-        total = sum(float(it.subtotal or 0) for it in items)
-        cart.total_amount = round(total, 2)
-        
+
+        CartService._add_to_total(db, removed.cart_id, -removed.subtotal)
         db.commit()
-        db.refresh(cart)
-        
+
         # Load cart with items for response
-        cart = db.query(Cart).options(
-            joinedload(Cart.cart_items).joinedload(CartItem.product)
-        ).filter(Cart.id == cart.id).first()
-        
-        return ResponseHandler.delete_success("cart item", item_id, cart)
\ No newline at end of file
+        cart = CartService._load_cart(db, removed.cart_id)
+        return ResponseHandler.delete_success("cart item", item_id, cart)
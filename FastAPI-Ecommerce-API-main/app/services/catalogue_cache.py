@@ -0,0 +1,60 @@
+from typing import Any, Callable, Hashable, Type
+
+from pydantic import BaseModel
+
+from app.core.cache import TieredCache, get_shared_backend
+from app.core.config import settings
+from app.services.search import ProductSearch
+from app.utils.conditional import CachedBody, etag_for
+
+
+class CatalogueCache:
+    """
+    Read-through cache of serialized catalogue responses and their ETags.
+    Keys carry a generation number; any catalogue write bumps it, which retires
+    every cached page at once. With a shared backend the generation lives there,
+    so a write on one worker is seen by all of them on their next read.
+    """
+
+    GENERATION_KEY = "catalogue:generation"
+    _cache = TieredCache(
+        "catalogue",
+        maxsize=settings.catalogue_cache_size,
+        ttl=settings.catalogue_cache_ttl,
+        shared=get_shared_backend(),
+    )
+    _generation = 0
+
+    @classmethod
+    def generation(cls) -> int:
+        if cls._cache.shared is None:
+            return cls._generation
+        return int(cls._cache.shared.get(cls.GENERATION_KEY) or 0)
+
+    @classmethod
+    def get_or_load(cls, key: Hashable, loader: Callable[[], Any], response_model: Type[BaseModel]) -> CachedBody:
+        """
+        Cached body (with its ETag) for `key`, else `loader()` serialized through
+        `response_model`. A hit touches neither the database nor pydantic.
+        """
+        cache_key = f"{cls.generation()}:{key}"
+        entry = cls._cache.get(cache_key) if settings.catalogue_cache_enabled else None
+        if entry is None:
+            body = response_model.model_validate(loader(), from_attributes=True).model_dump(mode="json")
+            entry = {"etag": etag_for(body), "body": body}
+            if settings.catalogue_cache_enabled:
+                cls._cache.set(cache_key, entry)
+        return CachedBody(entry["etag"], entry["body"])
+
+    @classmethod
+    def invalidate(cls) -> None:
+        cls._generation += 1
+        if cls._cache.shared is not None:
+            cls._cache.shared.incr(cls.GENERATION_KEY)
+        cls._cache.clear_local()
+
+
+def catalogue_changed() -> None:
+    """Call after committing any write that changes what the catalogue shows."""
+    ProductSearch.invalidate()
+    CatalogueCache.invalidate()
@@ -1,15 +1,23 @@
 from sqlalchemy.orm import Session
 from app.models.models import Category
-from app.schemas.categories import CategoryCreate, CategoryUpdate
+from app.schemas.categories import CategoryCreate, CategoryUpdate, CategoriesOut
 from app.utils.responses import ResponseHandler
+from app.utils.pagination import paginate
+from app.services.catalogue_cache import CatalogueCache, catalogue_changed
 
 
 class CategoryService:
     @staticmethod
-    def get_all_categories(db: Session, page: int, limit: int, search: str = ""):
-        categories = db.query(Category).order_by(Category.id.asc()).filter(
-            Category.name.contains(search)).limit(limit).offset((page - 1) * limit).all()
-        return {"message": f"Page {page} with {limit} categories", "data": categories}
+    def get_all_categories(db: Session, page: int, limit: int, search: str = "", cursor: str = None):
+        return CatalogueCache.get_or_load(
+            ("categories", page, limit, search or "", cursor),
+            lambda: CategoryService.list_categories(db, page, limit, search, cursor), CategoriesOut)
+
+    @staticmethod
+    def list_categories(db: Session, page: int, limit: int, search: str = "", cursor: str = None):
+        query = db.query(Category).filter(Category.name.contains(search))
+        categories, next_cursor = paginate(query, [Category.id], page, limit, cursor)
+        return {"message": f"Page {page} with {limit} categories", "data": categories, "next_cursor": next_cursor}
 
     @staticmethod
     def get_category(db: Session, category_id: int):
@@ -24,6 +32,7 @@ class CategoryService:
         db_category = Category(**category_dict)
         db.add(db_category)
         db.commit()
+        catalogue_changed()
         db.refresh(db_category)
         return ResponseHandler.create_success(db_category.name, db_category.id, db_category)
 
@@ -37,6 +46,8 @@ class CategoryService:
             setattr(db_category, key, value)
 
         db.commit()
+        # Product responses embed the category
+        catalogue_changed()
         db.refresh(db_category)
         return ResponseHandler.update_success(db_category.name, db_category.id, db_category)
 
@@ -47,4 +58,5 @@ class CategoryService:
             ResponseHandler.not_found_error("Category", category_id)
         db.delete(db_category)
         db.commit()
+        catalogue_changed()
         return ResponseHandler.delete_success(db_category.name, db_category.id, db_category)
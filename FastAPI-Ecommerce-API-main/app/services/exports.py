@@ -0,0 +1,137 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.models.models import Category, Order, OrderItem, Product
+
+
+ORDER_COLUMNS = ["order_id", "user_id", "status", "payment_method", "delivery_address", "total_amount", "created_at"]
+ORDER_ITEM_COLUMNS = ["product_id", "product_title", "quantity", "price_at_purchase", "subtotal"]
+PRODUCT_COLUMNS = [
+    "id", "title", "description", "price", "discount_percentage", "rating", "stock", "brand", "thumbnail",
+    "is_published", "category", "farmer_id", "approval_status", "created_at",
+]
+
+
+def _plain(value):
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+
+def _csv_chunks(rows: Iterable[dict], columns: List[str], batch_size: int) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([_plain(row[column]) for column in columns])
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _ndjson_chunks(documents: Iterable[dict], batch_size: int) -> Iterator[str]:
+    lines = []
+    for document in documents:
+        lines.append(json.dumps(document, default=_plain, ensure_ascii=False))
+        if len(lines) == batch_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def _group_orders(lines: Iterable[dict]) -> Iterator[dict]:
+    """Fold consecutive order lines (one row per item) into one document per order."""
+    order = None
+    for line in lines:
+        if order is None or order["id"] != line["order_id"]:
+            if order is not None:
+                yield order
+            order = {"id": line["order_id"], **{c: line[c] for c in ORDER_COLUMNS[1:]}, "items": []}
+        if line["product_id"] is not None:
+            order["items"].append({c: line[c] for c in ORDER_ITEM_COLUMNS})
+    if order is not None:
+        yield order
+
+
+class ExportService:
+    """
+    Streamed CSV / NDJSON exports. Rows are read with a server-side cursor
+    (yield_per), so memory stays flat however many rows match.
+    The generators open their own session: the response outlives the request's.
+    """
+
+    BATCH_SIZE = 1000
+
+    @staticmethod
+    def _order_lines(db: Session, date_from: Optional[datetime], date_to: Optional[datetime],
+                     status: Optional[str]):
+        stmt = (
+            select(
+                Order.id.label("order_id"), Order.user_id, Order.status, Order.payment_method,
+                Order.delivery_address, Order.total_amount, Order.created_at,
+                OrderItem.product_id, Product.title.label("product_title"), OrderItem.quantity,
+                OrderItem.price_at_purchase, OrderItem.subtotal,
+            )
+            .select_from(Order)
+            .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+            .outerjoin(Product, Product.id == OrderItem.product_id)
+        )
+        if date_from:
+            stmt = stmt.where(Order.created_at >= date_from)
+        if date_to:
+            stmt = stmt.where(Order.created_at < date_to)
+        if status:
+            stmt = stmt.where(Order.status == status)
+        stmt = stmt.order_by(Order.created_at, Order.id, OrderItem.id)
+        return db.execute(stmt.execution_options(yield_per=ExportService.BATCH_SIZE)).mappings()
+
+    @staticmethod
+    def _products(db: Session, date_from: Optional[datetime], date_to: Optional[datetime],
+                  status: Optional[str]):
+        stmt = (
+            select(
+                Product.id, Product.title, Product.description, Product.price, Product.discount_percentage,
+                Product.rating, Product.stock, Product.brand, Product.thumbnail, Product.is_published,
+                Category.name.label("category"), Product.farmer_id, Product.approval_status, Product.created_at,
+            )
+            .join(Category, Category.id == Product.category_id)
+        )
+        if date_from:
+            stmt = stmt.where(Product.created_at >= date_from)
+        if date_to:
+            stmt = stmt.where(Product.created_at < date_to)
+        if status:
+            stmt = stmt.where(Product.approval_status == status)
+        stmt = stmt.order_by(Product.id)
+        return db.execute(stmt.execution_options(yield_per=ExportService.BATCH_SIZE)).mappings()
+
+    @staticmethod
+    def stream_orders(file_format: str, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None,
+                      status: Optional[str] = None,
+                      session_factory: Callable[[], Session] = SessionLocal) -> Iterator[str]:
+        """CSV: one row per order item. NDJSON: one order per line with its items nested."""
+        with session_factory() as db:
+            lines = ExportService._order_lines(db, date_from, date_to, status)
+            if file_format == "csv":
+                yield from _csv_chunks(lines, ORDER_COLUMNS + ORDER_ITEM_COLUMNS, ExportService.BATCH_SIZE)
+            else:
+                yield from _ndjson_chunks(_group_orders(lines), ExportService.BATCH_SIZE)
+
+    @staticmethod
+    def stream_products(file_format: str, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None,
+                        status: Optional[str] = None,
+                        session_factory: Callable[[], Session] = SessionLocal) -> Iterator[str]:
+        with session_factory() as db:
+            products = ExportService._products(db, date_from, date_to, status)
+            if file_format == "csv":
+                yield from _csv_chunks(products, PRODUCT_COLUMNS, ExportService.BATCH_SIZE)
+            else:
+                yield from _ndjson_chunks((dict(product) for product in products), ExportService.BATCH_SIZE)
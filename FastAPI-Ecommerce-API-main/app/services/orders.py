@@ -1,23 +1,170 @@
-from sqlalchemy.orm import Session, joinedload
-from app.models.models import Order, OrderItem, Cart, CartItem, Product
+from typing import Dict, List
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.orm import Session, joinedload, selectinload
+from app.models.models import Order, OrderItem, Cart, CartItem, Product, User
 from app.schemas.orders import OrderCreate, OrderUpdate
 from app.utils.responses import ResponseHandler
+from app.utils.pagination import paginate
+from app.utils.conditional import etag_for
+from app.services.catalogue_cache import CatalogueCache
 from fastapi import HTTPException, status
 
 
 class OrderService:
-    
+
+    # Columns behind the summary view (?view=summary)
+    SUMMARY_COLUMNS = (
+        Order.id, Order.user_id, Order.total_amount, Order.payment_method,
+        Order.delivery_address, Order.status, Order.created_at,
+    )
+
+    @staticmethod
+    def _with_item_summaries(db: Session, orders, order_ids) -> List[dict]:
+        """
+        Summary-column order rows as dicts with their item lines attached,
+        each carrying only the product's title and thumbnail.
+        One query for every line; `order_ids` is a list or a subquery.
+        """
+        documents = {order.id: {**order._mapping, "order_items": []} for order in orders}
+        if not documents:
+            return []
+        lines = (
+            db.query(
+                OrderItem.order_id, OrderItem.id, OrderItem.product_id, OrderItem.quantity,
+                OrderItem.price_at_purchase, OrderItem.subtotal, Product.title, Product.thumbnail,
+            )
+            .outerjoin(Product, Product.id == OrderItem.product_id)
+            .filter(OrderItem.order_id.in_(order_ids))
+            .order_by(OrderItem.order_id, OrderItem.id)
+        )
+        for line in lines:
+            document = documents.get(line.order_id)
+            if document is None:
+                continue
+            document["order_items"].append({
+                "id": line.id,
+                "product_id": line.product_id,
+                "quantity": line.quantity,
+                "price_at_purchase": line.price_at_purchase,
+                "subtotal": line.subtotal,
+                "product": None if line.title is None else
+                {"id": line.product_id, "title": line.title, "thumbnail": line.thumbnail},
+            })
+        return list(documents.values())
+
+    @staticmethod
+    def _quantity_case(quantities: Dict[int, int]):
+        """CASE products.id WHEN <id> THEN <quantity> ... END, for batched stock updates."""
+        return case(quantities, value=Product.id, else_=0)
+
+    @staticmethod
+    def _reserve_stock(db: Session, quantities: Dict[int, int]):
+        """
+        Take `quantities` ({product_id: quantity}) off product stock, all or nothing.
+        Raises 409 with one entry per short line; the caller's transaction is rolled back.
+        """
+        product_ids = sorted(quantities)
+
+        # Lock rows in id order so concurrent checkouts of overlapping carts can't deadlock
+        products = (
+            db.query(Product.id, Product.title, Product.price, Product.stock)
+            .filter(Product.id.in_(product_ids))
+            .order_by(Product.id)
+            .with_for_update()
+            .all()
+        )
+        by_id = {product.id: product for product in products}
+
+        def shortages(stock_by_id):
+            return [
+                {
+                    "product_id": product_id,
+                    "title": by_id[product_id].title if product_id in by_id else None,
+                    "requested": quantity,
+                    "available": stock_by_id.get(product_id, 0),
+                }
+                for product_id, quantity in quantities.items()
+                if stock_by_id.get(product_id, 0) < quantity
+            ]
+
+        def reject(lines):
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"message": f"Insufficient stock for {len(lines)} item(s)", "lines": lines}
+            )
+
+        short = shortages({product.id: product.stock for product in products})
+        if short:
+            reject(short)
+
+        # One conditional UPDATE for every line. The stock guard also covers
+        # databases without row locks (SQLite), where the check above can go stale.
+        requested = OrderService._quantity_case(quantities)
+        reserved = db.execute(
+            update(Product)
+            .where(Product.id.in_(product_ids), Product.stock >= requested)
+            .values(stock=Product.stock - requested)
+            .returning(Product.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+
+        if len(reserved) != len(product_ids):
+            current = dict(db.query(Product.id, Product.stock).filter(Product.id.in_(product_ids)).all())
+            for product_id in reserved:
+                current[product_id] += quantities[product_id]
+            reject(shortages(current))
+
+        return by_id
+
+    @staticmethod
+    def _order_quantities(db: Session, order_id: int) -> Dict[int, int]:
+        return dict(
+            db.query(OrderItem.product_id, func.sum(OrderItem.quantity))
+            .filter(OrderItem.order_id == order_id)
+            .group_by(OrderItem.product_id)
+            .all()
+        )
+
+    @staticmethod
+    def _reserve_order_stock(db: Session, order: Order):
+        """Take a (locked) order's quantities off stock again, e.g. when it is un-cancelled; 409 if short."""
+        quantities = OrderService._order_quantities(db, order.id)
+        if quantities:
+            OrderService._reserve_stock(db, quantities)
+        order.stock_reserved = True
+
+    @staticmethod
+    def _release_stock(db: Session, order: Order):
+        """Put a (locked) order's quantities back on product stock, if it holds any."""
+        if not order.stock_reserved:
+            return
+        quantities = OrderService._order_quantities(db, order.id)
+        if quantities:
+            db.execute(
+                update(Product)
+                .where(Product.id.in_(quantities))
+                .values(stock=Product.stock + OrderService._quantity_case(quantities))
+                .execution_options(synchronize_session=False)
+            )
+        order.stock_reserved = False
+
     @staticmethod
     def create_order_from_cart(db: Session, user_id: int, order_data: OrderCreate):
         """
-        Create an order from the user's current cart.
+        Create an order from the user's current cart, reserving stock in the same transaction.
         """
-        # Get user's active cart with items
-        cart = db.query(Cart).options(
-            joinedload(Cart.cart_items).joinedload(CartItem.product)
-        ).filter(Cart.user_id == user_id).order_by(Cart.created_at.desc()).first()
-        
-        if not cart or not cart.cart_items:
+        # Get user's active cart (locked, so the same cart can't be checked out twice at once)
+        cart = (
+            db.query(Cart)
+            .filter(Cart.user_id == user_id)
+            .order_by(Cart.created_at.desc())
+            .with_for_update()
+            .first()
+        )
+        cart_items = db.query(CartItem).filter(CartItem.cart_id == cart.id).all() if cart else []
+
+        if not cart_items:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cart is empty. Cannot create order."
@@ -31,54 +178,84 @@ class OrderService:
                 detail=f"Minimum order amount is ₹{MIN_ORDER_AMOUNT}. Current total: ₹{cart.total_amount}"
             )
 
+        quantities = {}
+        for cart_item in cart_items:
+            quantities[cart_item.product_id] = quantities.get(cart_item.product_id, 0) + cart_item.quantity
+        products = OrderService._reserve_stock(db, quantities)
+
         # Create order
         order = Order(
             user_id=user_id,
             total_amount=cart.total_amount,
             payment_method=order_data.payment_method,
             delivery_address=order_data.delivery_address,
-            status="Pending"
+            status="Pending",
+            stock_reserved=True,
         )
         db.add(order)
         db.flush()  # Get order.id
-        
+
         # Create order items from cart items
-        for cart_item in cart.cart_items:
-            product = cart_item.product
-            order_item = OrderItem(
-                order_id=order.id,
-                product_id=cart_item.product_id,
-                quantity=cart_item.quantity,
-                price_at_purchase=float(product.price),
-                subtotal=cart_item.subtotal
-            )
-            db.add(order_item)
-        
+        db.execute(insert(OrderItem), [
+            {
+                "order_id": order.id,
+                "product_id": cart_item.product_id,
+                "quantity": cart_item.quantity,
+                "price_at_purchase": float(products[cart_item.product_id].price),
+                "subtotal": cart_item.subtotal,
+            }
+            for cart_item in cart_items
+        ])
+
         # Clear cart items after order creation
-        db.query(CartItem).filter(CartItem.cart_id == cart.id).delete()
+        db.query(CartItem).filter(CartItem.cart_id == cart.id).delete(synchronize_session=False)
         cart.total_amount = 0.0
-        
+
         db.commit()
-        db.refresh(order)
-        
+
         # Load order with items for response
         order = db.query(Order).options(
             joinedload(Order.order_items).joinedload(OrderItem.product)
         ).filter(Order.id == order.id).first()
-        
+
         return ResponseHandler.create_success("Order", order.id, order)
-    
+
     @staticmethod
-    def get_my_orders(db: Session, user_id: int):
+    def get_my_orders(db: Session, user_id: int, view: str = "full"):
         """
         Get all orders for the logged-in user.
+        view="summary" returns order columns and item lines with product title/thumbnail only.
         """
+        if view == "summary":
+            orders = (
+                db.query(*OrderService.SUMMARY_COLUMNS)
+                .filter(Order.user_id == user_id)
+                .order_by(Order.created_at.desc())
+                .all()
+            )
+            owned = select(Order.id).where(Order.user_id == user_id)
+            return ResponseHandler.success(
+                f"Found {len(orders)} orders", OrderService._with_item_summaries(db, orders, owned))
+
         orders = db.query(Order).options(
             joinedload(Order.order_items).joinedload(OrderItem.product)
         ).filter(Order.user_id == user_id).order_by(Order.created_at.desc()).all()
         
         return ResponseHandler.success(f"Found {len(orders)} orders", orders)
     
+    @staticmethod
+    def get_my_orders_etag(db: Session, user_id: int, view: str = "full") -> str:
+        """
+        ETag for get_my_orders from one aggregate query, without loading the orders.
+        The catalogue generation covers the product details embedded in each item.
+        """
+        count, last_updated = (
+            db.query(func.count(Order.id), func.max(Order.updated_at))
+            .filter(Order.user_id == user_id)
+            .one()
+        )
+        return etag_for("orders", view, user_id, count, last_updated, CatalogueCache.generation())
+
     @staticmethod
     def get_order_by_id(db: Session, user_id: int, order_id: int):
         """
@@ -94,26 +271,53 @@ class OrderService:
         return ResponseHandler.get_single_success("Order", order_id, order)
     
     @staticmethod
-    def get_all_orders(db: Session, page: int = 1, limit: int = 10):
+    def get_all_orders(db: Session, page: int = 1, limit: int = 10, cursor: str = None, view: str = "full",
+                       include_user: bool = False):
         """
-        Admin endpoint: Get all orders with pagination.
+        Admin endpoint: Get all orders with pagination (newest first).
+        include_user embeds each owner's name and phone with one extra query per page.
         """
-        orders = db.query(Order).options(
-            joinedload(Order.order_items).joinedload(OrderItem.product)
-        ).order_by(Order.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
-        
-        return ResponseHandler.success(f"Page {page} with {limit} orders", orders)
+        if view == "summary":
+            query = db.query(*OrderService.SUMMARY_COLUMNS)
+        else:
+            # Category too: ProductBaseOrder validates it, and lazy loads would cost one query per category
+            query = db.query(Order).options(
+                joinedload(Order.order_items).joinedload(OrderItem.product).joinedload(Product.category)
+            )
+            if include_user:
+                query = query.options(selectinload(Order.user).load_only(User.id, User.full_name, User.phone))
+        orders, next_cursor = paginate(query, [Order.created_at, Order.id], page, limit, cursor, descending=True)
+        if view == "summary":
+            orders = OrderService._with_item_summaries(db, orders, [order.id for order in orders])
+            if include_user and orders:
+                users = {
+                    user.id: dict(user._mapping)
+                    for user in db.query(User.id, User.full_name, User.phone)
+                    .filter(User.id.in_({order["user_id"] for order in orders}))
+                }
+                for order in orders:
+                    order["user"] = users.get(order["user_id"])
+
+        response = ResponseHandler.success(f"Page {page} with {limit} orders", orders)
+        response["next_cursor"] = next_cursor
+        return response
     
     @staticmethod
     def update_order_status(db: Session, order_id: int, update_data: OrderUpdate):
         """
-        Admin endpoint: Update order status.
+        Admin endpoint: Update order status. Cancelling releases the order's
+        stock; leaving Cancelled takes it again, or fails with 409 if it's gone.
         """
-        order = db.query(Order).filter(Order.id == order_id).first()
+        # Locked, so a concurrent cancel can't release the same stock twice
+        order = db.query(Order).filter(Order.id == order_id).with_for_update().first()
         
         if not order:
             ResponseHandler.not_found_error("Order", order_id)
         
+        if update_data.status == "Cancelled" and order.status != "Cancelled":
+            OrderService._release_stock(db, order)
+        elif update_data.status != "Cancelled" and order.status == "Cancelled":
+            OrderService._reserve_order_stock(db, order)
         order.status = update_data.status
         db.commit()
         db.refresh(order)
@@ -130,10 +334,11 @@ class OrderService:
         """
         User can cancel their own order if status is Pending.
         """
+        # Locked, so a concurrent admin cancel can't release the same stock twice
         order = db.query(Order).filter(
             Order.id == order_id,
             Order.user_id == user_id
-        ).first()
+        ).with_for_update().first()
         
         if not order:
             ResponseHandler.not_found_error("Order", order_id)
@@ -145,6 +350,7 @@ class OrderService:
             )
         
         order.status = "Cancelled"
+        OrderService._release_stock(db, order)
         db.commit()
         db.refresh(order)
         
@@ -158,14 +364,16 @@ class OrderService:
     @staticmethod
     def delete_order(db: Session, order_id: int):
         """
-        Admin endpoint: Delete an order completely.
+        Admin endpoint: Delete an order completely, putting back any stock it holds.
         """
-        order = db.query(Order).filter(Order.id == order_id).first()
+        # Locked, so a concurrent cancel can't release the same stock twice
+        order = db.query(Order).filter(Order.id == order_id).with_for_update().first()
         
         if not order:
             ResponseHandler.not_found_error("Order", order_id)
         
-        # Delete order (cascade will delete order_items)
+        OrderService._release_stock(db, order)
+        # Delete order (cascade will delete order_items), in the same transaction
         db.delete(order)
         db.commit()
         
@@ -0,0 +1,226 @@
+import codecs
+import csv
+import io
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.models.models import Category, Product
+from app.schemas.products import ProductCreateSimple
+from app.services.catalogue_cache import catalogue_changed
+
+
+# Columns written by an import, in COPY order
+IMPORT_COLUMNS = [
+    "title", "description", "price", "discount_percentage", "rating", "stock", "brand",
+    "thumbnail", "images", "is_published", "category_id", "farmer_id", "approval_status",
+]
+
+
+def _copy_value(value) -> str:
+    """One field in COPY text format."""
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, list):
+        value = "{" + ",".join('"' + v.replace("\\", "\\\\").replace('"', '\\"') + '"' for v in value) + "}"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _row_error(row: int, title: Optional[str], error) -> dict:
+    if isinstance(error, ValidationError):
+        error = "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in error.errors())
+    return {"row": row, "title": title, "error": str(error)}
+
+
+class ProductImportService:
+    """
+    Bulk product import. Per chunk of rows: one category lookup (plus one insert
+    for new categories), one duplicate-title lookup and one batched insert,
+    which is COPY FROM STDIN on psycopg2.
+    """
+
+    CHUNK_SIZE = 1000
+
+    @staticmethod
+    def resolve_categories(db: Session, names: Iterable[str], known: Dict[str, int]) -> None:
+        """Fill `known` (name -> id) for `names`, creating missing categories."""
+        missing = {name for name in names if name not in known}
+        if not missing:
+            return
+        for category_id, name in db.execute(select(Category.id, Category.name).where(Category.name.in_(missing))):
+            known[name] = category_id
+            missing.discard(name)
+        if missing:
+            created = db.execute(
+                insert(Category).returning(Category.id, Category.name),
+                [{"name": name} for name in sorted(missing)],
+            )
+            for category_id, name in created:
+                known[name] = category_id
+
+    @staticmethod
+    def existing_titles(db: Session, titles: Iterable[str]) -> Set[str]:
+        titles = set(titles)
+        if not titles:
+            return set()
+        return set(db.execute(select(Product.title).where(Product.title.in_(titles))).scalars())
+
+    @staticmethod
+    def product_row(data: ProductCreateSimple, category_id: int, farmer_id: Optional[int]) -> dict:
+        return {
+            "title": data.title,
+            "description": data.description,
+            "price": int(data.price),
+            "discount_percentage": data.discount_percentage,
+            "rating": data.rating,
+            "stock": data.stock,
+            "brand": data.brand,
+            "thumbnail": data.image,
+            "images": [data.image],  # Use single image for both
+            "is_published": data.is_published,
+            "category_id": category_id,
+            "farmer_id": farmer_id,
+            "approval_status": "pending" if farmer_id else "approved",
+        }
+
+    @staticmethod
+    def insert_rows(db: Session, rows: List[dict]) -> None:
+        """Insert without returning ids: COPY on psycopg2, executemany elsewhere."""
+        if not rows:
+            return
+        bind = db.get_bind()
+        if bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2":
+            buffer = io.StringIO()
+            for row in rows:
+                buffer.write("\t".join(_copy_value(row[column]) for column in IMPORT_COLUMNS) + "\n")
+            buffer.seek(0)
+            cursor = db.connection().connection.cursor()
+            try:
+                cursor.copy_expert(f"COPY products ({', '.join(IMPORT_COLUMNS)}) FROM STDIN", buffer)
+            finally:
+                cursor.close()
+        else:
+            db.execute(insert(Product), rows)
+
+    @staticmethod
+    def parse_csv(stream) -> Iterator[Tuple[int, dict]]:
+        """(row number, fields) per CSV record; empty cells fall back to schema defaults."""
+        reader = csv.DictReader(codecs.getreader("utf-8-sig")(stream))
+        for number, record in enumerate(reader, start=1):
+            yield number, {key: value for key, value in record.items() if key and value not in ("", None)}
+
+    @staticmethod
+    def parse_ndjson(stream) -> Iterator[Tuple[int, dict]]:
+        """(row number, fields) per non-blank line; unparsable lines yield the error instead."""
+        number = 0
+        for line in codecs.getreader("utf-8-sig")(stream):
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                record = exc
+            if not isinstance(record, (dict, Exception)):
+                record = ValueError("expected a JSON object")
+            yield number, record
+
+    @staticmethod
+    def _import_chunk(db: Session, chunk: List[Tuple[int, ProductCreateSimple]], farmer_id: Optional[int],
+                      categories: Dict[str, int]) -> Tuple[int, List[dict]]:
+        """Insert a validated chunk and commit; on a database error, retry row by row."""
+        # COPY goes through the raw driver cursor, so its errors aren't wrapped in DBAPIError
+        db_errors = (DBAPIError, db.get_bind().dialect.loaded_dbapi.Error)
+        try:
+            ProductImportService.resolve_categories(db, {data.category for _, data in chunk}, categories)
+            ProductImportService.insert_rows(db, [
+                ProductImportService.product_row(data, categories[data.category], farmer_id) for _, data in chunk
+            ])
+            db.commit()
+            return len(chunk), []
+        except db_errors:
+            db.rollback()
+            categories.clear()
+
+        # Isolate the failing rows, each in its own savepoint
+        created, errors = 0, []
+        for number, data in chunk:
+            try:
+                with db.begin_nested():
+                    ProductImportService.resolve_categories(db, [data.category], categories)
+                    db.execute(insert(Product), [
+                        ProductImportService.product_row(data, categories[data.category], farmer_id)
+                    ])
+                created += 1
+            except db_errors as exc:
+                categories.clear()
+                errors.append(_row_error(number, data.title, getattr(exc, "orig", exc)))
+        db.commit()
+        return created, errors
+
+    @staticmethod
+    def import_records(db: Session, records: Iterable[Tuple[int, object]], farmer_id: Optional[int] = None,
+                       skip_duplicates: bool = False, chunk_size: int = CHUNK_SIZE) -> dict:
+        """
+        Validate and insert `records` chunk by chunk. Each chunk commits on its own;
+        bad rows are reported with their row number and never fail the rest.
+        """
+        categories: Dict[str, int] = {}
+        seen_titles: Set[str] = set()
+        created = skipped = 0
+        errors: List[dict] = []
+
+        def flush(pending):
+            nonlocal created, skipped
+            if skip_duplicates:
+                existing = ProductImportService.existing_titles(db, (data.title for _, data in pending))
+                kept = []
+                for number, data in pending:
+                    if data.title in existing or data.title in seen_titles:
+                        skipped += 1
+                    else:
+                        seen_titles.add(data.title)
+                        kept.append((number, data))
+                pending = kept
+            if pending:
+                chunk_created, chunk_errors = ProductImportService._import_chunk(db, pending, farmer_id, categories)
+                created += chunk_created
+                errors.extend(chunk_errors)
+
+        pending: List[Tuple[int, ProductCreateSimple]] = []
+        for number, record in records:
+            if isinstance(record, Exception):
+                errors.append(_row_error(number, None, record))
+                continue
+            try:
+                pending.append((number, ProductCreateSimple(**record)))
+            except (ValidationError, TypeError) as exc:
+                errors.append(_row_error(number, record.get("title"), exc))
+                continue
+            if len(pending) >= chunk_size:
+                flush(pending)
+                pending = []
+        flush(pending)
+
+        if created:
+            catalogue_changed()
+
+        message = f"Imported {created} products"
+        if skipped:
+            message += f" (skipped {skipped} duplicates)"
+        if errors:
+            message += f", {len(errors)} rows failed"
+        return {"message": message, "created": created, "skipped": skipped, "errors": errors}
+
+    @staticmethod
+    def import_file(db: Session, stream, file_format: str, farmer_id: Optional[int] = None,
+                    skip_duplicates: bool = False, chunk_size: int = CHUNK_SIZE) -> dict:
+        """Import a binary CSV or NDJSON stream, reading it incrementally."""
+        parse = ProductImportService.parse_csv if file_format == "csv" else ProductImportService.parse_ndjson
+        return ProductImportService.import_records(db, parse(stream), farmer_id, skip_duplicates, chunk_size)
@@ -1,26 +1,49 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, joinedload
 from app.models.models import Product, Category, User
-from app.schemas.products import ProductCreate, ProductUpdate
+from app.schemas.products import ProductCreate, ProductUpdate, ProductOut, ProductsOut
 from app.utils.responses import ResponseHandler
+from app.services.search import ProductSearch
+from app.services.catalogue_cache import CatalogueCache, catalogue_changed
+from app.services.product_import import ProductImportService
+from app.utils.pagination import paginate
 from datetime import datetime
 from fastapi import HTTPException, status
 
 
 class ProductService:
     @staticmethod
-    def get_all_products(db: Session, page: int, limit: int, search: str = "", include_pending: bool = False):
+    def get_all_products(db: Session, page: int, limit: int, search: str = "", cursor: str = None):
+        """Approved products (public listing and search), through the catalogue cache"""
+        key = ("products", page, limit, (search or "").strip().lower(), cursor)
+        return CatalogueCache.get_or_load(
+            key, lambda: ProductService.list_products(db, page, limit, search, cursor=cursor), ProductsOut)
+
+    @staticmethod
+    def list_products(db: Session, page: int, limit: int, search: str = "", include_pending: bool = False,
+                      cursor: str = None):
         """Get all products, filtering by approval status unless include_pending is True (admin only)"""
-        query = db.query(Product).order_by(Product.id.asc()).filter(Product.title.contains(search))
+        if search and search.strip():
+            # Relevance-ranked search over title, description, brand and category (page-based only)
+            products, total = ProductSearch.search(db, search, page, limit, include_pending)
+            return {"message": f"Found {total} products for '{search}'", "total": total, "data": products}
+
+        query = db.query(Product)
         
         # Only show approved products to regular users
         if not include_pending:
             query = query.filter(Product.approval_status == "approved")
         
-        products = query.limit(limit).offset((page - 1) * limit).all()
-        return {"message": f"Page {page} with {limit} products", "data": products}
+        products, next_cursor = paginate(query, [Product.id], page, limit, cursor)
+        return {"message": f"Page {page} with {limit} products", "data": products, "next_cursor": next_cursor}
 
     @staticmethod
     def get_product(db: Session, product_id: int):
+        return CatalogueCache.get_or_load(
+            ("product", product_id), lambda: ProductService._load_product(db, product_id), ProductOut)
+
+    @staticmethod
+    def _load_product(db: Session, product_id: int):
         product = db.query(Product).filter(Product.id == product_id).first()
         if not product:
             ResponseHandler.not_found_error("Product", product_id)
@@ -50,6 +73,7 @@ class ProductService:
         db_product = Product(**product_dict)
         db.add(db_product)
         db.commit()
+        catalogue_changed()
         db.refresh(db_product)
         return ResponseHandler.create_success(db_product.title, db_product.id, db_product)
 
@@ -63,6 +87,7 @@ class ProductService:
             setattr(db_product, key, value)
 
         db.commit()
+        catalogue_changed()
         db.refresh(db_product)
         return ResponseHandler.update_success(db_product.title, db_product.id, db_product)
 
@@ -73,74 +98,62 @@ class ProductService:
             ResponseHandler.not_found_error("Product", product_id)
         db.delete(db_product)
         db.commit()
+        catalogue_changed()
         return ResponseHandler.delete_success(db_product.title, db_product.id, db_product)
 
     @staticmethod
     def bulk_create_products(db: Session, products: list, farmer_id: int = None, skip_duplicates: bool = False):
         """
         Bulk create products with transaction safety.
+        Categories and duplicate titles are resolved with one query each; rows go in one batched insert.
         """
-        from app.schemas.products import ProductCreateSimple
-        
-        created_products = []
-        skipped_count = 0
-        
         try:
-            for product_data in products:
-                # Check for duplicates if skip_duplicates is enabled
-                if skip_duplicates:
-                    existing = db.query(Product).filter(Product.title == product_data.title).first()
-                    if existing:
+            skipped_count = 0
+            if skip_duplicates:
+                existing = ProductImportService.existing_titles(db, (p.title for p in products))
+                unique_products = []
+                for product_data in products:
+                    if product_data.title in existing:
                         skipped_count += 1
                         continue
-                
-                # Get or create category
-                category_name = product_data.category
-                category = db.query(Category).filter(Category.name == category_name).first()
-                if not category:
-                    category = Category(name=category_name)
-                    db.add(category)
-                    db.flush()  # Get category.id
-                
-                # Create product
-                product_dict = {
-                    "title": product_data.title,
-                    "description": product_data.description,
-                    "price": int(product_data.price),
-                    "discount_percentage": product_data.discount_percentage,
-                    "rating": product_data.rating,
-                    "stock": product_data.stock,
-                    "brand": product_data.brand,
-                    "thumbnail": product_data.image,
-                    "images": [product_data.image],  # Use single image for both
-                    "is_published": product_data.is_published,
-                    "category_id": category.id,
-                    "farmer_id": farmer_id,
-                    "approval_status": "pending" if farmer_id else "approved"
-                }
-                
-                db_product = Product(**product_dict)
-                db.add(db_product)
-                db.flush()
-                db.refresh(db_product)
-                created_products.append(db_product)
-            
+                    existing.add(product_data.title)
+                    unique_products.append(product_data)
+                products = unique_products
+
+            # Get or create categories
+            categories = {}
+            ProductImportService.resolve_categories(db, {p.category for p in products}, categories)
+
+            created_ids = []
+            if products:
+                created_ids = db.execute(
+                    insert(Product).returning(Product.id),
+                    [ProductImportService.product_row(p, categories[p.category], farmer_id) for p in products],
+                ).scalars().all()
+
             db.commit()
-            
+            catalogue_changed()
+
+            created_products = (
+                db.query(Product).options(joinedload(Product.category))
+                .filter(Product.id.in_(created_ids)).order_by(Product.id).all()
+                if created_ids else []
+            )
+
             message = f"Created {len(created_products)} products"
             if skipped_count > 0:
                 message += f" (skipped {skipped_count} duplicates)"
-            
+
             return {
                 "message": message,
                 "created": len(created_products),
                 "data": created_products
             }
-        
+
         except Exception as e:
             db.rollback()
             raise e
-    
+
     @staticmethod
     def get_pending_products(db: Session, page: int = 1, limit: int = 50):
         """Get all pending products for admin review"""
@@ -175,6 +188,7 @@ class ProductService:
         product.approval_date = datetime.now()
         
         db.commit()
+        catalogue_changed()
         db.refresh(product)
         
         return {
@@ -194,6 +208,7 @@ class ProductService:
         product.approval_date = datetime.now()
         
         db.commit()
+        catalogue_changed()
         db.refresh(product)
         
         return {
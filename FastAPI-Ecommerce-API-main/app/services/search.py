@@ -0,0 +1,257 @@
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func, literal_column, or_
+from sqlalchemy.orm import Session, joinedload
+
+from app.models.models import Category, Product, search_document
+
+
+# Hindi / transliterated produce names -> English catalogue terms.
+# Searched alongside the original word, so "nimbu" still finds "Nimbu".
+SYNONYMS: Dict[str, List[str]] = {
+    "tamatar": ["tomato"], "tamatr": ["tomato"], "टमाटर": ["tomato"],
+    "pyaz": ["onion"], "pyaaz": ["onion"], "kanda": ["onion"], "प्याज": ["onion"],
+    "aloo": ["potato"], "alu": ["potato"], "batata": ["potato"], "आलू": ["potato"],
+    "gajar": ["carrot"], "गाजर": ["carrot"],
+    "bhindi": ["okra", "ladyfinger"], "भिंडी": ["okra"],
+    "baingan": ["brinjal"], "baigan": ["brinjal"], "बैंगन": ["brinjal"],
+    "mirch": ["chilli"], "mirchi": ["chilli"], "मिर्च": ["chilli"],
+    "shimla": ["capsicum"],
+    "nimbu": ["lemon"], "neembu": ["lemon"], "नींबू": ["lemon"],
+    "adrak": ["ginger"], "अदरक": ["ginger"],
+    "lahsun": ["garlic"], "lehsun": ["garlic"], "लहसुन": ["garlic"],
+    "dhaniya": ["coriander"], "धनिया": ["coriander"],
+    "palak": ["spinach"], "पालक": ["spinach"],
+    "gobi": ["cauliflower", "cabbage"], "gobhi": ["cauliflower", "cabbage"], "गोभी": ["cauliflower"],
+    "matar": ["peas"], "मटर": ["peas"],
+    "kela": ["banana"], "केला": ["banana"],
+    "aam": ["mango"], "आम": ["mango"],
+    "seb": ["apple"], "सेब": ["apple"],
+    "amrood": ["guava"], "amrud": ["guava"], "अमरूद": ["guava"],
+    "nariyal": ["coconut"], "नारियल": ["coconut"],
+    "chawal": ["rice"], "चावल": ["rice"],
+    "gehun": ["wheat"], "gehu": ["wheat"], "गेहूं": ["wheat"],
+    "makka": ["maize", "corn"], "makki": ["maize", "corn"], "मक्का": ["maize"],
+    "bajra": ["millet"], "jowar": ["sorghum", "millet"], "nachni": ["ragi"],
+    "moong": ["gram"], "dal": ["pulses", "gram"], "दाल": ["pulses"],
+    "haldi": ["turmeric"], "हल्दी": ["turmeric"],
+    "doodh": ["milk"], "दूध": ["milk"],
+}
+
+# \w misses Devanagari vowel signs (category Mc/Mn), so add the block explicitly,
+# minus the danda punctuation marks
+_TOKEN_RE = re.compile(r"[\w\u0900-\u0963\u0966-\u097F]+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """NFKC-normalized, lower-cased word tokens."""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return _TOKEN_RE.findall(text)
+
+
+def expand_query(search: str) -> List[List[str]]:
+    """One group of alternatives per query word: the word plus its synonyms."""
+    groups = []
+    for token in tokenize(search):
+        alternatives = [token] + [s for s in SYNONYMS.get(token, []) if s != token]
+        groups.append(alternatives)
+    return groups
+
+
+def trigrams(word: str) -> Set[str]:
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PostgresProductSearch:
+    """
+    tsvector/GIN prefix match plus pg_trgm fuzzy title match, ranked.
+    Fuzzy matching uses `%>` (indexable via gin_trgm_ops), so the cut-off is
+    pg_trgm.word_similarity_threshold (default 0.6).
+    """
+
+    @staticmethod
+    def _tsquery(groups: List[List[str]]) -> str:
+        # Tokens are word characters only, so they are safe inside to_tsquery syntax
+        return " & ".join(
+            "(" + " | ".join(f"{alt}:*" for alt in alternatives) + ")"
+            for alternatives in groups
+        )
+
+    @staticmethod
+    def search(db: Session, search: str, page: int, limit: int,
+               include_pending: bool = False) -> Tuple[List[Product], int]:
+        groups = expand_query(search)
+        if not groups:
+            return [], 0
+
+        document = search_document(Product.title, Product.description, Product.brand)
+        tsquery = func.to_tsquery(literal_column("'simple'"), PostgresProductSearch._tsquery(groups))
+        phrase = " ".join(alternatives[0] for alternatives in groups)
+
+        rank = (
+            func.ts_rank(document, tsquery)
+            + func.word_similarity(phrase, Product.title)
+            + 0.5 * func.word_similarity(phrase, Category.name)
+        ).label("rank")
+
+        # One statement: matching ids for the page plus the total hit count
+        query = (
+            db.query(Product.id, rank, func.count().over().label("total"))
+            .join(Category, Product.category_id == Category.id)
+            .filter(or_(
+                document.op("@@")(tsquery),
+                Product.title.op("%>")(phrase),
+                Category.name.op("%>")(phrase),
+            ))
+        )
+        if not include_pending:
+            query = query.filter(Product.approval_status == "approved")
+
+        rows = query.order_by(rank.desc(), Product.id.asc()).limit(limit).offset((page - 1) * limit).all()
+        total = rows[0].total if rows else 0
+        return _load_in_order(db, [row.id for row in rows]), total
+
+
+class ProductSearchIndex:
+    """
+    Pure-Python inverted index with prefix and trigram-fuzzy matching.
+    Used where Postgres search isn't available (the SQLite stand-in).
+    """
+
+    FIELD_WEIGHTS = {"title": 1.0, "category": 0.6, "brand": 0.4, "description": 0.3}
+    FUZZY_THRESHOLD = 0.45
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self.trigram_index: Dict[str, Set[str]] = defaultdict(set)
+        self.approved: Set[int] = set()
+        self.size = 0
+
+    @classmethod
+    def build(cls, rows) -> "ProductSearchIndex":
+        """rows: (id, title, description, brand, category_name, approval_status)"""
+        index = cls()
+        for product_id, title, description, brand, category, approval_status in rows:
+            index.add(product_id, {"title": title, "description": description,
+                                   "brand": brand, "category": category})
+            if approval_status == "approved":
+                index.approved.add(product_id)
+        return index
+
+    def add(self, product_id: int, fields: Dict[str, Optional[str]]) -> None:
+        self.size += 1
+        for field, text in fields.items():
+            weight = self.FIELD_WEIGHTS[field]
+            for token in tokenize(text):
+                posting = self.postings[token]
+                if posting.get(product_id, 0) < weight:
+                    posting[product_id] = weight
+                    for gram in trigrams(token):
+                        self.trigram_index[gram].add(token)
+
+    def _candidate_tokens(self, word: str) -> Dict[str, float]:
+        """Vocabulary tokens matching `word` exactly, by prefix or fuzzily, with a score."""
+        matches = {}
+        if word in self.postings:
+            matches[word] = 1.0
+        word_grams = trigrams(word)
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in word_grams:
+            for token in self.trigram_index.get(gram, ()):
+                shared[token] += 1
+        for token, count in shared.items():
+            if token in matches:
+                continue
+            if token.startswith(word):
+                matches[token] = 0.8
+                continue
+            similarity = count / (len(word_grams) + len(trigrams(token)) - count)
+            if similarity >= self.FUZZY_THRESHOLD:
+                matches[token] = similarity * 0.7
+        return matches
+
+    def search(self, search: str, include_pending: bool = False) -> List[Tuple[int, float]]:
+        """All matching (product_id, score), best first. Every query word must match."""
+        scores: Optional[Dict[int, float]] = None
+        for alternatives in expand_query(search):
+            group_scores: Dict[int, float] = {}
+            for alt in alternatives:
+                for token, token_score in self._candidate_tokens(alt).items():
+                    for product_id, weight in self.postings[token].items():
+                        score = token_score * weight
+                        if score > group_scores.get(product_id, 0):
+                            group_scores[product_id] = score
+            if scores is None:
+                scores = group_scores
+            else:
+                scores = {pid: s + group_scores[pid] for pid, s in scores.items() if pid in group_scores}
+        if not scores:
+            return []
+        if not include_pending:
+            scores = {pid: s for pid, s in scores.items() if pid in self.approved}
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+class FallbackProductSearch:
+    """Serves ProductSearchIndex queries, rebuilding the index after writes or TTL."""
+
+    # Picks up writes from other processes; own writes call invalidate()
+    TTL = 300.0
+    _index: Optional[ProductSearchIndex] = None
+    _built_at = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def invalidate(cls) -> None:
+        cls._index = None
+
+    @classmethod
+    def _get_index(cls, db: Session) -> ProductSearchIndex:
+        with cls._lock:
+            if cls._index is None or time.monotonic() - cls._built_at > cls.TTL:
+                rows = (
+                    db.query(Product.id, Product.title, Product.description, Product.brand,
+                             Category.name, Product.approval_status)
+                    .join(Category, Product.category_id == Category.id)
+                    .all()
+                )
+                cls._index = ProductSearchIndex.build(rows)
+                cls._built_at = time.monotonic()
+            return cls._index
+
+    @classmethod
+    def search(cls, db: Session, search: str, page: int, limit: int,
+               include_pending: bool = False) -> Tuple[List[Product], int]:
+        hits = cls._get_index(db).search(search, include_pending)
+        page_ids = [product_id for product_id, _ in hits[(page - 1) * limit:page * limit]]
+        return _load_in_order(db, page_ids), len(hits)
+
+
+def _load_in_order(db: Session, ids: List[int]) -> List[Product]:
+    if not ids:
+        return []
+    products = db.query(Product).options(joinedload(Product.category)).filter(Product.id.in_(ids)).all()
+    by_id = {product.id: product for product in products}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+class ProductSearch:
+    """Relevance-ranked product search: Postgres engine, or the Python index elsewhere."""
+
+    @staticmethod
+    def search(db: Session, search: str, page: int, limit: int,
+               include_pending: bool = False) -> Tuple[List[Product], int]:
+        if db.get_bind().dialect.name == "postgresql":
+            return PostgresProductSearch.search(db, search, page, limit, include_pending)
+        return FallbackProductSearch.search(db, search, page, limit, include_pending)
+
+    @staticmethod
+    def invalidate() -> None:
+        """Call after product writes; Postgres indexes maintain themselves."""
+        FallbackProductSearch.invalidate()
@@ -0,0 +1,120 @@
+from datetime import datetime, time, timedelta, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TieredCache, get_shared_backend
+from app.core.config import settings
+from app.models.models import Category, Order, OrderItem, Product, User
+from app.schemas.stats import AdminStats
+from app.utils.responses import ResponseHandler
+
+
+class StatsService:
+    """
+    Admin dashboard figures, each one a SQL aggregate. Per-day, per-category,
+    product and farmer figures cover the last `days` days, so their cost follows
+    the window (orders(created_at) index) rather than the table size.
+    Results are cached for ADMIN_STATS_CACHE_TTL seconds.
+    """
+
+    # Orders in these states don't count towards revenue
+    EXCLUDED_STATUSES = ("Cancelled",)
+
+    _cache = TieredCache(
+        "admin_stats",
+        maxsize=64,
+        ttl=settings.admin_stats_cache_ttl,
+        shared=get_shared_backend(),
+    )
+
+    @staticmethod
+    def _window_start(days: int) -> datetime:
+        today = datetime.now(timezone.utc).date()
+        return datetime.combine(today - timedelta(days=days - 1), time.min, tzinfo=timezone.utc)
+
+    @staticmethod
+    def _compute(db: Session, days: int, top: int) -> AdminStats:
+        revenue = func.coalesce(func.sum(Order.total_amount), 0)
+        by_status = (
+            db.query(Order.status, func.count(Order.id), revenue)
+            .group_by(Order.status)
+            .order_by(Order.status)
+            .all()
+        )
+
+        farmers, active_products, pending_approvals = db.query(
+            select(func.count(User.id)).where(User.user_type == "farmer").scalar_subquery(),
+            select(func.count(Product.id))
+            .where(Product.is_published.is_(True), Product.approval_status == "approved").scalar_subquery(),
+            select(func.count(Product.id)).where(Product.approval_status == "pending").scalar_subquery(),
+        ).one()
+
+        since = StatsService._window_start(days)
+        in_window = (Order.created_at >= since, Order.status.notin_(StatsService.EXCLUDED_STATUSES))
+
+        day = func.date(Order.created_at)
+        by_day = (
+            db.query(day.label("day"), func.count(Order.id), revenue)
+            .filter(*in_window)
+            .group_by(day)
+            .order_by(day)
+            .all()
+        )
+
+        # Item-level figures come from one pass over the window's order lines,
+        # grouped by product; category and farmer totals are folded from that.
+        units = func.coalesce(func.sum(OrderItem.quantity), 0)
+        line_revenue = func.coalesce(func.sum(OrderItem.subtotal), 0)
+        per_product = (
+            db.query(Product.id, Product.title, Product.category_id, Product.farmer_id, units, line_revenue)
+            .select_from(OrderItem)
+            .join(Order, Order.id == OrderItem.order_id)
+            .join(Product, Product.id == OrderItem.product_id)
+            .filter(*in_window)
+            .group_by(Product.id, Product.title, Product.category_id, Product.farmer_id)
+            .all()
+        )
+
+        category_names = dict(db.query(Category.id, Category.name).all())
+        by_category, by_farmer = {}, {}
+        for _, _, category_id, farmer_id, sold, amount in per_product:
+            name = category_names.get(category_id, "Unknown")
+            by_category[name] = by_category.get(name, 0) + amount
+            if farmer_id is not None:
+                products, farmer_units, farmer_revenue = by_farmer.get(farmer_id, (0, 0, 0))
+                by_farmer[farmer_id] = (products + 1, farmer_units + sold, farmer_revenue + amount)
+
+        top_products = sorted(per_product, key=lambda p: (-p[5], p[0]))[:top]
+        top_farmers = sorted(by_farmer.items(), key=lambda f: (-f[1][2], f[0]))[:top]
+        farmer_names = dict(
+            db.query(User.id, User.full_name).filter(User.id.in_([i for i, _ in top_farmers])).all()
+        ) if top_farmers else {}
+
+        return AdminStats(
+            days=days,
+            total_orders=sum(count for _, count, _ in by_status),
+            total_revenue=round(sum(amount for status, _, amount in by_status
+                                    if status not in StatsService.EXCLUDED_STATUSES), 2),
+            farmers=farmers,
+            active_products=active_products,
+            pending_approvals=pending_approvals,
+            orders_by_status=[{"status": s, "orders": c, "revenue": r} for s, c, r in by_status],
+            revenue_by_day=[{"day": d, "orders": c, "revenue": r} for d, c, r in by_day],
+            revenue_by_category=[{"category": name, "revenue": round(r, 2)}
+                                 for name, r in sorted(by_category.items(), key=lambda c: -c[1])],
+            top_products=[{"product_id": i, "title": t, "units": u, "revenue": r}
+                          for i, t, _, _, u, r in top_products],
+            top_farmers=[{"farmer_id": i, "full_name": farmer_names.get(i, ""), "products": p, "units": u,
+                          "revenue": round(r, 2)} for i, (p, u, r) in top_farmers],
+        )
+
+    @staticmethod
+    def get_admin_stats(db: Session, days: int = 30, top: int = 5):
+        """Dashboard stats: order counts by status, revenue by day and category, top products and farmers."""
+        key = f"{days}:{top}"
+        data = StatsService._cache.get(key)
+        if data is None:
+            data = StatsService._compute(db, days, top).model_dump(mode="json")
+            StatsService._cache.set(key, data)
+        return ResponseHandler.success(f"Dashboard stats for the last {days} days", data)
@@ -1,16 +1,27 @@
-from sqlalchemy.orm import Session
+from typing import List
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session, load_only
 from app.models.models import User
 from app.schemas.users import UserCreate, UserUpdate
 from app.utils.responses import ResponseHandler
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, invalidate_principal
+from app.utils.pagination import paginate
 
 
 class UserService:
+    # Upper bound on ids per batch lookup (keeps the IN list and response bounded)
+    MAX_BATCH_IDS = 500
+
     @staticmethod
-    def get_all_users(db: Session, page: int, limit: int, search: str = "", role: str = "user"):
-        users = db.query(User).order_by(User.id.asc()).filter(
-            User.username.contains(search), User.role == role).limit(limit).offset((page - 1) * limit).all()
-        return {"message": f"Page {page} with {limit} users", "data": users}
+    def get_all_users(db: Session, page: int, limit: int, search: str = "", role: str = "user", cursor: str = None):
+        query = db.query(User).filter(User.username.contains(search))
+        # "admin" lists admins, "user" everyone else (buyers and farmers)
+        if role == "admin":
+            query = query.filter(User.user_type == "admin")
+        else:
+            query = query.filter(User.user_type != "admin")
+        users, next_cursor = paginate(query, [User.id], page, limit, cursor)
+        return {"message": f"Page {page} with {limit} users", "data": users, "next_cursor": next_cursor}
 
     @staticmethod
     def get_user(db: Session, user_id: int):
@@ -19,6 +30,28 @@ class UserService:
             ResponseHandler.not_found_error("User", user_id)
         return ResponseHandler.get_single_success(user.username, user_id, user)
 
+    @staticmethod
+    def get_users_by_ids(db: Session, user_ids: List[int]):
+        """Resolve many users in one IN query, in request order; unknown ids go to `missing`."""
+        ids = list(dict.fromkeys(user_ids))
+        if len(ids) > UserService.MAX_BATCH_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {UserService.MAX_BATCH_IDS} ids per request"
+            )
+        users = (
+            db.query(User)
+            .options(load_only(User.id, User.username, User.full_name, User.phone, User.user_type))
+            .filter(User.id.in_(ids))
+            .all()
+        )
+        by_id = {user.id: user for user in users}
+        return {
+            "message": f"Found {len(by_id)} of {len(ids)} users",
+            "data": [by_id[user_id] for user_id in ids if user_id in by_id],
+            "missing": [user_id for user_id in ids if user_id not in by_id],
+        }
+
     @staticmethod
     def create_user(db: Session, user: UserCreate):
         hashed_password = get_password_hash(user.password)
@@ -47,6 +80,7 @@ class UserService:
                 setattr(db_user, key, value)
 
         db.commit()
+        invalidate_principal(user_id)
         db.refresh(db_user)
         return ResponseHandler.update_success(db_user.username, db_user.id, db_user)
 
@@ -57,4 +91,5 @@ class UserService:
             ResponseHandler.not_found_error("User", user_id)
         db.delete(db_user)
         db.commit()
+        invalidate_principal(user_id)
         return ResponseHandler.delete_success(db_user.username, db_user.id, db_user)
@@ -0,0 +1,54 @@
+import hashlib
+import json
+from typing import Any, NamedTuple, Optional
+
+from fastapi import Request, Response, status
+
+from app.utils.serialization import FastJSONResponse
+
+
+# Cache-Control per route family
+CATALOGUE_CACHE_CONTROL = "public, max-age=30, stale-while-revalidate=60"
+CATEGORIES_CACHE_CONTROL = "public, max-age=300"
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+class CachedBody(NamedTuple):
+    """A JSON-ready response body and its strong ETag."""
+    etag: str
+    body: Any
+
+
+def etag_for(*parts: Any) -> str:
+    """Strong ETag over JSON-serializable parts (a body, or a version tuple)."""
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for this header)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def conditional_response(request: Request, cached: CachedBody, cache_control: str,
+                         status_code: int = status.HTTP_200_OK) -> Response:
+    """304 if the client already holds `cached`, else the body with its validators."""
+    if etag_matches(request, cached.etag):
+        return not_modified(cached.etag, cache_control)
+    return FastJSONResponse(cached.body, status_code=status_code,
+                            headers={"ETag": cached.etag, "Cache-Control": cache_control})
+
+
+def cached_body(body: Any, etag: Optional[str] = None) -> CachedBody:
+    return CachedBody(etag or etag_for(body), body)
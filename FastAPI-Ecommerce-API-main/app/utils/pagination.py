@@ -0,0 +1,76 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, tuple_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(row: Any, columns: Sequence) -> str:
+    """Opaque cursor holding the sort-key values of `row`."""
+    values = []
+    for column in columns:
+        value = getattr(row, column.key)
+        values.append(value.isoformat() if isinstance(value, datetime) else value)
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _cursor_value(column, value: Any) -> Any:
+    """`value` as `column`'s Python type; TypeError if it isn't one, so it never reaches the query."""
+    if isinstance(column.type, DateTime):
+        if not isinstance(value, str):
+            raise TypeError(f"{column.key}: expected a timestamp")
+        return datetime.fromisoformat(value)
+    expected = column.type.python_type
+    if expected is float and isinstance(value, int):
+        value = float(value)
+    # bool is an int subclass, but never a valid key value
+    if (isinstance(value, bool) and expected is not bool) or not isinstance(value, expected):
+        raise TypeError(f"{column.key}: expected {expected.__name__}")
+    return value
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> List[Any]:
+    """Sort-key values from `cursor`, each checked against its column's type; 400 if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor shape")
+        return [_cursor_value(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def paginate(
+        query: Query,
+        columns: Sequence,
+        page: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        descending: bool = False,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Order `query` by `columns` (a unique key, e.g. (created_at, id) or (id,))
+    and return one page plus the cursor for the next one.
+
+    With a cursor the page starts right after the cursor's row using a
+    row-value comparison on the key, so deep pages cost the same as page 1.
+    Without one it falls back to `page` via OFFSET.
+    """
+    if cursor:
+        key = tuple_(*columns)
+        values = tuple_(*decode_cursor(cursor, columns))
+        query = query.filter(key < values if descending else key > values)
+
+    query = query.order_by(*(column.desc() if descending else column.asc() for column in columns))
+    if not cursor:
+        query = query.offset((page - 1) * limit)
+
+    # One extra row tells us whether there is a next page
+    rows = query.limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1], columns) if len(rows) > limit else None
+    return rows[:limit], next_cursor
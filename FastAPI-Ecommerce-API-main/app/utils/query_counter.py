@@ -0,0 +1,87 @@
+import re
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+_CASTS = re.compile(r"::\w+(?:\[\])?")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%\(\w+\)s|\$\d+|:\w+|\?")
+_PLACEHOLDER_LISTS = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a statement so calls that differ only in values compare equal:
+    literals and bind parameters become ?, IN lists collapse to (?+).
+    """
+    normalized = _LITERALS.sub("?", _CASTS.sub("", statement))
+    normalized = _PLACEHOLDER_LISTS.sub("(?+)", normalized)
+    return _SPACES.sub(" ", normalized).strip()
+
+
+def repeated_statements(statements: List[str], threshold: int) -> List[Tuple[str, int]]:
+    """(fingerprint, count) for statements run more than `threshold` times, most frequent first."""
+    counts = Counter(fingerprint(statement) for statement in statements)
+    return [(shape, count) for shape, count in counts.most_common() if count > threshold]
+
+
+class QueryCount:
+    """SQL statements seen on an engine while a count_queries() block was open."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        return repeated_statements(self.statements, threshold)
+
+    def __repr__(self):
+        return f"QueryCount({self.count})"
+
+
+@contextmanager
+def count_queries(engine: Engine) -> Iterator[QueryCount]:
+    """
+    Record every statement `engine` executes inside the block.
+    An executemany (bulk insert) counts once, as it is one round-trip per batch.
+    For the async engine pass `async_engine.sync_engine`.
+    """
+    counter = QueryCount()
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+@contextmanager
+def assert_max_queries(engine: Engine, limit: int) -> Iterator[QueryCount]:
+    """Fail with the offending statements if the block runs more than `limit` queries."""
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > limit:
+        listing = "\n".join(f"  {i}. {s}" for i, s in enumerate(counter.statements, 1))
+        raise AssertionError(f"Expected at most {limit} queries, got {counter.count}:\n{listing}")
+
+
+@contextmanager
+def assert_no_repeated_queries(engine: Engine, threshold: int = 3) -> Iterator[QueryCount]:
+    """Fail if any normalized statement runs more than `threshold` times in the block (an N+1)."""
+    with count_queries(engine) as counter:
+        yield counter
+    repeated = counter.repeated(threshold)
+    if repeated:
+        listing = "\n".join(f"  {count}x {shape}" for shape, count in repeated)
+        raise AssertionError(f"Statements repeated more than {threshold} times:\n{listing}")
+
@@ -1,4 +1,8 @@
+from typing import Iterator
 from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
 
 
 class ResponseHandler:
@@ -26,6 +30,14 @@ class ResponseHandler:
         message = f"{name} with id {id} deleted successfully"
         return ResponseHandler.success(message, data)
 
+    @staticmethod
+    def export(chunks: Iterator[str], file_format: str, name: str):
+        """Stream an export as a file download."""
+        return StreamingResponse(
+            chunks,
+            media_type=EXPORT_MEDIA_TYPES[file_format],
+            headers={"Content-Disposition": f'attachment; filename="{name}.{file_format}"'})
+
     @staticmethod
     def not_found_error(name="", id=None):
         message = f"{name} With Id {id} Not Found!"
@@ -0,0 +1,80 @@
+import json
+from collections.abc import Mapping
+from functools import lru_cache
+from inspect import isclass
+from types import UnionType
+from typing import Any, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
+_MISSING = object()
+
+
+def json_dumps(content: Any) -> bytes:
+    """Compact JSON bytes, via orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with `json_dumps`."""
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+def _nested_model(annotation: Any) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """(model, is_list) for `Model`, `List[Model]` and `Optional[...]` of either."""
+    origin = get_origin(annotation)
+    if origin in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _nested_model(args[0]) if len(args) == 1 else (None, False)
+    if origin in (list, List):
+        model, _ = _nested_model(get_args(annotation)[0])
+        return model, model is not None
+    if isclass(annotation) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+@lru_cache(maxsize=None)
+def _fields(model: Type[BaseModel]):
+    return [(name, *_nested_model(field.annotation)) for name, field in model.model_fields.items()]
+
+
+def construct_trusted(model: Type[BaseModel], source: Any) -> BaseModel:
+    """
+    Build `model` from ORM rows (or dicts of them) without validating, as
+    `model_construct` does but recursing into nested models and lists of them.
+    Loaded column values are read from the instance dict, skipping SQLAlchemy's
+    attribute descriptors; anything else (expired, lazy, properties) via getattr.
+    Values are taken as-is, so only use this where the schema matches the columns.
+    """
+    if isinstance(source, model):
+        return source
+    mapping = isinstance(source, Mapping)
+    loaded = source if mapping else source.__dict__
+    values = {}
+    for name, nested, many in _fields(model):
+        value = loaded.get(name, _MISSING)
+        if value is _MISSING:
+            if mapping:
+                value = model.model_fields[name].get_default(call_default_factory=True)
+            else:
+                value = getattr(source, name)
+        if nested is not None and value is not None:
+            value = [construct_trusted(nested, item) for item in value] if many else construct_trusted(nested, value)
+        values[name] = value
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__pydantic_fields_set__", set(values))
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
@@ -0,0 +1,80 @@
+"""
+GET /admin/stats cost at growing order volumes (cache bypassed): statements and
+time to compute, against the HTTP requests the dashboard needed before
+(every /orders/ page plus one /users/{id} per order).
+
+Usage:
+    python -m benchmarks.bench_admin_stats --orders 10000 100000
+"""
+
+import argparse
+import random
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.models import Order, OrderItem
+from app.services.stats import StatsService
+from app.utils.query_counter import count_queries
+from benchmarks.common import percentile, print_table, timed, write_json
+from benchmarks.fixtures import bench_engine, seed_products, seed_users
+
+STATUSES = ["Pending", "Confirmed", "Delivered", "Delivered", "Delivered", "Cancelled"]
+
+
+def seed_orders(engine, count: int, first_id: int, days: int = 180, seed_value: int = 9) -> None:
+    """`count` orders spread over the last `days` days, 1-5 items each."""
+    rng = random.Random(seed_value + first_id)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        for start in range(0, count, 5000):
+            ids = range(first_id + start, first_id + min(start + 5000, count))
+            conn.execute(insert(Order), [
+                {"id": i, "user_id": rng.randint(1, 50), "total_amount": 500.0, "payment_method": "UPI",
+                 "delivery_address": "Bench Street", "status": rng.choice(STATUSES),
+                 "created_at": now - timedelta(minutes=rng.randint(0, days * 24 * 60))}
+                for i in ids])
+            conn.execute(insert(OrderItem), [
+                {"order_id": i, "product_id": rng.randint(1, 1000), "quantity": 2,
+                 "price_at_purchase": 125.0, "subtotal": 250.0}
+                for i in ids for _ in range(rng.randint(1, 5))])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the admin stats aggregates")
+    parser.add_argument("--orders", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", help="Empty database to seed (default: temp SQLite file)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    engine = bench_engine(args.database_url, "admin_stats")
+    seed_products(engine, 1000)
+    seed_users(engine, 50)
+
+    rows, seeded = [], 0
+    for total in sorted(args.orders):
+        seed_orders(engine, total - seeded, seeded + 1)
+        seeded = total
+
+        def compute():
+            with Session(engine) as db:
+                return StatsService._compute(db, args.days, 5)
+
+        with count_queries(engine) as counter:
+            compute()
+        samples = timed(compute, args.repeat)
+        rows.append({"orders": total, "statements": counter.count,
+                     "p50_ms": round(percentile(samples, 50) * 1000, 1),
+                     "max_ms": round(max(samples) * 1000, 1),
+                     "old_http_requests": -(-total // 100) + total})
+
+    print(f"{args.days}-day window, {engine.dialect.name}; old_http_requests = /orders/ pages of 100 + /users/{{id}} per order\n")
+    print_table(rows)
+    write_json(args.json, {"days": args.days, "dialect": engine.dialect.name, "results": rows})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Requests per second for the sync vs async DB layer (DB_ASYNC) on
+`GET /products/` and `POST /carts/add-item`.
+
+Each mode gets its own uvicorn process pointed at the configured DATABASE_URL.
+
+Usage:
+    python -m benchmarks.bench_async --token YOUR_ACCESS_TOKEN --product-id 1
+"""
+
+import argparse
+import asyncio
+import os
+
+import httpx
+
+from benchmarks.common import drive, print_table, uvicorn_server, write_json
+
+
+async def run_mode(base_url: str, mode: str, args) -> list:
+    rows = []
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        rows.append(await drive(
+            client, f"{mode} GET /products/", "GET", "/products/",
+            args.requests, args.concurrency))
+
+        if args.token:
+            rows.append(await drive(
+                client, f"{mode} POST /carts/add-item", "POST", "/carts/add-item",
+                args.requests, args.concurrency,
+                headers={"Authorization": f"Bearer {args.token}"},
+                json={"product_id": args.product_id, "quantity": 1}))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async DB layer")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--token", default=os.getenv("KISAN_AUTH_TOKEN"),
+                        help="Buyer access token; add-item is skipped without one")
+    parser.add_argument("--product-id", type=int, default=1)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    rows = []
+    for mode, flag in (("sync", "false"), ("async", "true")):
+        with uvicorn_server(args.port, env={"DB_ASYNC": flag}) as base_url:
+            rows.extend(asyncio.run(run_mode(base_url, mode, args)))
+
+    print_table(rows)
+    write_json(args.json, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Statements and latency of the single-item cart mutations
+(add-item, update item quantity, remove item) against a cart of --lines items.
+
+Usage:
+    python -m benchmarks.bench_cart_items --lines 20 --repeat 200
+"""
+
+import argparse
+import time
+
+from sqlalchemy.orm import Session
+
+from app.services.carts import CartService
+from app.utils.query_counter import count_queries
+from benchmarks.common import print_table, summarize, write_json
+from benchmarks.fixtures import bench_engine, seed_products, seed_users
+
+OPERATIONS = ("add new", "add existing", "update", "remove")
+
+
+def mutations(db: Session, user_id: int, product_id: int):
+    """One add/add/update/remove round on `product_id`; yields after each step."""
+    cart = CartService.add_item(db, user_id, product_id, 1)["data"]
+    yield "add new"
+    CartService.add_item(db, user_id, product_id, 2)
+    yield "add existing"
+    item_id = next(item.id for item in cart.cart_items if item.product_id == product_id)
+    CartService.update_cart_item(db, user_id, item_id, 5)
+    yield "update"
+    CartService.remove_cart_item(db, user_id, item_id)
+    yield "remove"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark single-item cart mutations")
+    parser.add_argument("--lines", type=int, default=20, help="Items already in the cart")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--database-url", help="Empty database to seed (default: temp SQLite file)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    engine = bench_engine(args.database_url, "cart_items")
+    seed_products(engine, args.lines + 1)
+    seed_users(engine, 1)
+    user_id, product_id = 1, args.lines + 1
+
+    latencies = {operation: [] for operation in OPERATIONS}
+    statements = {}
+    with Session(engine) as db:
+        for line in range(1, args.lines + 1):
+            CartService.add_item(db, user_id, line, 1)
+
+        steps = mutations(db, user_id, product_id)
+        for operation in OPERATIONS:
+            with count_queries(engine) as counter:
+                next(steps)
+            statements[operation] = counter.count
+
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for operation in mutations(db, user_id, product_id):
+                now = time.perf_counter()
+                latencies[operation].append(now - start)
+                start = now
+            db.expunge_all()
+
+    rows = []
+    for operation in OPERATIONS:
+        row = summarize(operation, latencies[operation], sum(latencies[operation]))
+        row.pop("errors")
+        row.pop("rps")
+        row["statements"] = statements[operation]
+        rows.append(row)
+    print_table(rows)
+    write_json(args.json, {"lines": args.lines, "dialect": engine.dialect.name, "results": rows})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Statement count and latency of cart create/update/delete by cart size.
+Fails if any operation's statement count grows with the number of lines.
+
+Usage:
+    python -m benchmarks.bench_cart_queries --sizes 1 10 40
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+
+from app.core.security import create_access_token
+from app.schemas.carts import CartCreate, CartUpdate
+from app.services.carts import CartService
+from app.utils.query_counter import assert_max_queries, count_queries
+from benchmarks.common import print_table, summarize, write_json
+from benchmarks.fixtures import bench_engine, seed_products, seed_users
+
+OPERATIONS = ("create", "update", "delete")
+
+
+def bearer(user_id: int) -> HTTPAuthorizationCredentials:
+    token = asyncio.run(create_access_token({"id": user_id}, timedelta(hours=1)))
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def cart_lines(size: int, offset: int = 0):
+    return [{"product_id": offset + i + 1, "quantity": 2} for i in range(size)]
+
+
+def cart_cycle(db: Session, token, size: int):
+    """create -> update -> delete one cart; yields after each step so callers can measure it."""
+    cart_id = CartService.create_cart(token, db, CartCreate(cart_items=cart_lines(size)))["data"].id
+    yield "create"
+    CartService.update_cart(token, db, cart_id, CartUpdate(cart_items=cart_lines(size, size)))
+    yield "update"
+    CartService.delete_cart(token, db, cart_id)
+    yield "delete"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cart statement counts by cart size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 40])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--database-url", help="Empty database to seed (default: temp SQLite file)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    engine = bench_engine(args.database_url, "carts")
+    seed_products(engine, max(args.sizes) * 2)
+    seed_users(engine, 1)
+    token = bearer(1)
+
+    # Statement budget comes from the smallest cart; bigger carts must not exceed it
+    budget = {}
+    rows = []
+    for size in args.sizes:
+        with Session(engine) as db:
+            counts = {}
+            steps = cart_cycle(db, token, size)
+            for operation in OPERATIONS:
+                with count_queries(engine) as counter:
+                    next(steps)
+                counts[operation] = counter.count
+            for operation, count in counts.items():
+                budget.setdefault(operation, count)
+            with assert_max_queries(engine, sum(budget.values())):
+                for _ in cart_cycle(db, token, size):
+                    pass
+
+            latencies = {operation: [] for operation in OPERATIONS}
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                for operation in cart_cycle(db, token, size):
+                    now = time.perf_counter()
+                    latencies[operation].append(now - start)
+                    start = now
+                db.expunge_all()
+
+        for operation in OPERATIONS:
+            row = summarize(f"{operation} {size} lines", latencies[operation], sum(latencies[operation]))
+            row.pop("errors")
+            row.pop("rps")
+            row["statements"] = counts[operation]
+            rows.append(row)
+        assert all(counts[op] <= budget[op] for op in OPERATIONS), f"statement count grew with cart size: {counts}"
+
+    print_table(rows)
+    write_json(args.json, {"sizes": args.sizes, "dialect": engine.dialect.name, "results": rows})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Repeat polling with and without If-None-Match: payload bytes and latency per request.
+
+Starts the API under uvicorn on a seeded temp SQLite database (or --database-url).
+
+Usage:
+    python -m benchmarks.bench_conditional --polls 500
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+
+import httpx
+from sqlalchemy import insert
+
+from app.core.security import create_access_token
+from app.models.models import Order, OrderItem
+from benchmarks.common import percentile, print_table, uvicorn_server, write_json
+from benchmarks.fixtures import bench_engine, seed_products, seed_users
+
+ROUTES = ["/products/?limit=20", "/products/1", "/categories/", "/orders/me"]
+
+
+def seed(engine, orders: int) -> None:
+    seed_products(engine, 2000)
+    seed_users(engine, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Order), [{"id": i, "user_id": 1, "total_amount": 750.0, "payment_method": "UPI",
+                                      "delivery_address": "Bench Street", "status": "Delivered"}
+                                     for i in range(1, orders + 1)])
+        conn.execute(insert(OrderItem), [{"order_id": i, "product_id": p, "quantity": 3,
+                                          "price_at_purchase": 125.0, "subtotal": 375.0}
+                                         for i in range(1, orders + 1) for p in (i, i + 1)])
+
+
+def poll(client: httpx.Client, url: str, polls: int, conditional: bool, headers: dict) -> dict:
+    first = client.get(url, headers=headers)
+    first.raise_for_status()
+    etag = first.headers.get("etag")
+    latencies, payload, statuses = [], 0, set()
+    for _ in range(polls):
+        request_headers = dict(headers)
+        if conditional and etag:
+            request_headers["If-None-Match"] = etag
+        start = time.perf_counter()
+        response = client.get(url, headers=request_headers)
+        latencies.append(time.perf_counter() - start)
+        payload += len(response.content)
+        statuses.add(response.status_code)
+    return {
+        "route": url,
+        "mode": "If-None-Match" if conditional else "full",
+        "status": "/".join(map(str, sorted(statuses))),
+        "bytes_per_req": round(payload / polls),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ETag / 304 revalidation")
+    parser.add_argument("--polls", type=int, default=500)
+    parser.add_argument("--orders", type=int, default=25, help="Orders for the polling user")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--database-url", help="Empty database to seed (default: temp SQLite file)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    engine = bench_engine(args.database_url, "conditional")
+    seed(engine, args.orders)
+    token = asyncio.run(create_access_token({"id": 1}, timedelta(hours=1)))
+    auth = {"Authorization": f"Bearer {token}"}
+
+    rows = []
+    env = {"DATABASE_URL": engine.url.render_as_string(hide_password=False), "DB_SSLMODE": ""}
+    with uvicorn_server(args.port, env=env) as base_url, httpx.Client(base_url=base_url, timeout=30) as client:
+        for url in ROUTES:
+            headers = auth if url.startswith("/orders") else {}
+            for conditional in (False, True):
+                rows.append(poll(client, url, args.polls, conditional, headers))
+
+    print_table(rows)
+    write_json(args.json, {"polls": args.polls, "dialect": engine.dialect.name, "results": rows})
+
+
+if __name__ == "__main__":
+    main()
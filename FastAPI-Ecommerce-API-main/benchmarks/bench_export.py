@@ -0,0 +1,78 @@
+"""
+Streaming export throughput and peak Python memory at growing order counts.
+Peak memory should stay roughly flat as the row count grows.
+
+Usage:
+    python -m benchmarks.bench_export --orders 50000 200000
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.models.models import Order, OrderItem
+from app.services.exports import ExportService
+from benchmarks.common import print_table, write_json
+from benchmarks.fixtures import bench_engine, seed_products, seed_users
+
+
+def seed_orders(engine, count: int, first_id: int, seed_value: int = 3) -> None:
+    """`count` orders of 1-5 items each, with ids from `first_id`."""
+    rng = random.Random(seed_value)
+    with engine.begin() as conn:
+        for start in range(0, count, 5000):
+            ids = range(first_id + start, first_id + min(start + 5000, count))
+            conn.execute(insert(Order), [{"id": i, "user_id": 1, "total_amount": 500.0, "payment_method": "COD",
+                                          "delivery_address": "Bench Street", "status": "Delivered"} for i in ids])
+            conn.execute(insert(OrderItem), [
+                {"order_id": i, "product_id": rng.randint(1, 1000), "quantity": 2,
+                 "price_at_purchase": 125.0, "subtotal": 250.0}
+                for i in ids for _ in range(rng.randint(1, 5))
+            ])
+
+
+def measure(stream):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = chunks = 0
+    for chunk in stream:
+        size += len(chunk)
+        chunks += 1
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, size, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming order exports")
+    parser.add_argument("--orders", type=int, nargs="+", default=[50_000, 200_000])
+    parser.add_argument("--database-url", help="Empty database to seed (default: temp SQLite file)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    engine = bench_engine(args.database_url, "export")
+    seed_products(engine, 1000)
+    seed_users(engine, 1)
+    session_factory = sessionmaker(bind=engine)
+
+    rows, seeded = [], 0
+    for total in sorted(args.orders):
+        seed_orders(engine, total - seeded, seeded + 1)
+        seeded = total
+        for file_format in ("ndjson", "csv"):
+            elapsed, size, peak = measure(ExportService.stream_orders(file_format, session_factory=session_factory))
+            rows.append({"orders": total, "format": file_format, "seconds": round(elapsed, 2),
+                         "orders_per_s": round(total / elapsed), "mb_out": round(size / 1e6, 1),
+                         "peak_mem_mb": round(peak / 1e6, 2)})
+
+    print_table(rows)
+    write_json(args.json, {"dialect": engine.dialect.name, "results": rows})
+
+
+if __name__ == "__main__":
+    main()
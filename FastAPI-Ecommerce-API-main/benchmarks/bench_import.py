@@ -0,0 +1,95 @@
+"""
+Bulk product import throughput: the JSON /products/bulk path and CSV / NDJSON file imports.
+
+Usage:
+    python -m benchmarks.bench_import --rows 20000
+    python -m benchmarks.bench_import --rows 20000 --database-url postgresql://.../bench   # COPY path
+"""
+
+import argparse
+import csv
+import io
+import json
+import random
+import time
+
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.schemas.products import ProductCreateSimple
+from app.services.product_import import ProductImportService
+from app.services.products import ProductService
+from app.utils.query_counter import count_queries
+from benchmarks.common import print_table, write_json
+from benchmarks.fixtures import CATEGORIES, PRODUCE, QUALIFIERS, REGIONS, bench_engine, seed_users
+
+FIELDS = ["title", "description", "price", "category", "image", "stock", "brand"]
+
+
+def catalogue(count: int, prefix: str, seed_value: int = 11):
+    rng = random.Random(seed_value)
+    for i in range(count):
+        produce = rng.choice(PRODUCE)
+        yield {
+            "title": f"{prefix} {rng.choice(QUALIFIERS)} {produce} {i}",
+            "description": f"{produce} from {rng.choice(REGIONS)}",
+            "price": rng.randint(10, 400),
+            "category": rng.choice(CATEGORIES),
+            "image": "https://example.com/p.jpg",
+            "stock": rng.randint(0, 500),
+            "brand": f"{rng.choice(REGIONS)} Farmers Co-op",
+        }
+
+
+def as_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def as_ndjson(rows) -> bytes:
+    return "".join(json.dumps(row) + "\n" for row in rows).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk product import")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--chunk-size", type=int, default=ProductImportService.CHUNK_SIZE)
+    parser.add_argument("--database-url", help="Empty database to seed (default: temp SQLite file)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    engine = bench_engine(args.database_url, "import")
+    Base.metadata.create_all(engine)
+    seed_users(engine, 1, user_type="farmer")
+
+    runs = {
+        "json bulk": lambda db: ProductService.bulk_create_products(
+            db, [ProductCreateSimple(**row) for row in catalogue(args.rows, "Bulk")],
+            farmer_id=1, skip_duplicates=True),
+        "csv file": lambda db: ProductImportService.import_file(
+            db, io.BytesIO(as_csv(catalogue(args.rows, "Csv"))), "csv",
+            farmer_id=1, skip_duplicates=True, chunk_size=args.chunk_size),
+        "ndjson file": lambda db: ProductImportService.import_file(
+            db, io.BytesIO(as_ndjson(catalogue(args.rows, "Nd"))), "ndjson",
+            farmer_id=1, skip_duplicates=True, chunk_size=args.chunk_size),
+    }
+
+    rows = []
+    for name, run in runs.items():
+        with Session(engine) as db, count_queries(engine) as counter:
+            start = time.perf_counter()
+            result = run(db)
+            elapsed = time.perf_counter() - start
+        rows.append({"name": name, "rows": result["created"], "seconds": round(elapsed, 2),
+                     "rows_per_s": round(result["created"] / elapsed), "statements": counter.count})
+
+    print(f"{args.rows} rows per run, {engine.dialect.name}\n")
+    print_table(rows)
+    write_json(args.json, {"rows": args.rows, "dialect": engine.dialect.name, "results": rows})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Login throughput and event-loop stalls during a login burst, for several
+sizes of the password hashing pool (PASSWORD_HASH_WORKERS; 0 hashes inline
+on the event loop, as login used to).
+
+The app runs in-process on a throwaway SQLite file. While the burst runs a
+probe sleeps 10 ms at a time on the same loop; the overshoot is how long any
+other request on the worker would have been stuck.
+
+Usage:
+    python -m benchmarks.bench_login --logins 64 --concurrency 32 --workers 0 1 2 4
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+from sqlalchemy import insert
+
+from app.models.models import User
+from benchmarks.common import percentile, print_table, summarize, write_json
+from benchmarks.fixtures import bench_engine, seed_products
+
+PASSWORD = "bench-password"
+
+
+async def burst(client: httpx.AsyncClient, logins: int, concurrency: int, users: int):
+    """(login latencies, errors, elapsed, loop lag samples) for `logins` logins."""
+    latencies, lags, errors = [], [], 0
+    pending = list(range(logins))
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - start - 0.01)
+
+    async def worker():
+        nonlocal errors
+        while pending:
+            i = pending.pop()
+            start = time.perf_counter()
+            response = await client.post("/auth/login", data={"username": f"login{i % users}", "password": PASSWORD})
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code != 200
+
+    prober = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await prober
+    return latencies, errors, elapsed, lags
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark login throughput and event-loop stalls")
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4],
+                        help="PASSWORD_HASH_WORKERS values to compare")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost of the stored hashes")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    engine = bench_engine(None, "login")
+    seed_products(engine, 1)
+    # One client address makes every login; measure hashing, not the rate limiter
+    os.environ.update(DATABASE_URL=engine.url.render_as_string(hide_password=False), DB_SSLMODE="",
+                      RATE_LIMIT_ENABLED="false")
+
+    # The app reads its settings on first import, after the environment is set
+    from app.core.hashing import build_context, passwords
+    from app.main import app
+
+    hashed = build_context("bcrypt_sha256", args.rounds).hash(PASSWORD)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"username": f"login{i}", "password": hashed, "full_name": f"Login {i}"}
+                                    for i in range(args.users)])
+
+    async def run(workers: int) -> dict:
+        passwords.configure(workers)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+            latencies, errors, elapsed, lags = await burst(client, args.logins, args.concurrency, args.users)
+        row = summarize(f"workers={workers}" + (" (inline)" if workers == 0 else ""), latencies, elapsed, errors)
+        row.update(lag_p50_ms=round(percentile(lags, 50) * 1000, 1), lag_p99_ms=round(percentile(lags, 99) * 1000, 1),
+                   lag_max_ms=round(max(lags, default=0) * 1000, 1))
+        return row
+
+    rows = [asyncio.run(run(workers)) for workers in args.workers]
+    print(f"{args.logins} logins, {args.concurrency} concurrent, bcrypt_sha256 cost {args.rounds}, "
+          f"{os.cpu_count()} CPUs; lag = event-loop stall seen by a 10 ms timer\n")
+    print_table(rows)
+    write_json(args.json, {"logins": args.logins, "concurrency": args.concurrency, "rounds": args.rounds,
+                           "cpus": os.cpu_count(), "results": rows})
+
+
+if __name__ == "__main__":
+    main()
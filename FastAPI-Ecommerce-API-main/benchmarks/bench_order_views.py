@@ -0,0 +1,67 @@
+"""
+Full vs summary order listings (?view=summary) on one large account:
+statements, service + serialization time and response bytes.
+
+Usage:
+    python -m benchmarks.bench_order_views --orders 10000 --repeat 5
+"""
+
+import argparse
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from app.routers.orders import LIST_MODELS
+from app.services.orders import OrderService
+from app.utils.query_counter import count_queries
+from benchmarks.bench_export import seed_orders
+from benchmarks.common import percentile, print_table, timed, write_json
+from benchmarks.fixtures import bench_engine, seed_products, seed_users
+
+
+def render(engine, model, load) -> bytes:
+    """Service call, response-model build and JSON encoding, as the route does them."""
+    with Session(engine) as db:
+        result = model.model_validate(load(db), from_attributes=True)
+    return TypeAdapter(model).dump_json(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full vs summary order listings")
+    parser.add_argument("--orders", type=int, default=10_000, help="Orders on the benchmarked account")
+    parser.add_argument("--page-size", type=int, default=100, help="Admin listing page size")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", help="Empty database to seed (default: temp SQLite file)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    engine = bench_engine(args.database_url, "order_views")
+    seed_products(engine, 1000)
+    seed_users(engine, 1)
+    seed_orders(engine, args.orders, 1)
+
+    calls = {
+        ("/orders/me", False): lambda view: lambda db: OrderService.get_my_orders(db, 1, view),
+        (f"/orders/?limit={args.page_size}", False): lambda view: lambda db: OrderService.get_all_orders(
+            db, 1, args.page_size, None, view),
+        (f"/orders/?limit={args.page_size}&include_user=true", True): lambda view: lambda db:
+            OrderService.get_all_orders(db, 1, args.page_size, None, view, include_user=True),
+    }
+    rows = []
+    for (route, include_user), call in calls.items():
+        for view in ("full", "summary"):
+            load, model = call(view), LIST_MODELS[view, include_user]
+            with count_queries(engine) as counter:
+                body = render(engine, model, load)
+            samples = timed(lambda: render(engine, model, load), args.repeat)
+            rows.append({"route": route, "view": view, "statements": counter.count,
+                         "kb": round(len(body) / 1024, 1), "p50_ms": round(percentile(samples, 50) * 1000, 1),
+                         "max_ms": round(max(samples) * 1000, 1)})
+
+    print(f"{args.orders} orders on one account, {engine.dialect.name}\n")
+    print_table(rows)
+    write_json(args.json, {"orders": args.orders, "dialect": engine.dialect.name, "results": rows})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+OFFSET vs keyset (cursor) pagination latency on page 1 and a deep page.
+
+Usage:
+    python -m benchmarks.bench_pagination --products 120000 --deep-page 5000
+"""
+
+import argparse
+import time
+
+from sqlalchemy.orm import Session
+
+from app.models.models import Product
+from app.services.products import ProductService
+from app.utils.pagination import encode_cursor
+from benchmarks.common import print_table, summarize, timed, write_json
+from benchmarks.fixtures import bench_engine, seed_products
+
+
+def cursor_before_page(db: Session, page: int, limit: int):
+    """The cursor a client would hold after walking to `page - 1`."""
+    if page == 1:
+        return None
+    row = (
+        db.query(Product.id)
+        .filter(Product.approval_status == "approved")
+        .order_by(Product.id.asc())
+        .offset((page - 1) * limit - 1)
+        .first()
+    )
+    return encode_cursor(row, [Product.id])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OFFSET vs keyset pagination")
+    parser.add_argument("--products", type=int, default=120_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--deep-page", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url", help="Empty database to seed (default: temp SQLite file)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    engine = bench_engine(args.database_url, "pagination")
+    start = time.perf_counter()
+    seed_products(engine, args.products)
+    print(f"Seeded {args.products} products in {time.perf_counter() - start:.1f}s ({engine.dialect.name})")
+
+    rows = []
+    with Session(engine) as db:
+        for page in (1, args.deep_page):
+            cursor = cursor_before_page(db, page, args.limit)
+            offset_ids = [p.id for p in ProductService.list_products(db, page, args.limit)["data"]]
+            keyset_ids = [p.id for p in ProductService.list_products(db, 1, args.limit, cursor=cursor)["data"]]
+            assert offset_ids == keyset_ids, "offset and keyset pages differ"
+
+            offset = timed(lambda: ProductService.list_products(db, page, args.limit), args.repeat)
+            keyset = timed(lambda: ProductService.list_products(db, 1, args.limit, cursor=cursor), args.repeat)
+            rows.append(summarize(f"offset page {page}", offset, sum(offset)))
+            rows.append(summarize(f"cursor page {page}", keyset, sum(keyset)))
+            db.expunge_all()
+
+    for row in rows:
+        row.pop("errors")
+        row.pop("rps")
+    print_table(rows)
+    write_json(args.json, {"products": args.products, "limit": args.limit,
+                           "dialect": engine.dialect.name, "results": rows})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Product search at scale: legacy `title LIKE '%term%'` vs the search engine
+(Postgres tsvector/pg_trgm, or the pure-Python index on SQLite).
+
+Seeds --products synthetic rows into a throwaway SQLite file by default, or
+into --database-url (an empty Postgres database with scripts/search_indexes.sql
+applied).
+
+Usage:
+    python -m benchmarks.bench_search --products 100000
+"""
+
+import argparse
+import time
+
+from sqlalchemy.orm import Session
+
+from app.models.models import Product
+from app.services.search import FallbackProductSearch, ProductSearch
+from benchmarks.common import print_table, summarize, timed, write_json
+from benchmarks.fixtures import bench_engine, seed_products
+
+
+QUERIES = ["tomato", "tamatar", "tomatoe", "organic onion", "aloo", "nashik", "mango", "chili", "dal"]
+
+
+def legacy_search(db: Session, term: str, limit: int = 10):
+    query = db.query(Product).filter(Product.title.contains(term), Product.approval_status == "approved")
+    return query.order_by(Product.id.asc()).limit(limit).all(), query.count()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark product search")
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url", help="Empty database to seed (default: temp SQLite file)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    engine = bench_engine(args.database_url, "search")
+    start = time.perf_counter()
+    seed_products(engine, args.products)
+    print(f"Seeded {args.products} products in {time.perf_counter() - start:.1f}s ({engine.dialect.name})")
+
+    rows = []
+    with Session(engine) as db:
+        if engine.dialect.name != "postgresql":
+            build = timed(lambda: (FallbackProductSearch.invalidate(), FallbackProductSearch._get_index(db)), 1)
+            print(f"Python index build: {build[0] * 1000:.0f} ms")
+
+        for term in QUERIES:
+            hits = {}
+            legacy = timed(lambda: hits.__setitem__("legacy", legacy_search(db, term)[1]), args.repeat)
+            engine_times = timed(
+                lambda: hits.__setitem__("engine", ProductSearch.search(db, term, 1, 10)[1]), args.repeat)
+            rows.append({**summarize(f"legacy '{term}'", legacy, sum(legacy)), "hits": hits["legacy"]})
+            rows.append({**summarize(f"engine '{term}'", engine_times, sum(engine_times)), "hits": hits["engine"]})
+
+    for row in rows:
+        row.pop("errors")
+        row.pop("rps")
+    print_table(rows)
+    write_json(args.json, {"products": args.products, "dialect": engine.dialect.name, "results": rows})
+
+
+if __name__ == "__main__":
+    main()
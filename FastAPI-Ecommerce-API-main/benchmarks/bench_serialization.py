@@ -0,0 +1,100 @@
+"""
+Serialization cost of a 100-order OrdersOutList (each item with its product nested),
+built from in-memory ORM rows: model building, JSON encoding and compression.
+
+Usage:
+    python -m benchmarks.bench_serialization --orders 100 --items 3 --repeat 200
+"""
+
+import argparse
+import gzip
+import json
+import random
+from datetime import datetime, timezone
+
+from pydantic import TypeAdapter
+
+from app.models.models import Category, Order, OrderItem, Product
+from app.schemas.orders import OrdersOutList
+from app.utils.serialization import construct_trusted, json_dumps, orjson
+from benchmarks.common import percentile, print_table, timed, write_json
+from benchmarks.fixtures import PRODUCE, QUALIFIERS, REGIONS
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def orm_payload(orders: int, items: int, seed_value: int = 5) -> dict:
+    """Transient Order rows shaped like OrderService.get_my_orders' result."""
+    rng = random.Random(seed_value)
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    category = Category(id=1, name="Vegetables")
+    products = [
+        Product(id=i, title=f"{rng.choice(QUALIFIERS)} {rng.choice(PRODUCE)} {i}",
+                description=f"Grown in {rng.choice(REGIONS)}", price=rng.randint(10, 400),
+                discount_percentage=float(rng.choice([0, 5, 10])), rating=4.5, stock=rng.randint(0, 500),
+                brand="Farmers Co-op", thumbnail="https://example.com/p.jpg", images=["https://example.com/p.jpg"],
+                is_published=True, created_at=now, category_id=1, category=category)
+        for i in range(1, 201)
+    ]
+    rows = []
+    for order_id in range(1, orders + 1):
+        lines = []
+        for n in range(items):
+            product = rng.choice(products)
+            quantity = rng.randint(1, 5)
+            lines.append(OrderItem(id=order_id * items + n, product_id=product.id, quantity=quantity,
+                                   price_at_purchase=float(product.price), subtotal=float(product.price * quantity),
+                                   product=product))
+        rows.append(Order(id=order_id, user_id=1, total_amount=sum(line.subtotal for line in lines),
+                          payment_method="UPI", delivery_address="Bench Street", status="Delivered",
+                          created_at=now, order_items=lines))
+    return {"message": "Orders for user 1", "data": rows}
+
+
+def row(name: str, samples, size: int = None) -> dict:
+    return {"stage": name, "p50_ms": round(percentile(samples, 50) * 1000, 3),
+            "p99_ms": round(percentile(samples, 99) * 1000, 3), "bytes": size if size is not None else ""}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response serialization")
+    parser.add_argument("--orders", type=int, default=100)
+    parser.add_argument("--items", type=int, default=3, help="Items per order")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    payload = orm_payload(args.orders, args.items)
+    adapter = TypeAdapter(OrdersOutList)
+    validated = OrdersOutList.model_validate(payload, from_attributes=True)
+    trusted = construct_trusted(OrdersOutList, payload)
+    body = adapter.dump_json(validated)
+    assert adapter.dump_json(trusted) == body, "trusted construction changed the output"
+    as_dict = validated.model_dump(mode="json")
+    stdlib = lambda: json.dumps(as_dict).encode()
+
+    rows = [
+        row("build: model_validate(from_attributes)",
+            timed(lambda: OrdersOutList.model_validate(payload, from_attributes=True), args.repeat)),
+        row("build: construct_trusted", timed(lambda: construct_trusted(OrdersOutList, payload), args.repeat)),
+        row("response_model re-validation", timed(lambda: adapter.validate_python(validated), args.repeat)),
+        row("encode: pydantic dump_json", timed(lambda: adapter.dump_json(validated), args.repeat), len(body)),
+        row("encode: dict -> json.dumps", timed(stdlib, args.repeat), len(stdlib())),
+        row(f"encode: dict -> json_dumps ({'orjson' if orjson else 'stdlib'})",
+            timed(lambda: json_dumps(as_dict), args.repeat), len(json_dumps(as_dict))),
+        row("compress: gzip level 6", timed(lambda: gzip.compress(body, 6), args.repeat), len(gzip.compress(body, 6))),
+    ]
+    if brotli is not None:
+        rows.append(row("compress: brotli quality 4", timed(lambda: brotli.compress(body, quality=4), args.repeat),
+                        len(brotli.compress(body, quality=4))))
+
+    print(f"{args.orders} orders x {args.items} items, {args.repeat} runs per stage\n")
+    print_table(rows)
+    write_json(args.json, {"orders": args.orders, "items": args.items, "results": rows})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Per-request cost of access-token validation: a plain python-jose decode (as
+get_token_payload used to do) against app/core/tokens.decode on a cache miss
+and on a hit, with a populated revocation list in both cases.
+
+Each run cycles through --tokens distinct tokens, as concurrent users would.
+
+Usage:
+    python -m benchmarks.bench_token_auth --tokens 1000 --repeat 20000 --revoked 50000
+"""
+
+import argparse
+import itertools
+import os
+import time
+
+from benchmarks.common import percentile, print_table, timed, write_json
+
+
+def row(name: str, samples) -> dict:
+    return {"path": name, "p50_us": round(percentile(samples, 50) * 1e6, 1),
+            "p99_us": round(percentile(samples, 99) * 1e6, 1),
+            "per_sec": round(len(samples) / sum(samples)) if samples else 0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JWT validation per request")
+    parser.add_argument("--tokens", type=int, default=1000, help="Distinct tokens in rotation")
+    parser.add_argument("--repeat", type=int, default=20000)
+    parser.add_argument("--revoked", type=int, default=50000, help="Revoked ids held in memory")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    # No revocation sync thread or database: this measures the in-process path only
+    os.environ["TOKEN_REVOCATION_SYNC_SECONDS"] = "0"
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("DB_SSLMODE", "")
+    from jose import jwt
+    from app.core import tokens
+    from app.core.config import settings
+
+    exp = int(time.time()) + 3600
+    issued = [tokens.encode({"id": i, "user_type": "buyer", "type": tokens.ACCESS, "exp": exp}) for i in range(args.tokens)]
+    for i in range(args.revoked):
+        tokens.revoked.add(f"revoked-{i}", exp)
+    kid, secret = tokens.keyring.signing_key()
+
+    def cycle(fn):
+        pending = itertools.cycle(issued)
+        return lambda: fn(next(pending))
+
+    before = timed(cycle(lambda t: jwt.decode(t, secret, algorithms=[settings.algorithm])), args.repeat)
+
+    def miss(token):
+        tokens._verified.clear()
+        return tokens.decode(token)
+
+    cold = timed(cycle(miss), args.repeat)
+    for token in issued:
+        tokens.decode(token)
+    warm = timed(cycle(tokens.decode), args.repeat)
+    probe = next(iter(tokens.revoked._expiry))
+    check = timed(lambda: probe in tokens.revoked, args.repeat)
+
+    rows = [row("before: jose decode", before), row("tokens.decode, cache miss", cold),
+            row("tokens.decode, cache hit", warm), row(f"revocation check ({len(tokens.revoked)} ids)", check)]
+    print(f"{args.tokens} tokens, {args.repeat} decodes per path, {settings.algorithm}"
+          f"{f', kid {kid}' if kid else ''}\n")
+    print_table(rows)
+    write_json(args.json, {"tokens": args.tokens, "repeat": args.repeat, "revoked": args.revoked, "results": rows})
+
+
+if __name__ == "__main__":
+    main()
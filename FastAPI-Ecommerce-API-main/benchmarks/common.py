@@ -0,0 +1,126 @@
+"""
+Shared helpers for the benchmark scripts.
+Run benchmarks from the project root, e.g. `python -m benchmarks.bench_async`.
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `values` (pct in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def summarize(name: str, latencies: List[float], elapsed: float, errors: int = 0) -> Dict[str, Any]:
+    """Build a result row; latencies are seconds, output is milliseconds."""
+    return {
+        "name": name,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    if not rows:
+        return
+    columns = list(rows[0].keys())
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row.get(c, "")).ljust(widths[c]) for c in columns))
+
+
+def write_json(path: Optional[str], payload: Any) -> None:
+    if path:
+        with open(path, "w") as fh:
+            json.dump(payload, fh, indent=2, default=str)
+        print(f"\nResults written to {path}")
+
+
+def timed(fn, repeat: int) -> List[float]:
+    """Call `fn` `repeat` times and return per-call wall times in seconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def drive(
+        client: httpx.AsyncClient,
+        name: str,
+        method: str,
+        url: str,
+        total: int,
+        concurrency: int,
+        **request_kwargs,
+) -> Dict[str, Any]:
+    """Fire `total` requests with at most `concurrency` in flight."""
+    latencies: List[float] = []
+    errors = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async def worker():
+        nonlocal errors
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **request_kwargs)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(name, latencies, time.perf_counter() - started, errors)
+
+
+@contextmanager
+def uvicorn_server(port: int, env: Optional[Dict[str, str]] = None, workers: int = 1) -> Iterator[str]:
+    """Start `app.main:app` under uvicorn in a subprocess and yield its base URL."""
+    base_url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env={**os.environ, **(env or {})},
+    )
+    try:
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            try:
+                httpx.get(f"{base_url}/docs", timeout=1)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        else:
+            raise RuntimeError(f"uvicorn did not come up on port {port}")
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
@@ -0,0 +1,70 @@
+"""
+Synthetic data for benchmarks that seed their own database.
+"""
+
+import os
+import random
+import tempfile
+from typing import Optional
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+
+from app.db.base import Base
+from app.models.models import Category, Product, User
+
+
+def bench_engine(database_url: Optional[str], name: str) -> Engine:
+    """Engine for --database-url, or a throwaway SQLite file."""
+    url = database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), name + '.db')}"
+    return create_engine(url)
+
+
+PRODUCE = ["Tomatoes", "Onion", "Potato", "Carrots", "Brinjal", "Okra", "Cauliflower", "Cabbage",
+           "Spinach", "Green Chilli", "Capsicum", "Garlic", "Ginger", "Coriander", "Peas",
+           "Banana", "Mango", "Guava", "Coconut", "Lemon", "Rice", "Wheat", "Maize", "Ragi",
+           "Jowar", "Bajra", "Moong Dal", "Turmeric", "Milk", "Apple"]
+QUALIFIERS = ["Organic", "Fresh", "Desi", "Hybrid", "Premium", "Farm", "Local", "Red", "Green", "Baby"]
+REGIONS = ["Nashik", "Kolar", "Guntur", "Ratnagiri", "Indore", "Karnal", "Erode", "Mysuru"]
+CATEGORIES = ["Vegetables", "Fruits", "Grains", "Pulses", "Millets", "Dairy", "Spices", "Others"]
+
+
+def seed_products(engine, count: int, seed_value: int = 7) -> None:
+    """Create the schema and insert `count` products across the default categories."""
+    rng = random.Random(seed_value)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Category), [{"name": name} for name in CATEGORIES])
+        batch = []
+        for i in range(count):
+            produce = rng.choice(PRODUCE)
+            batch.append({
+                "title": f"{rng.choice(QUALIFIERS)} {produce} {i}",
+                "description": f"{produce} from {rng.choice(REGIONS)}, harvested this week.",
+                "price": rng.randint(10, 400),
+                "discount_percentage": 0.0,
+                "rating": 4.0,
+                "stock": rng.randint(0, 500),
+                "brand": f"{rng.choice(REGIONS)} Farmers Co-op",
+                "thumbnail": "https://example.com/p.jpg",
+                "images": ["https://example.com/p.jpg"],
+                "is_published": True,
+                "category_id": rng.randint(1, len(CATEGORIES)),
+                "approval_status": "approved" if rng.random() < 0.9 else "pending",
+            })
+            if len(batch) == 5000:
+                conn.execute(insert(Product), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Product), batch)
+
+
+def seed_users(engine, count: int, user_type: str = "buyer") -> None:
+    """Insert `count` users; the password hash is a placeholder, not loginable."""
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"username": f"{user_type}{i}", "email": f"{user_type}{i}@example.com",
+             "password": "x", "full_name": f"Bench {user_type.title()} {i}", "user_type": user_type}
+            for i in range(count)
+        ])
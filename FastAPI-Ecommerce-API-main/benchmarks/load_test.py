@@ -0,0 +1,260 @@
+"""
+Mixed-traffic load test: browse, search, add-to-cart, checkout and admin
+approvals against the whole app, reporting throughput, p50/p95/p99 and DB
+statements per endpoint (read from the Server-Timing header, so the app runs
+with INSTRUMENTATION_ENABLED).
+
+Seeds a throwaway SQLite file by default, or --database-url (an empty
+database, or one seeded by an earlier run, which is reused). Runs the app
+in-process through httpx's ASGI transport, or under a local uvicorn with
+--server. Works offline; results are written as JSON tagged with the current
+commit, so runs can be compared across commits.
+
+Usage:
+    python -m benchmarks.load_test --duration 30 --concurrency 32
+    python -m benchmarks.load_test --products 100000 --users 50000 --orders 1000000 \\
+        --database-url sqlite:////tmp/kisan_load.db --json before.json
+    python -m benchmarks.load_test --server --mix browse=60,search=30,checkout=10
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import re
+import subprocess
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import httpx
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.models import Order, OrderItem, Product, User
+from benchmarks.common import print_table, summarize, uvicorn_server, write_json
+from benchmarks.fixtures import PRODUCE, bench_engine, seed_products, seed_users
+
+DEFAULT_MIX = "browse=50,search=20,add_to_cart=15,checkout=10,approve=5"
+MIN_ORDER_AMOUNT = 500
+STATEMENTS = re.compile(r'desc="(\d+) statements"')
+
+
+def seed_orders(engine, count: int, users: int, products: int, seed_value: int = 11) -> None:
+    """`count` delivered orders of 1-5 items each, spread over `users` buyers."""
+    rng = random.Random(seed_value)
+    with engine.begin() as conn:
+        for start in range(0, count, 5000):
+            ids = range(start + 1, min(start + 5000, count) + 1)
+            conn.execute(insert(Order), [
+                {"id": i, "user_id": rng.randint(1, users), "total_amount": 500.0, "payment_method": "COD",
+                 "delivery_address": "Bench Street", "status": "Delivered"} for i in ids])
+            conn.execute(insert(OrderItem), [
+                {"order_id": i, "product_id": rng.randint(1, products), "quantity": 2,
+                 "price_at_purchase": 125.0, "subtotal": 250.0}
+                for i in ids for _ in range(rng.randint(1, 5))])
+
+
+def prepare(engine, args) -> Tuple[int, Dict[int, int], List[int]]:
+    """Seed (or reuse) the database; returns the admin id, approved product prices and pending ids."""
+    with Session(engine) as db:
+        try:
+            seeded = db.query(func.count(Product.id)).scalar()
+        except Exception:
+            seeded = 0
+    if not seeded:
+        seed_products(engine, args.products)
+        seed_users(engine, args.users)
+        seed_users(engine, 1, "admin")
+        seed_orders(engine, args.orders, args.users, args.products)
+        print(f"Seeded {args.products} products, {args.users} users, {args.orders} orders")
+    else:
+        print(f"Reusing {seeded} seeded products in {engine.url}")
+
+    with engine.begin() as conn:
+        # Checkouts should measure the write path, not sell-outs
+        conn.execute(update(Product).values(stock=1_000_000))
+    with Session(engine) as db:
+        admin_id = db.scalar(select(User.id).where(User.user_type == "admin"))
+        prices = dict(db.query(Product.id, Product.price).filter(Product.approval_status == "approved").all())
+        pending = [i for (i,) in db.query(Product.id).filter(Product.approval_status == "pending")]
+        buyers = db.query(func.max(User.id)).filter(User.user_type == "buyer").scalar()
+    args.users = buyers
+    return admin_id, prices, pending
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Traffic:
+    """Issues the requests of one scenario and records them per endpoint."""
+
+    def __init__(self, client: httpx.AsyncClient, args, admin_id: int, prices: Dict[int, int], pending: List[int]):
+        self.client = client
+        self.encode = args.encode_token
+        self.users = args.users
+        self.admin = self.auth(admin_id, "admin")
+        self.product_ids = list(prices)
+        self.prices = prices
+        self.pending = pending
+        self.samples: Dict[str, List[Tuple[float, int, int]]] = defaultdict(list)
+
+    def auth(self, user_id: int, user_type: str = "buyer") -> Dict[str, str]:
+        token = self.encode({"id": user_id, "user_type": user_type, "type": "access",
+                             "exp": int(time.time()) + 3600})
+        return {"Authorization": f"Bearer {token}"}
+
+    async def call(self, endpoint: str, method: str, url: str, **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.samples[endpoint].append((time.perf_counter() - start, 599, 0))
+            return None
+        match = STATEMENTS.search(response.headers.get("server-timing", ""))
+        self.samples[endpoint].append((time.perf_counter() - start, response.status_code,
+                                       int(match.group(1)) if match else 0))
+        return response
+
+    async def browse(self, rng: random.Random):
+        await self.call("GET /products/", "GET", "/products/", params={"page": rng.randint(1, 20), "limit": 20})
+        await self.call("GET /products/{product_id}", "GET", f"/products/{rng.choice(self.product_ids)}")
+
+    async def search(self, rng: random.Random):
+        await self.call("GET /products/?search=", "GET", "/products/",
+                        params={"search": rng.choice(PRODUCE).lower(), "limit": 20})
+
+    async def add_to_cart(self, rng: random.Random):
+        headers = self.auth(rng.randint(1, self.users))
+        await self.call("POST /carts/add-item", "POST", "/carts/add-item", headers=headers,
+                        json={"product_id": rng.choice(self.product_ids), "quantity": 1})
+        await self.call("GET /carts/me", "GET", "/carts/me", headers=headers)
+
+    async def checkout(self, rng: random.Random):
+        headers = self.auth(rng.randint(1, self.users))
+        product_id = rng.choice(self.product_ids)
+        await self.call("POST /carts/add-item", "POST", "/carts/add-item", headers=headers, json={
+            "product_id": product_id, "quantity": math.ceil(MIN_ORDER_AMOUNT / self.prices[product_id])})
+        await self.call("POST /orders/", "POST", "/orders/", headers=headers,
+                        json={"payment_method": "COD", "delivery_address": "Bench Street"})
+        await self.call("GET /orders/me", "GET", "/orders/me", headers=headers, params={"view": "summary"})
+
+    async def approve(self, rng: random.Random):
+        await self.call("GET /products/pending", "GET", "/products/pending", headers=self.admin)
+        if self.pending:
+            product_id = self.pending.pop(rng.randrange(len(self.pending)))
+            await self.call("PUT /products/{product_id}/approve", "PUT", f"/products/{product_id}/approve",
+                            headers=self.admin)
+
+
+SCENARIOS = {name: getattr(Traffic, name) for name in ("browse", "search", "add_to_cart", "checkout", "approve")}
+
+
+async def run(client: httpx.AsyncClient, args, mix: Dict[str, float], setup) -> Tuple[Traffic, float]:
+    traffic = Traffic(client, args, *setup)
+    names, weights = list(mix), list(mix.values())
+    deadline = time.perf_counter() + args.duration
+
+    async def worker(index: int):
+        rng = random.Random(args.seed * 1000 + index)
+        while time.perf_counter() < deadline:
+            await SCENARIOS[rng.choices(names, weights)[0]](traffic, rng)
+
+    # A short warm-up fills caches and the connection pool before measuring
+    warmup = random.Random(args.seed)
+    for name in names:
+        await SCENARIOS[name](traffic, warmup)
+    traffic.samples.clear()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    return traffic, time.perf_counter() - started
+
+
+def report(traffic: Traffic, elapsed: float) -> List[dict]:
+    rows = []
+    everything = []
+    for endpoint, samples in sorted(traffic.samples.items()):
+        everything.extend(samples)
+        row = summarize(endpoint, [s[0] for s in samples], elapsed, sum(1 for s in samples if s[1] >= 400))
+        row["statements"] = round(sum(s[2] for s in samples) / len(samples), 1)
+        rows.append(row)
+    if everything:
+        total = summarize("total", [s[0] for s in everything], elapsed, sum(1 for s in everything if s[1] >= 400))
+        total["statements"] = round(sum(s[2] for s in everything) / len(everything), 1)
+        rows.append(total)
+    return rows
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mixed-traffic load test of the API")
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--orders", type=int, default=50_000)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Scenario weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds of measured traffic")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent virtual users")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--server", action="store_true", help="Run under uvicorn instead of in-process")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--database-url", help="Database to seed or reuse (default: temp SQLite file)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+
+    engine = bench_engine(args.database_url, "load_test")
+    setup = prepare(engine, args)
+    env = {"DATABASE_URL": engine.url.render_as_string(hide_password=False), "INSTRUMENTATION_ENABLED": "true"}
+    if engine.dialect.name == "sqlite":
+        env["DB_SSLMODE"] = ""
+    os.environ.update(env)
+    # The app reads its settings on first import, after the environment is set
+    from app.core.tokens import encode
+    args.encode_token = encode
+
+    async def in_process():
+        from app.main import app
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=60) as client:
+            return await run(client, args, mix, setup)
+
+    async def over_http(base_url):
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            return await run(client, args, mix, setup)
+
+    if args.server:
+        with uvicorn_server(args.port, env=env) as base_url:
+            traffic, elapsed = asyncio.run(over_http(base_url))
+    else:
+        traffic, elapsed = asyncio.run(in_process())
+
+    rows = report(traffic, elapsed)
+    mode = "uvicorn" if args.server else "in-process"
+    print(f"\n{mode}, {engine.dialect.name}, {args.concurrency} virtual users for {elapsed:.1f}s, mix {args.mix}\n")
+    print_table(rows)
+    write_json(args.json, {
+        "commit": current_commit(), "mode": mode, "dialect": engine.dialect.name, "mix": mix,
+        "concurrency": args.concurrency, "duration_s": round(elapsed, 2), "seed": args.seed,
+        "volumes": {"products": args.products, "orders": args.orders}, "results": rows,
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Many buyers checking out the same SKU at once.
+Fails if the product is oversold or stock and order lines disagree; reports checkout throughput.
+
+Usage:
+    python -m benchmarks.stress_checkout --buyers 200 --threads 32 --stock 500 --quantity 5
+    python -m benchmarks.stress_checkout --database-url postgresql://.../bench   # row locks exercised
+
+SQLite serialises writers, so expect some "database is locked" errors there;
+they are counted, and the oversell check still applies.
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session
+
+from app.models.models import Cart, CartItem, OrderItem, Product
+from app.schemas.orders import OrderCreate
+from app.services.orders import OrderService
+from benchmarks.common import print_table, summarize, write_json
+from benchmarks.fixtures import bench_engine, seed_products, seed_users
+
+SKU = 1
+PRICE = 500.0
+
+
+def prepare(engine, buyers: int, stock: int, quantity: int) -> None:
+    """One SKU with `stock` units and a cart holding `quantity` of it per buyer."""
+    seed_products(engine, 10)
+    seed_users(engine, buyers)
+    with engine.begin() as conn:
+        conn.execute(update(Product).where(Product.id == SKU).values(stock=stock, price=PRICE, discount_percentage=0))
+        conn.execute(insert(Cart), [{"user_id": user_id, "total_amount": PRICE * quantity}
+                                    for user_id in range(1, buyers + 1)])
+        conn.execute(insert(CartItem), [{"cart_id": cart_id, "product_id": SKU, "quantity": quantity,
+                                         "subtotal": PRICE * quantity} for cart_id in range(1, buyers + 1)])
+
+
+def checkout(engine, user_id: int):
+    """(outcome, seconds) for one checkout: ordered, sold_out or error."""
+    order = OrderCreate(payment_method="COD", delivery_address="Bench Street")
+    start = time.perf_counter()
+    try:
+        with Session(engine) as db:
+            OrderService.create_order_from_cart(db, user_id, order)
+        outcome = "ordered"
+    except HTTPException as exc:
+        outcome = "sold_out" if exc.status_code == 409 else "error"
+    except Exception:
+        outcome = "error"
+    return outcome, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent checkout stress test")
+    parser.add_argument("--buyers", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--stock", type=int, default=500)
+    parser.add_argument("--quantity", type=int, default=5, help="Units of the SKU in each buyer's cart")
+    parser.add_argument("--database-url", help="Empty database to seed (default: temp SQLite file)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    engine = bench_engine(args.database_url, "checkout")
+    prepare(engine, args.buyers, args.stock, args.quantity)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        results = list(pool.map(lambda user_id: checkout(engine, user_id), range(1, args.buyers + 1)))
+    elapsed = time.perf_counter() - start
+
+    outcomes = {name: [seconds for outcome, seconds in results if outcome == name]
+                for name in ("ordered", "sold_out", "error")}
+
+    with Session(engine) as db:
+        remaining = db.query(Product.stock).filter(Product.id == SKU).scalar()
+        sold = db.query(func.coalesce(func.sum(OrderItem.quantity), 0)).filter(OrderItem.product_id == SKU).scalar()
+
+    rows = [summarize(name, latencies, elapsed) for name, latencies in outcomes.items() if latencies]
+    for row in rows:
+        row.pop("errors")
+    print_table(rows)
+    print(f"\n{len(results) / elapsed:.1f} checkouts/s over {args.threads} threads; "
+          f"sold {sold} of {args.stock}, {remaining} left")
+
+    assert remaining >= 0, f"stock went negative: {remaining}"
+    assert sold + remaining == args.stock, f"sold {sold} + remaining {remaining} != initial {args.stock}"
+    assert sold == len(outcomes["ordered"]) * args.quantity, "order lines don't match successful checkouts"
+    expected = min(args.buyers, args.stock // args.quantity)
+    if not outcomes["error"]:
+        assert len(outcomes["ordered"]) == expected, f"{len(outcomes['ordered'])} orders, expected {expected}"
+
+    write_json(args.json, {"buyers": args.buyers, "threads": args.threads, "stock": args.stock,
+                           "quantity": args.quantity, "sold": sold, "remaining": remaining,
+                           "dialect": engine.dialect.name, "elapsed_s": round(elapsed, 3), "results": rows})
+
+
+if __name__ == "__main__":
+    main()
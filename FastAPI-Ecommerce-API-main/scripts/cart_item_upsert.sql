@@ -0,0 +1,22 @@
+-- One cart_items row per (cart, product), so adding an item can be a single upsert
+-- Run this SQL script once on existing databases; new ones get it from supabase_schema.sql
+
+-- Fold duplicate lines into the lowest id
+UPDATE cart_items ci
+SET quantity = d.quantity, subtotal = d.subtotal
+FROM (
+    SELECT MIN(id) AS keep_id, SUM(quantity) AS quantity, SUM(subtotal) AS subtotal
+    FROM cart_items
+    GROUP BY cart_id, product_id
+    HAVING COUNT(*) > 1
+) d
+WHERE ci.id = d.keep_id;
+
+DELETE FROM cart_items ci
+USING cart_items keep
+WHERE ci.cart_id = keep.cart_id
+  AND ci.product_id = keep.product_id
+  AND ci.id > keep.id;
+
+ALTER TABLE cart_items
+ADD CONSTRAINT uq_cart_items_cart_product UNIQUE (cart_id, product_id);
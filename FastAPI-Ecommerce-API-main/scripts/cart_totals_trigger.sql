@@ -0,0 +1,30 @@
+-- Optional: maintain carts.total_amount in the database from cart_items changes
+-- Run this SQL script once, then set CART_TOTALS_TRIGGER=true so the app stops
+-- applying the same deltas itself (it would count every change twice)
+
+CREATE OR REPLACE FUNCTION cart_items_total_delta() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.cart_id = NEW.cart_id THEN
+        UPDATE carts
+        SET total_amount = round((total_amount + NEW.subtotal - OLD.subtotal)::numeric, 2)
+        WHERE id = NEW.cart_id;
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE carts
+        SET total_amount = round((total_amount - OLD.subtotal)::numeric, 2)
+        WHERE id = OLD.cart_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE carts
+        SET total_amount = round((total_amount + NEW.subtotal)::numeric, 2)
+        WHERE id = NEW.cart_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS cart_items_total ON cart_items;
+CREATE TRIGGER cart_items_total
+    AFTER INSERT OR DELETE OR UPDATE OF subtotal, cart_id ON cart_items
+    FOR EACH ROW EXECUTE FUNCTION cart_items_total_delta();
@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+"""
+Generate a large, realistic dataset for staging and performance testing:
+farmers, buyers, an admin, categories, products, open carts and order history.
+
+- Deterministic: every chunk of rows comes from its own RNG seeded by
+  (--seed, table, chunk), so the same arguments give the same data
+  whatever the worker count or how often the run was resumed.
+- Fast: COPY on Postgres (psycopg2 / psycopg), batched inserts elsewhere.
+- Resumable: each chunk commits together with its row in seed_progress;
+  rerunning the same command skips finished chunks.
+- Parallel: --workers processes load chunks of a table side by side
+  (Postgres; SQLite allows one writer, so it runs with one).
+
+The target must be empty, or a database this script was seeding. Postgres
+needs the schema (supabase_schema.sql) applied first; SQLite files get it
+created. Every generated user's password is --password.
+
+Usage:
+    python scripts/generate_data.py --database-url postgresql://localhost/kisan_staging \\
+        --farmers 20000 --buyers 500000 --products 200000 --orders 2000000 --workers 8
+    python scripts/generate_data.py --database-url sqlite:////tmp/kisan.db --orders 100000
+"""
+
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from passlib.hash import bcrypt_sha256
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.base import Base
+from app.models.models import Cart, CartItem, Category, Order, OrderItem, Product, User
+
+IST = timezone(timedelta(hours=5, minutes=30))
+MIN_ORDER_AMOUNT = 500
+MAX_ORDER_ITEMS = 5
+MAX_CART_ITEMS = 4
+
+progress_meta = MetaData()
+seed_progress = Table(
+    "seed_progress", progress_meta,
+    Column("phase", String, primary_key=True),
+    Column("chunk", Integer, primary_key=True),
+    Column("rows", Integer, nullable=False),
+)
+seed_config = Table(
+    "seed_config", progress_meta,
+    Column("key", String, primary_key=True),
+    Column("value", String, nullable=False),
+)
+
+# --- Indian-locale reference data --------------------------------------------
+
+FIRST_NAMES = [
+    "Aarav", "Aditya", "Amit", "Anil", "Arjun", "Ganesh", "Gurpreet", "Harpreet", "Imran", "Joseph",
+    "Kiran", "Mahesh", "Manoj", "Mohammed", "Prakash", "Rahul", "Rajesh", "Ramesh", "Ravi", "Rohan",
+    "Sai", "Srinivas", "Sunil", "Suresh", "Venkatesh", "Vikram", "Vivaan", "Ananya", "Anita", "Ayesha",
+    "Deepa", "Divya", "Fatima", "Geeta", "Kavita", "Kavya", "Lakshmi", "Meena", "Neha", "Pooja",
+    "Priya", "Radha", "Savitri", "Shalini", "Sneha", "Sunita", "Swati", "Usha",
+]
+LAST_NAMES = [
+    "Sharma", "Verma", "Patel", "Reddy", "Rao", "Naidu", "Kumar", "Singh", "Yadav", "Gupta", "Jain",
+    "Shah", "Desai", "Patil", "Pawar", "Jadhav", "Kulkarni", "Iyer", "Nair", "Menon", "Pillai", "Das",
+    "Ghosh", "Banerjee", "Mukherjee", "Bose", "Mishra", "Tiwari", "Pandey", "Chauhan", "Gill",
+    "Sandhu", "Khan", "Ansari", "Gowda", "Hegde", "Shetty", "Chowdhury", "Thakur", "Meena",
+]
+# state -> (population weight, [(city, PIN prefix)])
+REGIONS = {
+    "Uttar Pradesh": (16, [("Lucknow", 226), ("Kanpur", 208), ("Varanasi", 221), ("Agra", 282)]),
+    "Maharashtra": (9, [("Pune", 411), ("Nashik", 422), ("Nagpur", 440), ("Mumbai", 400)]),
+    "Bihar": (8, [("Patna", 800), ("Gaya", 823), ("Muzaffarpur", 842)]),
+    "West Bengal": (7, [("Kolkata", 700), ("Siliguri", 734), ("Durgapur", 713)]),
+    "Madhya Pradesh": (6, [("Indore", 452), ("Bhopal", 462), ("Jabalpur", 482)]),
+    "Tamil Nadu": (6, [("Chennai", 600), ("Coimbatore", 641), ("Madurai", 625), ("Erode", 638)]),
+    "Rajasthan": (6, [("Jaipur", 302), ("Jodhpur", 342), ("Kota", 324)]),
+    "Karnataka": (5, [("Bengaluru", 560), ("Mysuru", 570), ("Hubballi", 580), ("Kolar", 563)]),
+    "Gujarat": (5, [("Ahmedabad", 380), ("Surat", 395), ("Rajkot", 360)]),
+    "Andhra Pradesh": (4, [("Guntur", 522), ("Vijayawada", 520), ("Visakhapatnam", 530)]),
+    "Odisha": (3, [("Bhubaneswar", 751), ("Cuttack", 753)]),
+    "Telangana": (3, [("Hyderabad", 500), ("Warangal", 506)]),
+    "Kerala": (3, [("Kochi", 682), ("Thiruvananthapuram", 695), ("Kozhikode", 673)]),
+    "Punjab": (2, [("Ludhiana", 141), ("Amritsar", 143)]),
+    "Haryana": (2, [("Karnal", 132), ("Hisar", 125)]),
+}
+
+
+def weighted(weights: Dict) -> list:
+    """Expand {value: weight} into a list, so rng.choice() draws with those weights cheaply."""
+    return [value for value, weight in weights.items() for _ in range(weight)]
+
+
+STATES = weighted({state: weight for state, (weight, _) in REGIONS.items()})
+VILLAGES = ["Rampur", "Shivpur", "Kishanpura", "Chandanpur", "Devgaon", "Sonpur", "Malkapur", "Nandgaon",
+            "Palampur", "Gopalpur", "Bhavanipur", "Sitapur", "Rajapur", "Laxmipur", "Kalyanpur", "Ambegaon"]
+STREETS = ["MG Road", "Station Road", "Gandhi Nagar", "Nehru Nagar", "Shastri Nagar", "Rajendra Nagar",
+           "Main Bazaar", "Temple Street", "Civil Lines", "Subhash Chowk", "Ashok Vihar", "Indira Colony"]
+EMAIL_DOMAINS = ["gmail.com"] * 6 + ["yahoo.co.in", "rediffmail.com", "outlook.com", "hotmail.com"]
+
+# (name, category, price range in rupees, unit)
+PRODUCE = [
+    ("Tomato", "Vegetables", (20, 60), "kg"), ("Onion", "Vegetables", (25, 70), "kg"),
+    ("Potato", "Vegetables", (15, 40), "kg"), ("Brinjal", "Vegetables", (30, 60), "kg"),
+    ("Bhindi", "Vegetables", (40, 80), "kg"), ("Cauliflower", "Vegetables", (30, 60), "piece"),
+    ("Cabbage", "Vegetables", (20, 40), "piece"), ("Palak", "Vegetables", (20, 40), "bunch"),
+    ("Green Chilli", "Vegetables", (60, 120), "kg"), ("Capsicum", "Vegetables", (50, 100), "kg"),
+    ("Carrot", "Vegetables", (40, 80), "kg"), ("Lauki", "Vegetables", (25, 50), "piece"),
+    ("Karela", "Vegetables", (40, 80), "kg"), ("Drumstick", "Vegetables", (60, 150), "kg"),
+    ("Banana", "Fruits", (40, 70), "dozen"), ("Alphonso Mango", "Fruits", (300, 800), "dozen"),
+    ("Guava", "Fruits", (50, 100), "kg"), ("Papaya", "Fruits", (30, 60), "kg"),
+    ("Pomegranate", "Fruits", (120, 250), "kg"), ("Grapes", "Fruits", (60, 140), "kg"),
+    ("Coconut", "Fruits", (30, 50), "piece"), ("Lemon", "Fruits", (80, 150), "kg"),
+    ("Chikoo", "Fruits", (60, 100), "kg"), ("Basmati Rice", "Grains", (90, 180), "kg"),
+    ("Sona Masoori Rice", "Grains", (55, 80), "kg"), ("Wheat", "Grains", (30, 45), "kg"),
+    ("Maize", "Grains", (22, 35), "kg"), ("Chakki Atta", "Grains", (40, 60), "kg"),
+    ("Toor Dal", "Pulses", (120, 180), "kg"), ("Moong Dal", "Pulses", (100, 150), "kg"),
+    ("Chana Dal", "Pulses", (80, 110), "kg"), ("Masoor Dal", "Pulses", (90, 130), "kg"),
+    ("Urad Dal", "Pulses", (110, 160), "kg"), ("Rajma", "Pulses", (120, 180), "kg"),
+    ("Ragi", "Millets", (40, 70), "kg"), ("Jowar", "Millets", (40, 60), "kg"),
+    ("Bajra", "Millets", (30, 50), "kg"), ("Foxtail Millet", "Millets", (80, 140), "kg"),
+    ("Kodo Millet", "Millets", (90, 150), "kg"), ("Cow Milk", "Dairy", (50, 70), "litre"),
+    ("Paneer", "Dairy", (300, 450), "kg"), ("Desi Ghee", "Dairy", (550, 750), "kg"),
+    ("Curd", "Dairy", (50, 80), "kg"), ("Turmeric", "Spices", (150, 300), "kg"),
+    ("Red Chilli Powder", "Spices", (200, 400), "kg"), ("Jeera", "Spices", (400, 700), "kg"),
+    ("Elaichi", "Spices", (1500, 3000), "kg"), ("Black Pepper", "Spices", (500, 900), "kg"),
+    ("Ginger", "Spices", (80, 160), "kg"), ("Garlic", "Spices", (100, 250), "kg"),
+    ("Jaggery", "Others", (50, 90), "kg"), ("Honey", "Others", (300, 600), "kg"),
+    ("Groundnut", "Others", (100, 150), "kg"), ("Mustard Oil", "Others", (150, 220), "litre"),
+]
+CATEGORIES = sorted({category for _, category, _, _ in PRODUCE})
+QUALIFIERS = ["Organic", "Fresh", "Desi", "Farm Fresh", "Premium", "Naturally Grown", "Hand-picked", "Local"]
+# Order volume by hour of day (IST): late morning and evening peaks
+HOURS = weighted(dict(enumerate([1, 1, 1, 1, 1, 2, 4, 6, 8, 10, 12, 12, 11, 9, 8, 8, 9, 11, 13, 14, 13, 10, 6, 3])))
+APPROVAL = weighted({"approved": 90, "pending": 7, "rejected": 3})
+DISCOUNTS = weighted({0.0: 70, 5.0: 10, 10.0: 10, 15.0: 5, 20.0: 5})
+QUANTITIES = weighted({1: 40, 2: 30, 3: 15, 4: 10, 5: 5})
+ORDER_SIZES = weighted({1: 45, 2: 25, 3: 15, 4: 10, 5: 5})
+PAYMENT_METHODS = weighted({"UPI": 60, "COD": 40})
+# Order status by age: settled, in transit, just placed
+STATUS_OLD = weighted({"Delivered": 88, "Cancelled": 8, "Confirmed": 4})
+STATUS_RECENT = weighted({"Delivered": 50, "Confirmed": 35, "Pending": 10, "Cancelled": 5})
+STATUS_NEW = weighted({"Pending": 60, "Confirmed": 35, "Cancelled": 5})
+
+
+class Plan:
+    """Row counts, id layout and shared values for one generation run."""
+
+    def __init__(self, config: dict, categories: Dict[str, int]):
+        self.config = config
+        self.seed = config["seed"]
+        self.farmers = config["farmers"]
+        self.buyers = config["buyers"]
+        self.products = config["products"]
+        self.orders = config["orders"]
+        self.cart_ratio = config["cart_ratio"]
+        self.days = config["days"]
+        self.chunk_size = config["chunk_size"]
+        # Midnight IST ending the history, in UTC
+        self.until = datetime.combine(date.fromisoformat(config["until"]), datetime.min.time(), IST) \
+            .astimezone(timezone.utc)
+        self.password = config["password_hash"]
+        self.categories = categories
+        # users: farmers, then buyers, then the admin
+        self.admin_id = self.farmers + self.buyers + 1
+
+    def rows(self, phase: str) -> int:
+        """Rows of the phase's main table; carts are numbered per buyer, not all of them exist."""
+        return {"farmers": self.farmers, "buyers": self.buyers, "admin": 1, "products": self.products,
+                "carts": self.buyers, "orders": self.orders}[phase]
+
+    def chunks(self, phase: str) -> int:
+        return math.ceil(self.rows(phase) / self.chunk_size)
+
+    def rng(self, phase: str, chunk: int) -> random.Random:
+        return random.Random(f"{self.seed}:{phase}:{chunk}")
+
+    def id_range(self, phase: str, chunk: int) -> range:
+        first = {"farmers": 1, "buyers": self.farmers + 1, "admin": self.admin_id}.get(phase, 1)
+        start = first + chunk * self.chunk_size
+        return range(start, min(start + self.chunk_size, first + self.rows(phase)))
+
+
+PHASES = ["farmers", "buyers", "admin", "products", "carts", "orders"]
+
+
+# --- row generators ------------------------------------------------------------
+
+def _person(rng: random.Random, user_id: int) -> Tuple[str, str, str, str]:
+    """(full name, username, phone, state) for a user; usernames and phones are unique by id."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    phone = f"+91{6 + user_id % 4}{user_id * 7919 % 10 ** 9:09d}"
+    return f"{first} {last}", f"{first}{last}{user_id}".lower(), phone, rng.choice(STATES)
+
+
+def buyer_address(plan: Plan, user_id: int) -> str:
+    """
+    A buyer's delivery address. Orders repeat it, so it is a pure function of
+    the id: digits of a mixed 64-bit hash pick each part.
+    """
+    h = (user_id * 0x9E3779B97F4A7C15 + plan.seed) & 0xFFFFFFFFFFFFFFFF
+    h = ((h ^ (h >> 31)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    h ^= h >> 29
+    state = STATES[h % len(STATES)]
+    cities = REGIONS[state][1]
+    city, pin = cities[(h >> 8) % len(cities)]
+    return (f"{(h >> 16) % 450 + 1}, {STREETS[(h >> 28) % len(STREETS)]}, {city}, {state} - "
+            f"{pin}{(h >> 40) % 99 + 1:03d}")
+
+
+def _created_at(rng: random.Random, plan: Plan, max_days: Optional[float] = None) -> datetime:
+    """A UTC time in the window, weighted towards recent days and busy (IST) hours."""
+    age = (max_days or plan.days) * rng.random() ** 1.5
+    return plan.until + timedelta(days=-(int(age) + 1), seconds=rng.choice(HOURS) * 3600 + rng.randrange(3600))
+
+
+def gen_users(plan: Plan, phase: str, chunk: int, rng: random.Random) -> Dict[str, List[dict]]:
+    rows = []
+    for user_id in plan.id_range(phase, chunk):
+        full_name, username, phone, state = _person(rng, user_id)
+        row = {"id": user_id, "username": username, "password": plan.password, "full_name": full_name,
+               "phone": phone, "address": None, "location": None, "is_active": rng.random() > 0.01,
+               "created_at": _created_at(rng, plan, plan.days * 2), "user_type": USER_TYPES[phase]}
+        if phase == "farmers":
+            district = rng.choice(REGIONS[state][1])[0]
+            row["email"] = None
+            row["location"] = f"{rng.choice(VILLAGES)}, {district}, {state}"
+        elif phase == "buyers":
+            row["email"] = f"{username}@{rng.choice(EMAIL_DOMAINS)}"
+            row["address"] = buyer_address(plan, user_id)
+        else:
+            row.update(username="admin", email="admin@kisanvaahan.in", full_name="Kisan Vaahan Admin",
+                       is_active=True)
+        rows.append(row)
+    return {"users": rows}
+
+
+def gen_products(plan: Plan, phase: str, chunk: int, rng: random.Random) -> Dict[str, List[dict]]:
+    rows = []
+    for product_id in plan.id_range(phase, chunk):
+        name, category, (low, high), unit = rng.choice(PRODUCE)
+        state = rng.choice(STATES)
+        district = rng.choice(REGIONS[state][1])[0]
+        created_at = _created_at(rng, plan)
+        status = rng.choice(APPROVAL)
+        image = f"https://picsum.photos/seed/kv{product_id}"
+        rows.append({
+            "id": product_id,
+            "title": f"{rng.choice(QUALIFIERS)} {name}",
+            "description": f"{name} from {district}, {state}. Priced per {unit}, packed on the day of dispatch.",
+            "price": rng.randint(low, high),
+            "discount_percentage": rng.choice(DISCOUNTS),
+            "rating": round(min(5.0, max(2.5, rng.gauss(4.2, 0.4))), 1),
+            "stock": 0 if rng.random() < 0.05 else rng.randint(5, 500),
+            "brand": f"{district} Farmer Producer Co.",
+            "thumbnail": f"{image}/200/200",
+            "images": [f"{image}/600/400", f"{image}-2/600/400"],
+            "is_published": rng.random() > 0.03,
+            "created_at": created_at,
+            "category_id": plan.categories[category],
+            # A few farmers list most of the catalogue
+            "farmer_id": int(plan.farmers * rng.random() ** 2) + 1 if plan.farmers else None,
+            "approval_status": status,
+            "approved_by": plan.admin_id if status != "pending" else None,
+            "approval_date": created_at + timedelta(hours=rng.randint(1, 72)) if status != "pending" else None,
+        })
+    return {"products": rows}
+
+
+_catalogue: Optional[List[Tuple[int, float]]] = None
+
+
+def _load_catalogue(conn: Connection) -> List[Tuple[int, float]]:
+    """(product id, unit price after discount) for everything buyers can order."""
+    global _catalogue
+    if _catalogue is None:
+        rows = conn.execute(
+            select(Product.id, Product.price, Product.discount_percentage)
+            .where(Product.approval_status == "approved", Product.is_published.is_(True))
+            .order_by(Product.id)
+        )
+        _catalogue = [(i, round(float(price) * (1 - discount / 100), 2)) for i, price, discount in rows]
+        if not _catalogue:
+            raise SystemExit("No orderable products; generate products first")
+    return _catalogue
+
+
+def _lines(rng: random.Random, catalogue, count: int) -> List[Tuple[int, int, float]]:
+    """`count` distinct (product id, quantity, unit price), skewed towards popular products."""
+    lines, seen = [], set()
+    while len(lines) < count:
+        product_id, unit_price = catalogue[int(len(catalogue) * rng.random() ** 3)]
+        if product_id not in seen:
+            seen.add(product_id)
+            lines.append((product_id, rng.choice(QUANTITIES), unit_price))
+    return lines
+
+
+def gen_carts(plan: Plan, phase: str, chunk: int, rng: random.Random, conn: Connection) -> Dict[str, List[dict]]:
+    catalogue = _load_catalogue(conn)
+    carts, items = [], []
+    for cart_id in plan.id_range(phase, chunk):
+        if rng.random() >= plan.cart_ratio:
+            continue
+        lines = _lines(rng, catalogue, min(len(catalogue), rng.randint(1, MAX_CART_ITEMS)))
+        total = 0.0
+        for k, (product_id, quantity, unit_price) in enumerate(lines):
+            subtotal = round(quantity * unit_price, 2)
+            total += subtotal
+            items.append({"id": (cart_id - 1) * MAX_CART_ITEMS + k + 1, "cart_id": cart_id,
+                          "product_id": product_id, "quantity": quantity, "subtotal": subtotal})
+        carts.append({"id": cart_id, "user_id": plan.farmers + cart_id, "total_amount": round(total, 2),
+                      "created_at": _created_at(rng, plan, 14)})
+    return {"carts": carts, "cart_items": items}
+
+
+def _order_status(rng: random.Random, age: timedelta) -> str:
+    if age > timedelta(days=7):
+        return rng.choice(STATUS_OLD)
+    if age > timedelta(days=2):
+        return rng.choice(STATUS_RECENT)
+    return rng.choice(STATUS_NEW)
+
+
+def gen_orders(plan: Plan, phase: str, chunk: int, rng: random.Random, conn: Connection) -> Dict[str, List[dict]]:
+    catalogue = _load_catalogue(conn)
+    now = plan.until
+    orders, items = [], []
+    for order_id in plan.id_range(phase, chunk):
+        lines = _lines(rng, catalogue, min(len(catalogue), rng.choice(ORDER_SIZES)))
+        # Orders meet the checkout minimum: top up the first line
+        total = sum(quantity * unit_price for _, quantity, unit_price in lines)
+        if total < MIN_ORDER_AMOUNT:
+            product_id, quantity, unit_price = lines[0]
+            quantity += math.ceil((MIN_ORDER_AMOUNT - total) / unit_price)
+            lines[0] = (product_id, quantity, unit_price)
+        total = 0.0
+        for k, (product_id, quantity, unit_price) in enumerate(lines):
+            subtotal = round(quantity * unit_price, 2)
+            total += subtotal
+            items.append({"id": (order_id - 1) * MAX_ORDER_ITEMS + k + 1, "order_id": order_id,
+                          "product_id": product_id, "quantity": quantity, "price_at_purchase": unit_price,
+                          "subtotal": subtotal})
+        created_at = _created_at(rng, plan)
+        status = _order_status(rng, now - created_at)
+        updated_at = created_at if status == "Pending" else min(now, created_at + timedelta(hours=rng.randint(2, 120)))
+        # Repeat customers: a minority of buyers place most orders
+        user_id = plan.farmers + int(plan.buyers * rng.random() ** 2) + 1
+        orders.append({"id": order_id, "user_id": user_id, "total_amount": round(total, 2),
+                       "payment_method": rng.choice(PAYMENT_METHODS),
+                       "delivery_address": buyer_address(plan, user_id), "status": status,
+                       "created_at": created_at, "updated_at": updated_at})
+    return {"orders": orders, "order_items": items}
+
+
+USER_TYPES = {"farmers": "farmer", "buyers": "buyer", "admin": "admin"}
+GENERATORS = {"farmers": gen_users, "buyers": gen_users, "admin": gen_users, "products": gen_products,
+              "carts": gen_carts, "orders": gen_orders}
+TABLES = {table.name: table for table in (User.__table__, Product.__table__, Cart.__table__,
+                                          CartItem.__table__, Order.__table__, OrderItem.__table__)}
+
+
+# --- loading -------------------------------------------------------------------
+
+def _copy_value(value):
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, list):
+        return "{" + ",".join(f'"{v}"' for v in value) + "}"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def load(conn: Connection, table_name: str, rows: List[dict]) -> None:
+    """COPY on Postgres drivers that support it, else one batched INSERT."""
+    if not rows:
+        return
+    driver = conn.dialect.driver if conn.dialect.name == "postgresql" else None
+    if driver not in ("psycopg2", "psycopg"):
+        conn.execute(insert(TABLES[table_name]), rows)
+        return
+
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(row[c]) for c in columns])
+    sql = f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    cursor = conn.connection.cursor()
+    try:
+        if driver == "psycopg2":
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+        else:
+            with cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+    finally:
+        cursor.close()
+
+
+_engine: Optional[Engine] = None
+_plan: Optional[Plan] = None
+
+
+def _init_worker(url: str, engine_kwargs: dict, plan: Plan) -> None:
+    global _engine, _plan
+    _engine, _plan = create_engine(url, **engine_kwargs), plan
+
+
+def run_chunk(phase: str, chunk: int) -> int:
+    """Generate and load one chunk in a single transaction with its progress row."""
+    rng = _plan.rng(phase, chunk)
+    with _engine.begin() as conn:
+        if conn.execute(select(seed_progress.c.rows).where(
+                seed_progress.c.phase == phase, seed_progress.c.chunk == chunk)).first():
+            return 0
+        generate = GENERATORS[phase]
+        if phase in ("carts", "orders"):
+            tables = generate(_plan, phase, chunk, rng, conn)
+        else:
+            tables = generate(_plan, phase, chunk, rng)
+        rows = 0
+        for table_name, table_rows in tables.items():
+            load(conn, table_name, table_rows)
+            rows += len(table_rows)
+        conn.execute(insert(seed_progress).values(phase=phase, chunk=chunk, rows=rows))
+    return rows
+
+
+# --- driver --------------------------------------------------------------------
+
+def prepare(engine: Engine, args) -> Plan:
+    """Create bookkeeping tables, check the target, and fix the run's config."""
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+    progress_meta.create_all(engine)
+
+    requested = {"seed": args.seed, "farmers": args.farmers, "buyers": args.buyers, "products": args.products,
+                 "orders": args.orders, "cart_ratio": args.cart_ratio, "days": args.days,
+                 "chunk_size": args.chunk_size}
+    with engine.begin() as conn:
+        stored = dict(conn.execute(select(seed_config.c.key, seed_config.c.value)).all())
+        if stored:
+            config = json.loads(stored["config"])
+            if {k: config[k] for k in requested} != requested:
+                raise SystemExit(f"This database was seeded with {json.dumps(config)}; "
+                                 "resume with the same arguments or use an empty database")
+        else:
+            if conn.execute(select(func.count()).select_from(User)).scalar() or \
+                    conn.execute(select(func.count()).select_from(Product)).scalar():
+                raise SystemExit("Target database already has users or products; use an empty database")
+            config = {**requested, "until": args.until or date.today().isoformat(),
+                      "password_hash": bcrypt_sha256.hash(args.password)}
+            conn.execute(insert(seed_config).values(key="config", value=json.dumps(config)))
+
+        existing = dict(conn.execute(select(Category.name, Category.id)).all())
+        missing = [name for name in CATEGORIES if name not in existing]
+        if missing:
+            conn.execute(insert(Category), [{"name": name} for name in missing])
+            existing = dict(conn.execute(select(Category.name, Category.id)).all())
+    return Plan(config, {name: existing[name] for name in CATEGORIES})
+
+
+def finish(engine: Engine) -> None:
+    """Move Postgres id sequences past the generated ids and refresh planner stats."""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        for table in ("users", "categories", "products", "carts", "cart_items", "orders", "order_items"):
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT COALESCE(MAX(id), 0) + 1 FROM {table}), false)"))
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+
+def pending_chunks(engine: Engine, plan: Plan, phase: str) -> Iterator[int]:
+    with engine.connect() as conn:
+        done = set(conn.execute(select(seed_progress.c.chunk).where(seed_progress.c.phase == phase)).scalars())
+    return (chunk for chunk in range(plan.chunks(phase)) if chunk not in done)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a large synthetic dataset")
+    parser.add_argument("--database-url", help="Target database (default: the app's DATABASE_URL)")
+    parser.add_argument("--farmers", type=int, default=2_000)
+    parser.add_argument("--buyers", type=int, default=50_000)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--cart-ratio", type=float, default=0.3, help="Share of buyers with an open cart")
+    parser.add_argument("--days", type=int, default=365, help="Days of order history")
+    parser.add_argument("--until", help="Last day of the history, YYYY-MM-DD (default: today, fixed on first run)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="Rows per chunk (and transaction)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--password", default="kisan@123", help="Password for every generated user")
+    args = parser.parse_args()
+
+    engine_kwargs = {}
+    if args.database_url:
+        url = args.database_url
+    else:
+        from app.core.config import settings
+        from app.db.database import DATABASE_URL as url
+        if settings.db_sslmode and url.startswith("postgresql"):
+            engine_kwargs["connect_args"] = {"sslmode": settings.db_sslmode}
+
+    engine = create_engine(url, **engine_kwargs)
+    workers = args.workers
+    if engine.dialect.name == "sqlite" and workers > 1:
+        print("SQLite allows one writer; using 1 worker")
+        workers = 1
+    plan = prepare(engine, args)
+    engine.dispose()
+
+    started = time.perf_counter()
+    total_rows = 0
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(url, engine_kwargs, plan)) \
+        if workers > 1 else None
+    if pool is None:
+        _init_worker(url, engine_kwargs, plan)
+    try:
+        for phase in PHASES:
+            chunks = list(pending_chunks(engine, plan, phase))
+            if not chunks:
+                print(f"{phase:<9} done")
+                continue
+            phase_start, rows = time.perf_counter(), 0
+            if pool is None:
+                results = (run_chunk(phase, chunk) for chunk in chunks)
+            else:
+                results = (f.result() for f in as_completed([pool.submit(run_chunk, phase, c) for c in chunks]))
+            for i, chunk_rows in enumerate(results, 1):
+                rows += chunk_rows
+                elapsed = time.perf_counter() - phase_start
+                print(f"\r{phase:<9} {i}/{len(chunks)} chunks, {rows:,} rows, {rows / elapsed:,.0f} rows/s",
+                      end="", flush=True)
+            print()
+            total_rows += rows
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    finish(engine)
+    elapsed = time.perf_counter() - started
+    print(f"Loaded {total_rows:,} rows in {elapsed:.1f}s ({total_rows / max(elapsed, 1e-9):,.0f} rows/s); "
+          f"users log in with password {args.password!r}, admin as 'admin'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+-- orders.stock_reserved: whether an order's quantities are held off product stock
+-- Run this SQL script once on existing databases; new ones get it from supabase_schema.sql
+-- Existing orders get FALSE: they were placed before checkout reserved stock,
+-- so cancelling them must not put anything back
+
+ALTER TABLE orders
+ADD COLUMN IF NOT EXISTS stock_reserved BOOLEAN DEFAULT FALSE NOT NULL;
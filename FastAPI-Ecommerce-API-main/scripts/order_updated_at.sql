@@ -0,0 +1,8 @@
+-- orders.updated_at: versions GET /orders/me for ETag / 304 responses
+-- Run this SQL script once on existing databases; new ones get it from supabase_schema.sql
+-- The API sets it on every ORM update; writes made outside the API should set it too
+
+ALTER TABLE orders
+ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL;
+
+UPDATE orders SET updated_at = created_at;
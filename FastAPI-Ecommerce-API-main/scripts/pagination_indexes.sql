@@ -0,0 +1,11 @@
+-- Indexes backing keyset (cursor) pagination
+-- Run this SQL script once on existing databases; new ones get it from supabase_schema.sql
+
+-- /products/ (approved only, ordered by id)
+CREATE INDEX IF NOT EXISTS idx_products_approval_status_id ON products(approval_status, id);
+
+-- /orders/ (newest first: created_at DESC, id DESC via a backward scan)
+CREATE INDEX IF NOT EXISTS idx_orders_created_at_id ON orders(created_at, id);
+
+-- /carts/ (a user's carts ordered by id)
+CREATE INDEX IF NOT EXISTS idx_carts_user_id_id ON carts(user_id, id);
@@ -0,0 +1,4 @@
+-- Exact-title index for duplicate checks during bulk product import
+-- Run this SQL script once on existing databases; new ones get it from supabase_schema.sql
+
+CREATE INDEX IF NOT EXISTS idx_products_title ON products(title);
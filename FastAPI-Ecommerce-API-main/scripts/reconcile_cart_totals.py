@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Check every cart's total_amount against the sum of its lines and repair
+drift, in batches by cart id (see app/services/cart_totals.py). For cron,
+instead of CART_RECONCILE_INTERVAL on a worker.
+
+Usage:
+    python scripts/reconcile_cart_totals.py --batch-size 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import SessionLocal
+from app.services.cart_totals import CartTotals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Repair cart totals that drifted from their lines")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--pause", type=float, default=0.01, help="Seconds to sleep between batches")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        checked, corrected = CartTotals.reconcile(db, args.batch_size, args.pause)
+    print(f"Checked {checked} carts, repaired {corrected} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+-- Revoked JWT ids, checked on every authenticated request (see app/core/tokens.py)
+-- Run this SQL script once on existing databases; new ones get it from supabase_schema.sql
+
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    id SERIAL PRIMARY KEY,
+    jti VARCHAR(255) UNIQUE NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    revoked_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+);
+
+-- Workers purge rows once the token would have expired anyway
+CREATE INDEX IF NOT EXISTS idx_revoked_tokens_expires_at ON revoked_tokens(expires_at);
@@ -0,0 +1,18 @@
+-- Product search indexes (full-text + trigram)
+-- Run this SQL script once on existing databases; new ones get it from supabase_schema.sql
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Full-text document over title, description and brand.
+-- Must match app.models.models.search_document() exactly for the planner to use it.
+CREATE INDEX IF NOT EXISTS idx_products_search_tsv ON products
+USING GIN (to_tsvector('simple', (((coalesce(title, '') || ' ') || coalesce(description, '')) || ' ') || coalesce(brand, '')));
+
+-- Typo-tolerant title matching (word_similarity via the %> operator)
+CREATE INDEX IF NOT EXISTS idx_products_title_trgm ON products
+USING GIN (title gin_trgm_ops);
+
+-- Verify the indexes
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE tablename = 'products' AND indexname IN ('idx_products_search_tsv', 'idx_products_title_trgm');
@@ -64,7 +64,8 @@ CREATE TABLE cart_items (
     cart_id INTEGER NOT NULL REFERENCES carts(id) ON DELETE CASCADE,
     product_id INTEGER NOT NULL REFERENCES products(id) ON DELETE CASCADE,
     quantity INTEGER NOT NULL,
-    subtotal FLOAT NOT NULL
+    subtotal FLOAT NOT NULL,
+    CONSTRAINT uq_cart_items_cart_product UNIQUE (cart_id, product_id)
 );
 
 -- Orders Table
@@ -75,7 +76,9 @@ CREATE TABLE orders (
     payment_method VARCHAR(50) NOT NULL,
     delivery_address TEXT NOT NULL,
     status VARCHAR(50) DEFAULT 'Pending' NOT NULL,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+    stock_reserved BOOLEAN DEFAULT FALSE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
 );
 
 -- Order Items Table
@@ -88,6 +91,14 @@ CREATE TABLE order_items (
     subtotal FLOAT NOT NULL
 );
 
+-- Revoked JWT ids (see scripts/revoked_tokens.sql)
+CREATE TABLE revoked_tokens (
+    id SERIAL PRIMARY KEY,
+    jti VARCHAR(255) UNIQUE NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    revoked_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+);
+
 -- Create Indexes for Performance
 CREATE INDEX idx_users_username ON users(username);
 CREATE INDEX idx_users_email ON users(email);
@@ -98,6 +109,13 @@ CREATE INDEX idx_products_category_id ON products(category_id);
 CREATE INDEX idx_products_farmer_id ON products(farmer_id);
 CREATE INDEX idx_products_approval_status ON products(approval_status);
 CREATE INDEX idx_products_is_published ON products(is_published);
+CREATE INDEX idx_products_title ON products(title);
+
+-- Product search (see scripts/search_indexes.sql)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX idx_products_search_tsv ON products
+    USING GIN (to_tsvector('simple', (((coalesce(title, '') || ' ') || coalesce(description, '')) || ' ') || coalesce(brand, '')));
+CREATE INDEX idx_products_title_trgm ON products USING GIN (title gin_trgm_ops);
 
 CREATE INDEX idx_carts_user_id ON carts(user_id);
 CREATE INDEX idx_cart_items_cart_id ON cart_items(cart_id);
@@ -108,6 +126,13 @@ CREATE INDEX idx_orders_status ON orders(status);
 CREATE INDEX idx_order_items_order_id ON order_items(order_id);
 CREATE INDEX idx_order_items_product_id ON order_items(product_id);
 
+-- Keyset pagination (see scripts/pagination_indexes.sql)
+CREATE INDEX idx_products_approval_status_id ON products(approval_status, id);
+CREATE INDEX idx_orders_created_at_id ON orders(created_at, id);
+CREATE INDEX idx_carts_user_id_id ON carts(user_id, id);
+
+CREATE INDEX idx_revoked_tokens_expires_at ON revoked_tokens(expires_at);
+
 -- Insert Default Categories
 INSERT INTO categories (name) VALUES 
     ('Vegetables'),
@@ -0,0 +1,79 @@
+"""
+Test settings: a throwaway SQLite database and cheap password hashes. The
+environment must be set before anything imports app.core.config.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Optional
+
+_db_dir = tempfile.mkdtemp(prefix="kisan-tests-")
+os.environ.update(
+    SUPABASE_URL="http://supabase.test",
+    SUPABASE_KEY="test",
+    SECRET_KEY="test-secret",
+    DATABASE_URL=f"sqlite:///{os.path.join(_db_dir, 'test.db')}",
+    DB_SSLMODE="",
+    PASSWORD_HASH_ROUNDS="4",
+    RATE_LIMIT_ENABLED="false",
+    TOKEN_REVOCATION_SYNC_SECONDS="0",
+)
+
+import pytest  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.database import engine  # noqa: E402
+from app.models.models import Cart, CartItem, Category, Order, OrderItem, Product, RevokedToken, User  # noqa: E402
+from app.utils.query_counter import count_queries  # noqa: E402
+
+
+def _recreate(tables):
+    Base.metadata.drop_all(engine, tables=list(reversed(tables)))
+    Base.metadata.create_all(engine, tables=tables)
+    return engine
+
+
+@pytest.fixture
+def db_tables():
+    """Fresh users and revoked_tokens tables (the rest of the schema needs Postgres types)."""
+    yield _recreate([User.__table__, RevokedToken.__table__])
+
+
+@pytest.fixture
+def order_tables():
+    """Fresh users, catalogue and order tables."""
+    yield _recreate([User.__table__, Category.__table__, Product.__table__,
+                     Order.__table__, OrderItem.__table__])
+
+
+@pytest.fixture
+def cart_tables():
+    """Fresh users, catalogue and cart tables."""
+    yield _recreate([User.__table__, Category.__table__, Product.__table__,
+                     Cart.__table__, CartItem.__table__])
+
+
+@pytest.fixture
+def query_guard():
+    """
+    Fails the test when a block runs more statements than its budget, or any
+    one statement shape more than `max_repeats` times (an N+1):
+
+        def test_update_cart(query_guard):
+            with query_guard(max_queries=6, max_repeats=1):
+                CartService.update_cart(...)
+    """
+    @contextmanager
+    def guard(max_queries: Optional[int] = None, max_repeats: int = 3, on: Engine = engine):
+        with count_queries(on) as counter:
+            yield counter
+        problems = []
+        if max_queries is not None and counter.count > max_queries:
+            problems.append(f"{counter.count} queries, budget {max_queries}")
+        problems += [f"{count}x {shape}" for shape, count in counter.repeated(max_repeats)]
+        if problems:
+            listing = "\n".join(f"  {i}. {s}" for i, s in enumerate(counter.statements, 1))
+            pytest.fail("Query guard: " + "; ".join(problems) + f"\nStatements:\n{listing}")
+
+    return guard
@@ -0,0 +1,76 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, update
+
+from app.core.config import settings
+from app.core.hashing import pwd_context
+from app.core.security import check_admin_role, invalidate_principal
+from app.models.models import User
+from app.routers import auth
+
+
+@pytest.fixture
+def client(db_tables):
+    app = FastAPI()
+    app.include_router(auth.router)
+
+    @app.get("/admin-only")
+    async def admin_only(principal=Depends(check_admin_role)):
+        return {"id": principal.id}
+
+    with db_tables.begin() as conn:
+        conn.execute(User.__table__.insert().values(
+            id=1, username="admin", password=pwd_context.hash("pw"), full_name="Admin", user_type="admin"))
+    return TestClient(app)
+
+
+def login(client):
+    response = client.post("/auth/login", data={"username": "admin", "password": "pw"})
+    assert response.status_code == 200
+    return response.json()
+
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def demote(engine):
+    with engine.begin() as conn:
+        conn.execute(update(User).where(User.id == 1).values(user_type="buyer"))
+    invalidate_principal(1)
+
+
+def test_refresh_token_is_not_a_bearer_token(client):
+    tokens = login(client)
+    assert client.get("/admin-only", headers=bearer(tokens["access_token"])).status_code == 200
+    assert client.get("/admin-only", headers=bearer(tokens["refresh_token"])).status_code == 401
+
+
+def test_demoted_admin_loses_access_on_refresh(client, db_tables):
+    tokens = login(client)
+    demote(db_tables)
+
+    assert client.get("/admin-only", headers=bearer(tokens["refresh_token"])).status_code == 401
+    refreshed = client.post("/auth/refresh", data={"refresh_token": tokens["refresh_token"]})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["refresh_token"] != tokens["refresh_token"]
+    assert client.get("/admin-only", headers=bearer(refreshed.json()["access_token"])).status_code == 403
+
+
+def test_demoted_admin_loses_access_at_once_without_trusted_claims(client, db_tables, monkeypatch):
+    monkeypatch.setattr(settings, "trust_token_role_claims", False)
+    tokens = login(client)
+    assert client.get("/admin-only", headers=bearer(tokens["access_token"])).status_code == 200
+    demote(db_tables)
+    assert client.get("/admin-only", headers=bearer(tokens["access_token"])).status_code == 403
+
+
+def test_deleted_admin_loses_access(client, db_tables):
+    tokens = login(client)
+    with db_tables.begin() as conn:
+        conn.execute(delete(User).where(User.id == 1))
+    invalidate_principal(1)
+
+    assert client.get("/admin-only", headers=bearer(tokens["refresh_token"])).status_code == 401
+    assert client.post("/auth/refresh", data={"refresh_token": tokens["refresh_token"]}).status_code == 401
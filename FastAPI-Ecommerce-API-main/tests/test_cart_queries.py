@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.security import get_user_token
+from app.db.database import SessionLocal
+from app.models.models import Cart, CartItem, Category, Product, User
+from app.schemas.carts import CartCreate, CartUpdate
+from app.services.carts import CartService
+
+PRODUCTS = 80
+
+
+@pytest.fixture
+def db(cart_tables):
+    with SessionLocal() as session:
+        session.add_all([User(id=1, username="buyer", password="x", full_name="Buyer", user_type="buyer"),
+                         Category(id=1, name="Vegetables")])
+        session.add_all([
+            Product(id=i, title=f"Produce {i}", description="Fresh", price=10 + i, discount_percentage=5,
+                    rating=4, stock=100, brand="Farm", thumbnail="t", images=[], category_id=1)
+            for i in range(1, PRODUCTS + 1)
+        ])
+        session.commit()
+        yield session
+
+
+@pytest.fixture
+def token():
+    access = asyncio.run(get_user_token(id=1, user_type="buyer")).access_token
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=access)
+
+
+def lines(size, offset=0):
+    return [{"product_id": offset + i + 1, "quantity": 2} for i in range(size)]
+
+
+def cart_statements(db, token, query_guard, size):
+    """Statements run by create, update and delete of one cart of `size` lines."""
+    counts = {}
+    with query_guard(max_repeats=1) as counter:
+        cart_id = CartService.create_cart(token, db, CartCreate(cart_items=lines(size)))["data"].id
+    counts["create"] = counter.count
+    with query_guard(max_repeats=1) as counter:
+        CartService.update_cart(token, db, cart_id, CartUpdate(cart_items=lines(size, size)))
+    counts["update"] = counter.count
+    with query_guard(max_repeats=1) as counter:
+        CartService.delete_cart(token, db, cart_id)
+    counts["delete"] = counter.count
+    db.expunge_all()
+    return counts
+
+
+def test_cart_statements_do_not_grow_with_cart_size(db, token, query_guard):
+    one_line = cart_statements(db, token, query_guard, 1)
+    forty_lines = cart_statements(db, token, query_guard, 40)
+    assert forty_lines == one_line
+
+
+# add_item, update_cart_item and remove_cart_item: at most 3 write-path
+# statements, plus the joined read the response is built from
+MUTATION_BUDGET = 4
+
+
+def stored_total(db, cart_id):
+    """(carts.total_amount, the sum recomputed from the lines, {product_id: quantity})."""
+    db.expire_all()
+    cart = db.get(Cart, cart_id)
+    items = db.query(CartItem).filter(CartItem.cart_id == cart_id).all()
+    for item in items:
+        product = db.get(Product, item.product_id)
+        assert item.subtotal == round(item.quantity * product.price * 0.95, 2)
+    return cart.total_amount, round(sum(item.subtotal for item in items), 2), \
+        {item.product_id: item.quantity for item in items}
+
+
+def test_add_item_upserts_and_keeps_the_total(db, query_guard):
+    cart_id = CartService.add_item(db, 1, product_id=1, quantity=2)["data"].id  # also creates the cart
+    with query_guard(max_queries=MUTATION_BUDGET):
+        CartService.add_item(db, 1, product_id=2, quantity=1)
+    with query_guard(max_queries=MUTATION_BUDGET):
+        CartService.add_item(db, 1, product_id=1, quantity=3)
+
+    total, recomputed, quantities = stored_total(db, cart_id)
+    assert quantities == {1: 5, 2: 1}  # one line per product
+    assert total == recomputed
+
+
+def test_update_and_remove_item_keep_the_total(db, query_guard):
+    cart_id = CartService.add_item(db, 1, product_id=1, quantity=2)["data"].id
+    CartService.add_item(db, 1, product_id=2, quantity=4)
+    item_ids = dict(db.query(CartItem.product_id, CartItem.id).filter(CartItem.cart_id == cart_id).all())
+
+    with query_guard(max_queries=MUTATION_BUDGET):
+        CartService.update_cart_item(db, 1, item_ids[1], 7)
+    total, recomputed, quantities = stored_total(db, cart_id)
+    assert quantities == {1: 7, 2: 4}
+    assert total == recomputed
+
+    with query_guard(max_queries=MUTATION_BUDGET):
+        CartService.remove_cart_item(db, 1, item_ids[2])
+    total, recomputed, quantities = stored_total(db, cart_id)
+    assert quantities == {1: 7}
+    assert total == recomputed
+
+
+def test_repeated_products_fold_into_one_line(db, token):
+    cart_id = CartService.create_cart(token, db, CartCreate(cart_items=lines(1) + lines(1) + lines(1, 1)))["data"].id
+    total, recomputed, quantities = stored_total(db, cart_id)
+    assert quantities == {1: 4, 2: 2}
+    assert total == recomputed
@@ -0,0 +1,42 @@
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.services.cart_totals import CartTotals
+
+
+def reconcile_threads():
+    return [thread for thread in threading.enumerate() if thread.name == "cart-reconcile"]
+
+
+def test_reconciler_runs_only_between_startup_and_shutdown(monkeypatch):
+    ran = threading.Event()
+    monkeypatch.setattr(settings, "cart_reconcile_interval", 0.01)
+    monkeypatch.setattr(CartTotals, "reconcile", staticmethod(lambda db, batch_size, stop=None: ran.set()))
+
+    assert not reconcile_threads()  # importing the app starts nothing
+    with TestClient(app):
+        assert ran.wait(2)
+        (reconciler,) = reconcile_threads()
+    assert not reconciler.is_alive()
+
+
+def test_stop_ends_a_pass_between_batches(monkeypatch):
+    stop = threading.Event()
+    batches = []
+
+    def scan(db, after_id, batch_size):
+        batches.append(after_id)
+        stop.set()
+        return [], batch_size, after_id + batch_size
+
+    monkeypatch.setattr(CartTotals, "_scan", staticmethod(scan))
+
+    class Session:
+        def rollback(self):
+            pass
+
+    assert CartTotals.reconcile(Session(), 10, pause=0, stop=stop) == (10, 0)
+    assert batches == [0]
@@ -0,0 +1,90 @@
+import threading
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, accepted_encodings
+
+BODY = "kisan " * 1000
+
+
+class FakeBrotli:
+    """Stands in for the optional brotli package; records the thread each call ran on."""
+
+    def __init__(self):
+        self.threads = []
+        fake = self
+
+        class Compressor:
+            def __init__(self, quality):
+                pass
+
+            def process(self, body):
+                fake.threads.append(threading.get_ident())
+                return b"br:" + body
+
+            def flush(self):
+                return b""
+
+            def finish(self):
+                return b""
+
+        self.Compressor = Compressor
+
+
+@pytest.fixture
+def fake_brotli(monkeypatch):
+    fake = FakeBrotli()
+    monkeypatch.setattr(compression, "brotli", fake)
+    return fake
+
+
+def client(thread_minimum_size=128 * 1024):
+    app = Starlette(routes=[Route("/", lambda request: PlainTextResponse(BODY))])
+    app.add_middleware(CompressionMiddleware, minimum_size=100, thread_minimum_size=thread_minimum_size)
+    return TestClient(app)
+
+
+def encoding(accept):
+    response = client().get("/", headers={"Accept-Encoding": accept})
+    return response.headers.get("content-encoding", "identity")
+
+
+def test_accepted_encodings_parses_q_values():
+    assert accepted_encodings("gzip, br;q=0, *;q=0.5, x;q=bad") == {"gzip": 1.0, "br": 0.0, "*": 0.5, "x": 0.0}
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("gzip, br", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("BR;Q=0, gzip", "gzip"),
+    ("br;q=0.5, gzip;q=1", "gzip"),
+    ("gzip;q=0", "identity"),
+    ("br;q=0, gzip;q=0", "identity"),
+    ("*", "br"),
+])
+def test_q_values_pick_the_encoding(fake_brotli, accept, expected):
+    assert encoding(accept) == expected
+
+
+def test_gzip_without_brotli(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    response = client().get("/", headers={"Accept-Encoding": "br, gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == BODY  # httpx decodes it
+
+
+def test_large_bodies_compress_off_the_event_loop(fake_brotli):
+    with client(thread_minimum_size=len(BODY)) as test_client:
+        loop_thread = test_client.portal.call(threading.get_ident)
+        test_client.get("/", headers={"Accept-Encoding": "br"})
+    with client(thread_minimum_size=len(BODY) + 1) as test_client:
+        small_loop_thread = test_client.portal.call(threading.get_ident)
+        test_client.get("/", headers={"Accept-Encoding": "br"})
+    large, small = fake_brotli.threads
+    assert large != loop_thread
+    assert small == small_loop_thread
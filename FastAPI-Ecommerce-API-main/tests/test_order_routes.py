@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.security import get_user_token
+from app.db.database import SessionLocal
+from app.models.models import Order, User
+from app.routers import orders
+
+
+@pytest.fixture
+def client(order_tables):
+    with SessionLocal() as session:
+        session.add_all([
+            User(id=1, username="admin", password="x", full_name="Admin", user_type="admin"),
+            User(id=2, username="buyer", password="x", full_name="Buyer", phone="9000000000", user_type="buyer"),
+            Order(id=1, user_id=2, total_amount=100, payment_method="COD", delivery_address="Farm"),
+        ])
+        session.commit()
+    app = FastAPI()
+    app.include_router(orders.router)
+    return TestClient(app)
+
+
+def bearer(user_id, user_type):
+    token = asyncio.run(get_user_token(id=user_id, user_type=user_type)).access_token
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_order_list_with_owners_is_admin_only(client):
+    assert client.get("/orders/?include_user=true").status_code == 401
+    assert client.get("/orders/?include_user=true", headers=bearer(2, "buyer")).status_code == 403
+    response = client.get("/orders/?include_user=true", headers=bearer(1, "admin"))
+    assert response.status_code == 200
+    assert response.json()["data"][0]["user"]["phone"] == "9000000000"
+
+
+def test_order_status_changes_are_admin_only(client):
+    assert client.put("/orders/1", json={"status": "Cancelled"}).status_code == 401
+    assert client.put("/orders/1", json={"status": "Cancelled"}, headers=bearer(2, "buyer")).status_code == 403
+    response = client.put("/orders/1", json={"status": "Confirmed"}, headers=bearer(1, "admin"))
+    assert response.status_code == 200
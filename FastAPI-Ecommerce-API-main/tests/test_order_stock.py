@@ -0,0 +1,107 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+
+from app.db.database import SessionLocal
+from app.models.models import Category, Order, OrderItem, Product, User
+from app.schemas.orders import OrderUpdate
+from app.services.orders import OrderService
+
+
+@pytest.fixture
+def db(order_tables):
+    with SessionLocal() as session:
+        session.add_all([
+            User(id=1, username="buyer", password="x", full_name="Buyer", user_type="buyer"),
+            Category(id=1, name="Grains"),
+            Product(id=1, title="Rice", description="Rice", price=50, discount_percentage=0, rating=4,
+                    stock=10, brand="Farm", thumbnail="t", images=[], category_id=1),
+        ])
+        session.commit()
+        yield session
+
+
+def place_order(db, quantity=4, reserved=True):
+    """An order as checkout leaves it: its quantity already off stock when `reserved`."""
+    order = Order(user_id=1, total_amount=50 * quantity, payment_method="COD", delivery_address="Farm",
+                  status="Pending", stock_reserved=reserved)
+    db.add(order)
+    db.flush()
+    db.add(OrderItem(order_id=order.id, product_id=1, quantity=quantity,
+                     price_at_purchase=50, subtotal=50 * quantity))
+    if reserved:
+        db.execute(update(Product).where(Product.id == 1).values(stock=Product.stock - quantity))
+    db.commit()
+    return order.id
+
+
+def stock(db):
+    db.expire_all()
+    return db.get(Product, 1).stock
+
+
+def set_status(db, order_id, value):
+    return OrderService.update_order_status(db, order_id, OrderUpdate(status=value))
+
+
+def test_cancel_releases_stock_once(db):
+    order_id = place_order(db)
+    assert stock(db) == 6
+    OrderService.cancel_order(db, 1, order_id)
+    assert stock(db) == 10
+    set_status(db, order_id, "Cancelled")
+    assert stock(db) == 10
+
+
+def test_leaving_cancelled_reserves_stock_again(db):
+    order_id = place_order(db)
+    set_status(db, order_id, "Cancelled")
+    set_status(db, order_id, "Confirmed")
+    assert stock(db) == 6
+    assert db.get(Order, order_id).stock_reserved
+    set_status(db, order_id, "Cancelled")
+    assert stock(db) == 10
+
+
+def test_leaving_cancelled_without_stock_is_409(db):
+    order_id = place_order(db)
+    set_status(db, order_id, "Cancelled")
+    db.execute(update(Product).where(Product.id == 1).values(stock=3))
+    db.commit()
+    with pytest.raises(HTTPException) as exc:
+        set_status(db, order_id, "Confirmed")
+    assert exc.value.status_code == 409
+    assert stock(db) == 3
+    assert db.get(Order, order_id).status == "Cancelled"
+
+
+def test_cancelling_unreserved_order_leaves_stock_alone(db):
+    order_id = place_order(db, reserved=False)
+    OrderService.cancel_order(db, 1, order_id)
+    assert stock(db) == 10
+
+
+def test_reopening_an_order_checks_stock_in_one_update(db, query_guard):
+    order_id = place_order(db, quantity=2)
+    db.add(Product(id=2, title="Wheat", description="Wheat", price=30, discount_percentage=0, rating=4,
+                   stock=10, brand="Farm", thumbnail="t", images=[], category_id=1))
+    db.add(OrderItem(order_id=order_id, product_id=2, quantity=3, price_at_purchase=30, subtotal=90))
+    db.commit()
+    set_status(db, order_id, "Cancelled")
+    with query_guard(max_repeats=1) as counter:
+        set_status(db, order_id, "Confirmed")
+    assert sum("UPDATE products" in statement for statement in counter.statements) == 1
+
+
+def test_deleting_an_order_releases_its_stock(db):
+    order_id = place_order(db)
+    OrderService.delete_order(db, order_id)
+    assert stock(db) == 10
+    assert db.get(Order, order_id) is None
+
+
+def test_deleting_a_cancelled_order_leaves_stock_alone(db):
+    order_id = place_order(db)
+    OrderService.cancel_order(db, 1, order_id)
+    OrderService.delete_order(db, order_id)
+    assert stock(db) == 10
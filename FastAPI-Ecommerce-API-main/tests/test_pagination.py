@@ -0,0 +1,37 @@
+import base64
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.models import Order, Product
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def cursor(*values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    placed = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    order = Order(id=42, created_at=placed)
+    assert decode_cursor(encode_cursor(order, [Order.created_at, Order.id]), [Order.created_at, Order.id]) == \
+        [placed, 42]
+
+
+@pytest.mark.parametrize("raw, columns", [
+    (cursor("42"), [Product.id]),
+    (cursor(True), [Product.id]),
+    (cursor(4.5), [Product.id]),
+    (cursor(None), [Product.id]),
+    (cursor([1]), [Product.id]),
+    (cursor(1, 2), [Product.id]),
+    (cursor(123, 1), [Order.created_at, Order.id]),
+    (cursor("yesterday", 1), [Order.created_at, Order.id]),
+    ("not base64 json", [Product.id]),
+])
+def test_tampered_cursors_are_400(raw, columns):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(raw, columns)
+    assert exc.value.status_code == 400
@@ -0,0 +1,59 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from app.core.config import settings
+from app.core.hashing import pwd_context
+from app.core.security import get_current_user
+from app.models.models import User
+from app.routers import auth
+
+
+@pytest.fixture
+def client(db_tables):
+    app = FastAPI()
+    app.include_router(auth.router)
+
+    @app.get("/me")
+    def me(user_id=Depends(get_current_user)):
+        return {"id": user_id}
+
+    with db_tables.begin() as conn:
+        conn.execute(User.__table__.insert().values(
+            id=1, username="buyer", password=pwd_context.hash("pw"), full_name="Buyer", user_type="buyer"))
+    return TestClient(app)
+
+
+def legacy_refresh_token():
+    """Shaped like refresh tokens issued before type/jti/exp claims: no expiry, nothing to revoke."""
+    return jwt.encode({"id": 1, "user_type": "buyer"}, settings.secret_key, algorithm=settings.algorithm)
+
+
+def test_logout_revokes_both_tokens(client):
+    tokens = client.post("/auth/login", data={"username": "buyer", "password": "pw"}).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/me", headers=headers).status_code == 200
+
+    response = client.post("/auth/logout", data={"refresh_token": tokens["refresh_token"]}, headers=headers)
+    assert response.status_code == 200
+    assert client.get("/me", headers=headers).status_code == 401
+    assert client.post("/auth/refresh", data={"refresh_token": tokens["refresh_token"]}).status_code == 401
+
+
+def test_legacy_refresh_token_is_rejected(client):
+    token = legacy_refresh_token()
+    assert client.post("/auth/refresh", data={"refresh_token": token}).status_code == 401
+    assert client.post("/auth/logout", data={"refresh_token": token}).status_code == 401
+
+
+def test_legacy_refresh_token_during_grace_period(client, monkeypatch):
+    monkeypatch.setattr(settings, "jwt_accept_legacy_tokens", True)
+    token = legacy_refresh_token()
+
+    refreshed = client.post("/auth/refresh", data={"refresh_token": token})
+    assert refreshed.status_code == 200
+    assert client.get("/me", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+    # Nothing to revoke it by, so logout must not claim it did
+    assert client.post("/auth/logout", data={"refresh_token": token}).status_code == 400
+    assert client.post("/auth/logout", data={"refresh_token": refreshed.json()["refresh_token"]}).status_code == 200